@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de ingestão incremental: lotes de linhas anexados a uma série temporal com
+# pd.concat a cada lote (O(n^2) ao longo de um turno) e com o TSAppendBuffer.
+#
+# Uso: python benchmarks/bench_append.py [número de lotes] [linhas por lote]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.ts import TimeSerie
+from t8s.ts_buffer import TSAppendBuffer
+
+DEFAULT_BATCHES = 2_000
+DEFAULT_BATCH_ROWS = 60  # Um minuto de dados a 1 Hz por lote
+COLUMNS = 10
+
+
+def batches(count: int, rows: int) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range('2023-01-01', periods=count * rows, freq='s')
+    result = []
+    for idx in range(count):
+        data = {'timestamp': timestamps[idx * rows : (idx + 1) * rows]}
+        for col in range(COLUMNS):
+            data[f'sensor_{col}'] = rng.normal(size=rows).astype(np.float32)
+        data['status'] = rng.integers(0, 4, rows).astype(np.int32)
+        result.append(pd.DataFrame(data))
+    return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCHES
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_ROWS
+    data = batches(count, rows)
+    print(f'lotes = {count}, linhas por lote = {rows}, colunas = {COLUMNS + 2}')
+
+    # Laço de ingestão: anexa o lote e usa a série atualizada
+    start_at = time.perf_counter()
+    df = data[0]
+    for batch in data[1:]:
+        df = pd.concat([df, batch], ignore_index=True)
+        ts = TimeSerie(df, format='wide', features_qty=df.columns.size)
+    concat_time = time.perf_counter() - start_at
+    expected = ts.df
+
+    start_at = time.perf_counter()
+    buffer = TSAppendBuffer()
+    for batch in data:
+        buffer.append(batch)
+        ts = buffer.to_timeserie()
+    buffer_time = time.perf_counter() - start_at
+    pd.testing.assert_frame_equal(ts.df, expected)
+    print(
+        f'crescimento geométrico: pd.concat = {concat_time:.2f}s, '
+        + f'TSAppendBuffer = {buffer_time:.2f}s ({concat_time / buffer_time:.1f}x), '
+        + f'dtypes preservados: {sorted(set(map(str, ts.df.dtypes)))}'
+    )
+
+    capacity = 3600
+    start_at = time.perf_counter()
+    buffer = TSAppendBuffer(capacity=capacity)
+    for batch in data:
+        buffer.append(batch)
+        ts = buffer.to_timeserie()
+    print(
+        f'buffer circular (última hora): {time.perf_counter() - start_at:.2f}s, '
+        + f'{len(ts.df)} linhas'
+    )
+    pd.testing.assert_frame_equal(
+        ts.df, expected.iloc[-capacity:].reset_index(drop=True)
+    )
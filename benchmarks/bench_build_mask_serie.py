@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de TimeSerie.build_mask_serie para séries de 10^3 a 10^7 linhas.
+# A implementação original (laço Python elemento a elemento) é medida apenas até
+# 10^5 linhas, pois acima disso o tempo de execução torna-se proibitivo.
+#
+# Uso: python benchmarks/bench_build_mask_serie.py
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.ts import TimeSerie
+
+LEGACY_MAX_SIZE = 10**5
+
+
+def build_mask_serie_legacy(s: pd.Series) -> pd.Series:
+    mask = np.full(len(s), 1.0)
+    previus = s[0]
+    for idx, v in enumerate(mask):
+        value = s[idx]
+        if not np.isnan(value):
+            mask[idx] = np.nan
+        if idx < len(mask) - 2 and np.isnan(s[idx + 1]):
+            mask[idx] = 1.0
+        if idx > 0 and not np.isnan(value) and np.isnan(previus):
+            mask[idx] = 1.0
+        previus = value
+    return pd.Series(mask)
+
+
+def sample_serie(size: int, nan_ratio: float = 0.1) -> pd.Series:
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=size).astype(np.float32)
+    values[rng.random(size) < nan_ratio] = np.nan
+    return pd.Series(values)
+
+
+def elapsed(func, s: pd.Series) -> tuple[float, pd.Series]:
+    start_at = time.perf_counter()
+    result = func(s)
+    return (time.perf_counter() - start_at, result)
+
+
+if __name__ == "__main__":
+    print(f'{"linhas":>10} {"vetorizado (s)":>16} {"original (s)":>14} {"speedup":>9}')
+    for exponent in range(3, 8):
+        size = 10**exponent
+        s = sample_serie(size)
+        vectorized_time, mask = elapsed(TimeSerie.build_mask_serie, s)
+        if size <= LEGACY_MAX_SIZE:
+            legacy_time, legacy_mask = elapsed(build_mask_serie_legacy, s)
+            pd.testing.assert_series_equal(mask, legacy_mask)
+            print(
+                f'{size:>10} {vectorized_time:>16.6f} {legacy_time:>14.6f} '
+                + f'{legacy_time / vectorized_time:>8.1f}x'
+            )
+        else:
+            print(f'{size:>10} {vectorized_time:>16.6f} {"-":>14} {"-":>9}')
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de memória (pico de RSS) para o pipeline copy + normalize + split +
+# add_nan_mask + to_new_df da TimeSerie. O mesmo pipeline é executado em dois processos
+# separados, para que o pico de RSS de uma variante não contamine a outra:
+#   - 'sem CoW': configuração padrão do Pandas, em que as séries derivadas recebem
+#     cópias das colunas;
+#   - 'com CoW': a aplicação habilita o Copy-on-Write do Pandas e as séries derivadas
+#     compartilham os buffers das colunas que não foram modificadas.
+#
+# O add_nan_mask usa interpolação spline, cujo custo cresce mais que linearmente com o
+# número de linhas; por isso a série é larga (muitas features) e não muito longa.
+#
+# Uso: python benchmarks/bench_copy_on_write.py [número de linhas] [número de features]
+
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler  # type: ignore
+
+DEFAULT_ROWS = 40_000
+DEFAULT_FEATURES = 200
+VARIANTS = {'sem CoW': False, 'com CoW': True}
+
+
+def sample_df(rows: int, features: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s')}
+    for idx in range(features):
+        values = rng.normal(size=rows).cumsum().astype(np.float32)
+        values[rng.random(rows) < 0.01] = np.nan
+        data[f'f{idx:03d}'] = values
+    return pd.DataFrame(data)
+
+
+def peak_rss_mb() -> float:
+    # Em Linux ru_maxrss é informado em KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(df: pd.DataFrame) -> None:
+    from t8s.ts import TimeSerie
+
+    ts = TimeSerie(df, format='wide', features_qty=len(df.columns))
+    ts_copy = ts.copy()
+    ts_norm = ts_copy.normalize(MinMaxScaler(), [df.columns[1]], inplace=False)
+    univariate_list = ts_norm.split()
+    ts_masked = univariate_list[0].add_nan_mask()
+    df_plot = ts_norm.plot.to_new_df()
+    assert len(df_plot) == len(df) and ts_masked.df.columns.size == 3
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        variant, rows, features = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+        pd.set_option('mode.copy_on_write', VARIANTS[variant])
+        df = sample_df(rows, features)
+        baseline = peak_rss_mb()
+        start_at = time.perf_counter()
+        run(df)
+        print(
+            f'{baseline:.1f} {peak_rss_mb():.1f} {time.perf_counter() - start_at:.2f}'
+        )
+        sys.exit(0)
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    features = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_FEATURES
+    input_mb = sample_df(rows, features).memory_usage(deep=True).sum() / 2**20
+    print(
+        f'linhas = {rows}, features = {features}, '
+        + f'tamanho da série de entrada = {input_mb:.1f} MiB'
+    )
+    print(
+        f'{"variante":>10} {"RSS após dados (MiB)":>22} {"pico de RSS (MiB)":>18} '
+        + f'{"tempo (s)":>10}'
+    )
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, __file__, variant, str(rows), str(features)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        print(
+            f'{variant:>10} {float(output[0]):>22.1f} {float(output[1]):>18.1f} '
+            + f'{float(output[2]):>10.2f}'
+        )
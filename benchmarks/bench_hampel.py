@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark do filtro de Hampel (TSHampelFilter): série inteira em memória comparada com
+# a mesma série processada em blocos (como na ingestão por row groups) e com a
+# implementação usual em pandas (rolling().median() e rolling().apply() para o MAD).
+#
+# Uso: python benchmarks/bench_hampel.py [janela] [número de linhas] [linhas por bloco]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.outliers import TSHampelFilter
+from t8s.ts import TimeSerie
+
+DEFAULT_WINDOW = 31
+DEFAULT_ROWS = 1_000_000
+DEFAULT_CHUNK = 100_000
+PANDAS_ROWS = 100_000  # rolling().apply() é lento demais para a série inteira
+
+
+def sensor_df(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = np.cumsum(rng.normal(size=rows))
+    values[rng.choice(rows, rows // 1000, replace=False)] += 50.0
+    return pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s'),
+            'sensor': values,
+        }
+    )
+
+
+def pandas_hampel(df: pd.DataFrame, window: int) -> np.ndarray:
+    rolling = df['sensor'].rolling(window)
+    median = rolling.median()
+    mad = rolling.apply(lambda v: np.median(np.abs(v - np.median(v))), raw=True)
+    return ((df['sensor'] - median).abs() > 3.0 * 1.4826 * mad).to_numpy()
+
+
+def run(df: pd.DataFrame, window: int, chunk_rows: int) -> None:
+    ts = TimeSerie(df, format='wide', features_qty=2)
+    start_at = time.perf_counter()
+    mask = ts.hampel(window)
+    elapsed = time.perf_counter() - start_at
+    print(f'em memória: {elapsed:.2f}s, {int(mask["sensor"].sum())} outliers')
+
+    hampel = TSHampelFilter(window)
+    start_at = time.perf_counter()
+    masks = [
+        hampel.process(
+            TimeSerie(
+                df.iloc[start : start + chunk_rows], format='wide', features_qty=2
+            )
+        )
+        for start in range(0, len(df), chunk_rows)
+    ]
+    chunked_time = time.perf_counter() - start_at
+    assert pd.concat(masks).equals(mask)
+    print(f'em blocos de {chunk_rows} linhas: {chunked_time:.2f}s (resultado idêntico)')
+
+    sample = df.iloc[:PANDAS_ROWS]
+    start_at = time.perf_counter()
+    expected = pandas_hampel(sample, window)
+    pandas_time = time.perf_counter() - start_at
+    start_at = time.perf_counter()
+    sample_mask = TSHampelFilter(window).process(sample)
+    sample_time = time.perf_counter() - start_at
+    np.testing.assert_array_equal(sample_mask['sensor'].to_numpy(), expected)
+    print(
+        f'{len(sample)} linhas: pandas rolling = {pandas_time:.2f}s, '
+        + f'TSHampelFilter = {sample_time:.2f}s ({pandas_time / sample_time:.1f}x)'
+    )
+
+
+if __name__ == "__main__":
+    window = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WINDOW
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    chunk_rows = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_CHUNK
+    df = sensor_df(rows)
+    print(f'janela = {window}, linhas = {rows}')
+    run(df, window, chunk_rows)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de TimeSerie.join para N séries univariadas (500 por padrão), comparando o
+# merge k-way com o pd.merge encadeado usado anteriormente.
+#
+# Uso: python benchmarks/bench_join.py [número de séries] [número de linhas]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.ts import TimeSerie
+
+DEFAULT_SERIES = 500
+DEFAULT_ROWS = 20_000
+
+
+def univariate_list(series: int, rows: int) -> list[TimeSerie]:
+    rng = np.random.default_rng(0)
+    timestamps = pd.date_range('2023-01-01', periods=rows, freq='s')
+    result = []
+    for idx in range(series):
+        # Cada sensor perde algumas amostras, como acontece após a limpeza por sensor
+        keep = rng.random(rows) > 0.001
+        df = pd.DataFrame(
+            {
+                'timestamp': timestamps[keep],
+                f'sensor_{idx:03d}': rng.normal(size=keep.sum()).astype(np.float32),
+            }
+        )
+        result.append(TimeSerie(df, format='wide', features_qty=2))
+    return result
+
+
+def chained_merge(list_of_ts: list[TimeSerie]) -> pd.DataFrame:
+    multivariate_df = list_of_ts[0].df
+    for ts in list_of_ts[1:]:
+        multivariate_df = pd.merge(multivariate_df, ts.df, on='timestamp')
+    return multivariate_df
+
+
+if __name__ == "__main__":
+    series = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SERIES
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    list_of_ts = univariate_list(series, rows)
+    print(f'séries = {series}, linhas por série = {rows}')
+
+    start_at = time.perf_counter()
+    expected = chained_merge(list_of_ts)
+    legacy_time = time.perf_counter() - start_at
+
+    start_at = time.perf_counter()
+    result = TimeSerie.join(list_of_ts).df
+    k_way_time = time.perf_counter() - start_at
+    pd.testing.assert_frame_equal(result, expected)
+    print(
+        f'inner: pd.merge encadeado = {legacy_time:.2f}s, '
+        + f'merge k-way = {k_way_time:.2f}s ({legacy_time / k_way_time:.1f}x)'
+    )
+    for how in ['outer', 'left']:
+        start_at = time.perf_counter()
+        result = TimeSerie.join(list_of_ts, how=how).df
+        elapsed = time.perf_counter() - start_at
+        print(f'{how}: merge k-way = {elapsed:.2f}s, {len(result)} linhas')
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark das conversões wide -> long (TimeSerie.to_long) e long -> wide
+# (TimeSerie.to_wide) sobre o dataset datasets/machine13_01.parquet replicado até
+# atingir o número de células desejado (50M por padrão). Os caminhos rápidos, sem
+# sort e sem pivot, são comparados com melt + sort_values e pivot.
+#
+# Uso: python benchmarks/bench_long_wide.py [número de células]
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq  # type: ignore
+
+from t8s.ts import TimeSerie
+
+DATASET = Path(__file__).parent.parent / 'datasets' / 'machine13_01.parquet'
+DEFAULT_CELLS = 50_000_000
+
+
+def replicated_df(cells: int) -> pd.DataFrame:
+    df = pq.read_table(DATASET).to_pandas()
+    df = df.rename(columns={df.columns[0]: 'timestamp'})
+    value_columns = list(df.columns[1:])
+    rows = cells // len(value_columns)
+    repeats = -(-rows // len(df))
+    # Os timestamps são regenerados com o mesmo intervalo do dataset original para que a
+    # série replicada continue regular e estritamente crescente.
+    interval = df['timestamp'].iloc[1] - df['timestamp'].iloc[0]
+    data = {
+        'timestamp': pd.date_range(df['timestamp'].iloc[0], periods=rows, freq=interval)
+    }
+    for col in value_columns:
+        data[col] = np.tile(df[col].to_numpy(), repeats)[:rows]
+    return pd.DataFrame(data)
+
+
+def elapsed(func) -> tuple[float, pd.DataFrame]:
+    start_at = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start_at, result)
+
+
+if __name__ == "__main__":
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CELLS
+    df_wide = replicated_df(cells)
+    print(f'células = {cells}, linhas (wide) = {len(df_wide)}')
+
+    def melt_and_sort() -> pd.DataFrame:
+        df_long = pd.melt(
+            df_wide, id_vars=['timestamp'], var_name='ds', value_name='value'
+        )
+        df_long.sort_values(by=['timestamp', 'ds'], inplace=True)
+        return df_long
+
+    def fast_to_long() -> pd.DataFrame:
+        ts = TimeSerie(df_wide, format='wide', features_qty=len(df_wide.columns))
+        ts.to_long()
+        return ts.df
+
+    legacy_time, df_long_legacy = elapsed(melt_and_sort)
+    fast_time, df_long = elapsed(fast_to_long)
+    pd.testing.assert_frame_equal(df_long, df_long_legacy)
+    del df_long_legacy
+    print(
+        f'to_long: melt + sort = {legacy_time:.2f}s, sem sort = {fast_time:.2f}s '
+        + f'({legacy_time / fast_time:.1f}x)'
+    )
+
+    def pivot() -> pd.DataFrame:
+        return df_long.pivot(index='timestamp', columns='ds', values='value')
+
+    def fast_to_wide() -> pd.DataFrame:
+        ts = TimeSerie(df_long, format='long', features_qty=len(df_wide.columns))
+        ts.to_wide()
+        return ts.df
+
+    legacy_time, df_wide_legacy = elapsed(pivot)
+    fast_time, df_wide_fast = elapsed(fast_to_wide)
+    pd.testing.assert_frame_equal(df_wide_fast, df_wide_legacy)
+    print(
+        f'to_wide: pivot = {legacy_time:.2f}s, reshape = {fast_time:.2f}s '
+        + f'({legacy_time / fast_time:.1f}x)'
+    )
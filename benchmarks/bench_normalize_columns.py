@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark da normalização por coluna (um scaler por coluna) de uma série wide com
+# 200 colunas: tempo de parede de TimeSerie.normalize() com uma fábrica de scalers para
+# diferentes tamanhos do pool de threads, comparado com o laço sequencial de
+# fit_transform() por coluna (o que fazíamos fora do t8s). Para cada tamanho do pool
+# são informados o ganho em relação a 1 thread e a eficiência paralela (ganho dividido
+# pelo número de CPUs efetivamente usadas). O tempo é o menor de REPEAT execuções.
+#
+# A escala multi-core só pode ser medida numa máquina com várias CPUs disponíveis para
+# o processo; com 1 CPU, o ganho esperado é ~1x para qualquer tamanho do pool.
+#
+# Uso: python benchmarks/bench_normalize_columns.py [número de colunas] [número de linhas]
+#      [tamanhos do pool, separados por vírgula (padrão: potências de 2 até o número de
+#      CPUs, no mínimo até 8)]
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from t8s.ts import TimeSerie
+
+DEFAULT_COLUMNS = 200
+DEFAULT_ROWS = 200_000
+REPEAT = 3
+
+
+def available_cpus() -> int:
+    # CPUs em que o processo pode executar (pode ser menor que os.cpu_count())
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def default_workers(cpus: int) -> list[int]:
+    workers = [1]
+    while workers[-1] < max(cpus, 8):
+        workers.append(workers[-1] * 2)
+    return workers
+
+
+def wide_df(columns: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s')}
+    for idx in range(columns):
+        data[f'sensor_{idx:03d}'] = (rng.normal(size=rows) * (idx + 1)).astype(
+            np.float32
+        )
+    return pd.DataFrame(data)
+
+
+def sklearn_per_column(df: pd.DataFrame, factory) -> dict[str, np.ndarray]:
+    return {col: factory().fit_transform(df[[col]]).ravel() for col in df.columns[1:]}
+
+
+def run(df: pd.DataFrame, factory, workers_list: list[int], cpus: int) -> None:
+    start_at = time.perf_counter()
+    expected = sklearn_per_column(df, factory)
+    legacy_time = time.perf_counter() - start_at
+    print(
+        f'{factory.__name__}: fit_transform() por coluna = {legacy_time:.2f}s',
+        flush=True,
+    )
+
+    ts = TimeSerie(df, format='wide', features_qty=df.columns.size)
+    baseline = None
+    for workers in workers_list:
+        elapsed = np.inf
+        for _ in range(REPEAT):
+            start_at = time.perf_counter()
+            result = ts.normalize(factory, inplace=False, max_workers=workers)
+            elapsed = min(elapsed, time.perf_counter() - start_at)
+        baseline = baseline or elapsed
+        assert len(result.scaler) == df.columns.size - 1
+        for col in df.columns[1:]:
+            np.testing.assert_allclose(result.df[col], expected[col], atol=1e-5)
+        speedup = baseline / elapsed
+        efficiency = speedup / min(workers, cpus)
+        print(
+            f'    max_workers = {workers}: {elapsed:.2f}s '
+            + f'(ganho {speedup:.2f}x, eficiência {efficiency:.0%}, '
+            + f'{legacy_time / elapsed:.1f}x mais rápido que o laço)'
+        )
+
+
+if __name__ == "__main__":
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COLUMNS
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    cpus = available_cpus()
+    workers_list = default_workers(cpus)
+    if len(sys.argv) > 3:
+        workers_list = [int(workers) for workers in sys.argv[3].split(',')]
+    df = wide_df(columns, rows)
+    print(f'colunas = {columns}, linhas = {rows}, CPUs disponíveis = {cpus}')
+    if cpus == 1:
+        print('Atenção: com 1 CPU a escala multi-core não pode ser medida')
+    for factory in [MinMaxScaler, StandardScaler, RobustScaler]:
+        run(df, factory, workers_list, cpus)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de TimeSerie.detect_outliers: z-score, IQR e MAD sobre todas as colunas
+# numéricas de uma série longa, comparado com a implementação anterior de
+# Util.detect_outliers (uma coluna por vez, com as máscaras montadas em listas Python).
+#
+# Uso: python benchmarks/bench_outliers.py [número de colunas] [número de linhas]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import zscore
+
+from t8s.ts import TimeSerie
+
+DEFAULT_COLUMNS = 4
+DEFAULT_ROWS = 10_000_000
+
+
+def sensor_df(columns: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s')}
+    for idx in range(columns):
+        data[f'sensor_{idx:02d}'] = rng.standard_t(3, size=rows)
+    return pd.DataFrame(data)
+
+
+def legacy_detect_outliers(df: pd.DataFrame, col: str, method: str) -> list:
+    # Util.detect_outliers antes da vetorização
+    values = df[col]
+    if method == 'zscore':
+        z_scores = zscore(values)
+        limit = 2.0
+        return [abs(z_score) > limit for z_score in z_scores]
+    q25 = np.percentile(values, 25)
+    q75 = np.percentile(values, 75)
+    iqr = q75 - q25
+    lower_bound = q25 - 1.5 * iqr
+    upper_bound = q75 + 1.5 * iqr
+    return [value < lower_bound or value > upper_bound for value in values]
+
+
+def run(df: pd.DataFrame) -> None:
+    ts = TimeSerie(df, format='wide', features_qty=df.columns.size)
+    for method in ['zscore', 'iqr']:
+        start_at = time.perf_counter()
+        expected = {
+            col: legacy_detect_outliers(df, col, method) for col in df.columns[1:]
+        }
+        legacy_time = time.perf_counter() - start_at
+        start_at = time.perf_counter()
+        mask = ts.detect_outliers(method)
+        elapsed = time.perf_counter() - start_at
+        for col in df.columns[1:]:
+            assert np.array_equal(mask[col].to_numpy(), np.array(expected[col]))
+        del expected
+        print(
+            f'{method}: Util.detect_outliers por coluna = {legacy_time:.2f}s, '
+            + f'detect_outliers = {elapsed:.2f}s ({legacy_time / elapsed:.1f}x)'
+        )
+    start_at = time.perf_counter()
+    mask = ts.detect_outliers(['zscore', 'iqr', 'mad'])
+    elapsed = time.perf_counter() - start_at
+    print(
+        f'zscore + iqr + mad: {elapsed:.2f}s, máscara com '
+        + f'{mask.memory_usage(index=False).sum() / 2**20:.1f} MiB'
+    )
+
+
+if __name__ == "__main__":
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COLUMNS
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    df = sensor_df(columns, rows)
+    print(f'colunas = {columns}, linhas = {rows}')
+    run(df)
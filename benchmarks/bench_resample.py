@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de TimeSerie.resample: dados de máquina a 1 Hz reamostrados em barras de 1
+# minuto, comparando o motor de passada única com um pd.resample por coluna e por agregação.
+#
+# Uso: python benchmarks/bench_resample.py [número de colunas] [número de linhas]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.ts import TimeSerie
+
+DEFAULT_COLUMNS = 20
+DEFAULT_ROWS = 7 * 24 * 3600  # Uma semana a 1 Hz
+AGGS = ['mean', 'min', 'max', 'last', 'count']
+
+
+def machine_df(columns: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s')}
+    for idx in range(columns):
+        values = rng.normal(size=rows).astype(np.float32)
+        values[rng.random(rows) < 0.01] = np.nan
+        data[f'sensor_{idx:02d}'] = values
+    return pd.DataFrame(data)
+
+
+def chained_resample(df: pd.DataFrame) -> pd.DataFrame:
+    indexed = df.set_index('timestamp')
+    result = {}
+    for col in indexed.columns:
+        for agg in AGGS:
+            result[f'{col}_{agg}'] = getattr(indexed[col].resample('1min'), agg)()
+    return pd.DataFrame(result).reset_index()
+
+
+if __name__ == "__main__":
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COLUMNS
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    df = machine_df(columns, rows)
+    print(f'colunas = {columns}, linhas = {rows}, agregações = {AGGS}')
+
+    start_at = time.perf_counter()
+    expected = chained_resample(df)
+    legacy_time = time.perf_counter() - start_at
+
+    ts = TimeSerie(df, format='wide', features_qty=columns + 1)
+    start_at = time.perf_counter()
+    result = ts.resample('1min', AGGS).df
+    wide_time = time.perf_counter() - start_at
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_freq=False)
+    print(
+        f'wide: pd.resample por coluna/agregação = {legacy_time:.2f}s, '
+        + f'resample = {wide_time:.2f}s ({legacy_time / wide_time:.1f}x)'
+    )
+
+    ts.to_long()
+    start_at = time.perf_counter()
+    result = ts.resample('1min', AGGS).df
+    print(
+        f'long: resample = {time.perf_counter() - start_at:.2f}s, {len(result)} linhas'
+    )
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Benchmark de TimeSerie.rolling: estatísticas em janelas de 5 minutos sobre dados de
+# máquina a 1 Hz, comparando o motor de janelas móveis com um pd.rolling por coluna e por
+# estatística (o que fazíamos fora do t8s).
+#
+# Uso: python benchmarks/bench_rolling.py [número de colunas] [número de linhas]
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from t8s.ts import TimeSerie
+
+DEFAULT_COLUMNS = 20
+DEFAULT_ROWS = 7 * 24 * 3600  # Uma semana a 1 Hz
+WINDOW = '5min'
+STATS = ['mean', 'std', 'min', 'max']
+
+
+def machine_df(columns: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    data = {'timestamp': pd.date_range('2023-01-01', periods=rows, freq='s')}
+    for idx in range(columns):
+        values = rng.normal(size=rows).astype(np.float32)
+        values[rng.random(rows) < 0.01] = np.nan
+        data[f'sensor_{idx:02d}'] = values
+    return pd.DataFrame(data)
+
+
+def pandas_rolling(df: pd.DataFrame, stats: list[str]) -> pd.DataFrame:
+    indexed = df.set_index('timestamp')
+    result = {}
+    for col in indexed.columns:
+        for stat in stats:
+            rolling = indexed[col].rolling(WINDOW)
+            result[f'{col}_{stat}'] = getattr(rolling, stat)()
+    return pd.DataFrame(result).reset_index()
+
+
+def run(df: pd.DataFrame, stats: list[str]) -> None:
+    start_at = time.perf_counter()
+    expected = pandas_rolling(df, stats)
+    legacy_time = time.perf_counter() - start_at
+
+    ts = TimeSerie(df, format='wide', features_qty=df.columns.size)
+    start_at = time.perf_counter()
+    result = ts.rolling(WINDOW, stats).df
+    rolling_time = time.perf_counter() - start_at
+    for col in expected.columns[1:]:
+        np.testing.assert_allclose(result[col], expected[col], rtol=1e-4, atol=1e-5)
+    print(
+        f'{stats}: pd.rolling por coluna/estatística = {legacy_time:.2f}s, '
+        + f'rolling = {rolling_time:.2f}s ({legacy_time / rolling_time:.1f}x)'
+    )
+
+
+if __name__ == "__main__":
+    columns = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COLUMNS
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+    df = machine_df(columns, rows)
+    print(f'colunas = {columns}, linhas = {rows}, janela = {WINDOW}')
+    run(df, STATS)
+    run(df, ['mean', 'count'])
+    run(df, ['median', 'max'])
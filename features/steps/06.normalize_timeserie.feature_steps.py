@@ -10,7 +10,10 @@ from behave.model import Table  # type: ignore
 from behave_pandas import dataframe_to_table, table_to_dataframe  # type: ignore
 from sklearn.base import TransformerMixin  # type: ignore
 from sklearn.preprocessing import (  # type: ignore
+    MaxAbsScaler,
     MinMaxScaler,
+    PowerTransformer,
+    QuantileTransformer,
     RobustScaler,
     StandardScaler,
 )
@@ -25,6 +28,39 @@ from t8s.util import Util
 
 logger = LogConfig().get_logger()
 
+# Epsilon usado na comparação dos valores originais com os valores denormalizados.
+EPSILON = 1e-3
+
+
+def build_scalers(text: str, n_samples: int) -> list[TransformerMixin]:
+    # Cria os scalers cujos nomes são informados na docstring do cenário.
+    factories = {
+        'StandardScaler': lambda: StandardScaler(),
+        'MinMaxScaler': lambda: MinMaxScaler(feature_range=(-1, 1)),
+        'RobustScaler': lambda: RobustScaler(),
+        'MaxAbsScaler': lambda: MaxAbsScaler(),
+        'QuantileTransformer': lambda: QuantileTransformer(n_quantiles=n_samples),
+        'PowerTransformer': lambda: PowerTransformer(),
+    }
+    names = [name.strip() for name in text.split(',')]
+    return [factories[name]() for name in names]
+
+
+def check_denormalization(ts: TimeSerie, ts_normalized_list: list[TimeSerie]):
+    for ts_normalized in ts_normalized_list:
+        columns = ts_normalized.get_normalized_column_names()
+        ts_denormalized = ts_normalized.denormalize()
+        logger.info(
+            f'scaler = {type(ts_normalized.scaler)}, columns = {columns}\n'
+            + f'ts_denormalized =\n{ts_denormalized}'
+        )
+        for col in ts.df.columns[1:]:
+            expected = ts.df[col].to_numpy(dtype=np.float64)
+            result = ts_denormalized.df[col].to_numpy(dtype=np.float64)
+            assert np.allclose(
+                expected, result, atol=EPSILON
+            ), f'{type(ts_normalized.scaler)}: {col} -> {expected} != {result}'
+
 
 def main():
     # ----------------- Exemplo de seleção em uma série temporal -----------------
@@ -86,7 +122,8 @@ def main():
     # print(f'df_norm =\n{df_norm}\n{type(df_norm)}')
     logger.info(f'ts1_normalized =\n{ts1_normalized}\n{type(ts1_normalized)}')
     # Sem opção inplace=True, o método denormalize() retorna um novo objeto TimeSerie
-    ts1_normalized.denormalize()
+    ts1_denormalized = ts1_normalized.denormalize()
+    logger.info(f'ts1_denormalized =\n{ts1_denormalized}')
     # Obtém os parâmetros do scaler para reverter a normalização
     # min_max = scaler.data_min_, scaler.data_max_
 
@@ -184,10 +221,12 @@ def normalize(context):
         u'STEP: When I normalize the multivariate time series data using the chosen methods below'
     )
     ts1: TimeSerie = context.ts1
-    scaler: TransformerMixin = MinMaxScaler(feature_range=(-1, 1))
-    assert isinstance(scaler, TransformerMixin)
-    context.ts1_normalized = ts1.normalize(scaler, numeric_columns=None, inplace=True)
-    logger.info(f'ts1_normalized =\n{context.ts1_normalized}')
+    context.ts1_normalized_list = []
+    for scaler in build_scalers(context.text, len(ts1.df)):
+        assert isinstance(scaler, TransformerMixin)
+        ts1_normalized = ts1.normalize(scaler, numeric_columns=None, inplace=False)
+        logger.info(f'ts1_normalized =\n{ts1_normalized}')
+        context.ts1_normalized_list.append(ts1_normalized)
 
 
 @then(
@@ -197,15 +236,8 @@ def check_normalization1(context):
     logger.info(
         u'STEP: Then I check the result of normalization running the inverse operation (denormalize) for some values'
     )
-    ts1_normalized: TimeSerie = context.ts1_normalized
-
-    def do_denormalization(ts1_normalized: TimeSerie) -> TimeSerie | None:
-        ts1 = ts1_normalized.denormalize()
-        return ts1
-
-    ts1_denormalized = do_denormalization(ts1_normalized)
-    # Comparar os valores de ts1 e ts1_denormalized
-    logger.info(f'\nts1 =\n{context.ts1}\nts1_denormalized =\n{ts1_denormalized}\n')
+    # Comparar os valores de ts1 e ts1_denormalized para cada um dos scalers
+    check_denormalization(context.ts1, context.ts1_normalized_list)
 
 
 """
@@ -229,6 +261,14 @@ def normalize_some_features(context):
     logger.info(
         u'STEP: When I normalize only some of the features in the multivariate time series data using the methods below'
     )
+    ts1: TimeSerie = context.ts1
+    context.ts1_normalized_list = []
+    for scaler in build_scalers(context.text, len(ts1.df)):
+        ts1_normalized = ts1.normalize(
+            scaler, numeric_columns=['velocidade'], inplace=False
+        )
+        assert ts1_normalized.get_normalized_column_names() == ['velocidade']
+        context.ts1_normalized_list.append(ts1_normalized)
 
 
 @then(
@@ -238,6 +278,7 @@ def check_normalization2(context):
     logger.info(
         u'STEP: Then I check the result of normalization running the inverse operation (denormalize)'
     )
+    check_denormalization(context.ts1, context.ts1_normalized_list)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from t8s.log_config import LogConfig
+from t8s.normalize import TSNormalizer
+from t8s.provenance import TSProvenance
+
+if TYPE_CHECKING:
+    from t8s.ts import TimeSerie
+
+logger = LogConfig().get_logger()
+
+
+class TSResultCache:
+    """
+    Cache dos resultados de TimeSerie.apply_transformation(), indexado pela chave do
+    passo (hash do conteúdo da entrada, nome da transformação e parâmetros, ver
+    TSProvenance.step_key). Há duas camadas:
+
+    - memória: LRU limitado por bytes (`max_bytes`). As séries são guardadas e
+      devolvidas como cópias (TimeSerie.copy(), rasas com Copy-on-Write), de modo que
+      o cliente pode modificar o resultado sem afetar o cache.
+    - disco (opcional): quando `spill_dir` é informado, as entradas removidas da memória
+      são gravadas em `<spill_dir>/<chave>.parquet`, com o formato, as features, a
+      proveniência e a origem da série nos metadados. Essas entradas sobrevivem ao
+      processo e são lidas de volta (sem materializar o DataFrame) quando requisitadas.
+      O scaler das séries normalizadas é gravado com TSNormalizer.scaler_to_json(); as
+      séries cujo scaler não é serializável não vão para o disco.
+
+    Cada entrada guarda o arquivo de origem da série (TimeSerie.source) e o seu mtime.
+    Se o arquivo for modificado, as entradas derivadas dele são invalidadas.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, spill_dir: Path | None = None):
+        assert max_bytes >= 0, 'max_bytes must be a non negative int'
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        if spill_dir is not None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+        # chave -> (série, bytes, origem)
+        self._entries: OrderedDict[str, tuple[TimeSerie, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, step: str) -> bool:
+        return step in self._entries or (
+            self.spill_dir is not None and self.__spill_path(step).exists()
+        )
+
+    def __repr__(self):
+        return (
+            f'TSResultCache(entries={len(self._entries)}, bytes={self._bytes}, '
+            + f'hits={self.hits}, misses={self.misses}, spills={self.spills})'
+        )
+
+    @staticmethod
+    def nbytes(ts: TimeSerie) -> int:
+        # Tamanho aproximado da série em memória (sem seguir referências de objetos)
+        if ts.is_arrow_backed():
+            return ts.to_arrow().nbytes
+        return int(ts.df.memory_usage(index=True, deep=False).sum())
+
+    @staticmethod
+    def is_stale(source: Any) -> bool:
+        # Indica se o arquivo de origem foi modificado (ou removido) desde a leitura
+        if source is None:
+            return False
+        path, mtime = source
+        try:
+            return os.stat(path).st_mtime_ns != mtime
+        except FileNotFoundError:
+            return True
+
+    def __spill_path(self, step: str) -> Path:
+        assert self.spill_dir is not None
+        return self.spill_dir / f'{step}.parquet'
+
+    def get(self, step: str) -> TimeSerie | None:
+        # Retorna uma cópia rasa do resultado do passo `step` ou None
+        entry = self._entries.get(step)
+        if entry is not None:
+            ts, size, source = entry
+            if self.is_stale(source):
+                self.invalidate(source[0])
+                self.misses += 1
+                return None
+            self._entries.move_to_end(step)
+            self.hits += 1
+            return ts.copy()
+        ts = self.__load(step) if self.spill_dir is not None else None
+        if ts is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.put(step, ts)
+        return ts.copy()
+
+    def put(self, step: str, ts: TimeSerie) -> None:
+        if step in self._entries:
+            self._bytes -= self._entries.pop(step)[1]
+        size = self.nbytes(ts)
+        self._entries[step] = (ts.copy(), size, ts.source)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 0:
+            evicted_step, (evicted, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.__spill(evicted_step, evicted)
+
+    def invalidate(self, path: str | Path) -> None:
+        # Remove as entradas (em memória e já gravadas em disco por este processo)
+        # derivadas do arquivo `path`
+        path = str(path)
+        for step, (_, size, source) in list(self._entries.items()):
+            if source is not None and source[0] == path:
+                del self._entries[step]
+                self._bytes -= size
+        if self.spill_dir is not None:
+            for spill_path in self.spill_dir.glob('*.parquet'):
+                metadata = pq.read_schema(spill_path).metadata or {}
+                if metadata.get(b'source', b'').decode() == path:
+                    spill_path.unlink(missing_ok=True)
+        logger.debug(f'TSResultCache: entradas derivadas de {path} invalidadas')
+
+    def clear(self) -> None:
+        # Esvazia a camada em memória (os arquivos em disco são mantidos)
+        self._entries.clear()
+        self._bytes = 0
+
+    def __spill(self, step: str, ts: TimeSerie) -> None:
+        if self.spill_dir is None:
+            return
+        scaler_metadata = TSNormalizer.scaler_metadata(ts.scaler)
+        if ts.scaler is not None and not scaler_metadata:
+            return
+        path = self.__spill_path(step)
+        if path.exists():
+            # A entrada foi lida do disco e o arquivo continua válido
+            return
+        table = ts.to_arrow()
+        metadata = dict(table.schema.metadata or {})
+        metadata.update(
+            {
+                b'format': str(ts.format).encode(),
+                b'features': str(ts.features).encode(),
+                b'provenance': ts._provenance.to_json().encode(),
+            }
+        )
+        metadata.update(scaler_metadata)
+        if ts.source is not None:
+            metadata[b'source'] = ts.source[0].encode()
+            metadata[b'source_mtime'] = str(ts.source[1]).encode()
+        # Grava num arquivo temporário e renomeia, para que uma leitura concorrente
+        # nunca encontre um arquivo incompleto
+        partial = path.with_suffix('.partial')
+        pq.write_table(table.replace_schema_metadata(metadata), partial)
+        partial.replace(path)
+        self.spills += 1
+        logger.debug(f'TSResultCache: {step} gravado em {path}')
+
+    def __load(self, step: str) -> TimeSerie | None:
+        from t8s.ts import TimeSerie
+
+        path = self.__spill_path(step)
+        if not path.exists():
+            return None
+        table: pa.Table = pq.read_table(path)
+        metadata = table.schema.metadata
+        source = None
+        if b'source' in metadata:
+            source = (
+                metadata[b'source'].decode(),
+                int(metadata[b'source_mtime'].decode()),
+            )
+            if self.is_stale(source):
+                path.unlink(missing_ok=True)
+                return None
+        ts = TimeSerie(
+            table,
+            format=metadata[b'format'].decode(),
+            features_qty=int(metadata[b'features'].decode()),
+        )
+        ts._provenance = TSProvenance.from_json(metadata[b'provenance'])
+        ts.source = source
+        if b'scaler' in metadata:
+            ts.scaler = TSNormalizer.scaler_from_json(metadata[b'scaler'])
+        return ts
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from t8s.log_config import LogConfig
+
+logger = LogConfig().get_logger()
+
+
+class TSJoiner:
+    """
+    Motor de junção de séries temporais no formato wide. Em vez de encadear um pd.merge
+    por série (O(N^2) em cópias e construções de hash tables), as colunas de timestamp
+    ordenadas de todas as séries são alinhadas numa única passada de merge k-way e o
+    DataFrame resultante é montado com uma única alocação por tipo de dado.
+
+    Por contrato a primeira coluna de cada DataFrame é o timestamp.
+    """
+
+    HOW = ['inner', 'outer', 'left']
+    DIRECTIONS = ['backward', 'forward', 'nearest']
+
+    @staticmethod
+    def timestamps_as_int64(s: pd.Series) -> np.ndarray:
+        # Visão int64 (sem cópia) dos timestamps, com ou sem timezone
+        return s.array.asi8  # type: ignore
+
+    @staticmethod
+    def int64_as_timestamps(values: np.ndarray, like: pd.Series) -> pd.Series:
+        # Operação inversa de timestamps_as_int64(), usando o dtype de `like`
+        dtype = like.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            index = pd.DatetimeIndex(values.view(f'M8[{dtype.unit}]'))
+            return pd.Series(
+                index.tz_localize('UTC').tz_convert(dtype.tz), name=like.name
+            )
+        return pd.Series(values.view(dtype), name=like.name)
+
+    @staticmethod
+    def union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        # União de dois arrays ordenados e sem repetições, em O(len(a) + len(b))
+        pos = np.searchsorted(a, b)
+        found = pos < len(a)
+        found[found] = a[pos[found]] == b[found]
+        return np.insert(a, pos[~found], b[~found])
+
+    @staticmethod
+    def intersection(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        # Interseção de dois arrays ordenados e sem repetições
+        pos = np.searchsorted(b, a)
+        found = pos < len(b)
+        found[found] = b[pos[found]] == a[found]
+        return a[found]
+
+    @staticmethod
+    def merge_keys(keys: list[np.ndarray], how: str) -> np.ndarray:
+        # Merge k-way das chaves ordenadas, organizado como um torneio: a cada rodada
+        # os arrays são combinados dois a dois, totalizando O(n log k) operações
+        # vetorizadas.
+        if how == 'left':
+            return keys[0]
+        if how == 'inner':
+            # A interseção começa pelos menores arrays, que limitam o resultado
+            keys = sorted(keys, key=len)
+        combine = TSJoiner.union if how == 'outer' else TSJoiner.intersection
+        while len(keys) > 1:
+            merged = [combine(keys[i], keys[i + 1]) for i in range(0, len(keys) - 1, 2)]
+            if len(keys) % 2 == 1:
+                merged.append(keys[-1])
+            keys = merged
+        return keys[0]
+
+    @staticmethod
+    def indexer(sorted_keys: np.ndarray, order: np.ndarray | None, keys: np.ndarray):
+        # Posição de cada chave do resultado na série de origem (-1 quando ausente)
+        pos = np.searchsorted(sorted_keys, keys)
+        found = pos < len(sorted_keys)
+        found[found] = sorted_keys[pos[found]] == keys[found]
+        pos[~found] = -1
+        if order is not None:
+            pos[found] = order[pos[found]]
+        return pos, bool(found.all())
+
+    @staticmethod
+    def sorted_keys(dfs: list[pd.DataFrame]):
+        # Extrai e ordena (se necessário) os timestamps int64 de cada DataFrame. Retorna
+        # None quando o motor não se aplica (timestamps repetidos, tipos de timestamp
+        # diferentes ou nomes de colunas em conflito). Nesse caso o chamador deve usar o
+        # pd.merge, que trata esses casos com produto cartesiano e sufixos.
+        timestamps = [df[df.columns[0]] for df in dfs]
+        if any(ts.dtype != timestamps[0].dtype for ts in timestamps):
+            return None
+        value_columns = [col for df in dfs for col in df.columns[1:]]
+        if (
+            len(set(value_columns)) != len(value_columns)
+            or timestamps[0].name in value_columns
+        ):
+            return None
+
+        sorted_keys: list[np.ndarray] = []
+        orders: list[np.ndarray | None] = []
+        for ts in timestamps:
+            values = TSJoiner.timestamps_as_int64(ts)
+            order = None
+            if not ts.is_monotonic_increasing:
+                order = np.argsort(values, kind='stable')
+                values = values[order]
+            if len(values) > 1 and not (values[1:] > values[:-1]).all():
+                return None
+            sorted_keys.append(values)
+            orders.append(order)
+        return (timestamps[0], sorted_keys, orders)
+
+    @staticmethod
+    def assemble(
+        dfs: list[pd.DataFrame],
+        timestamp: pd.Series,
+        keys: np.ndarray,
+        indexers: list[tuple[np.ndarray, bool]],
+    ) -> pd.DataFrame:
+        # Monta o DataFrame wide a partir das posições (indexers) de cada série. As
+        # colunas numéricas são agrupadas por dtype para alocar um único bloco 2D por
+        # dtype.
+        plan = []
+        blocks_size: dict[np.dtype, int] = {}
+        for df, (idx, complete) in zip(dfs, indexers):
+            for col in df.columns[1:]:
+                dtype = df[col].dtype
+                if isinstance(dtype, np.dtype) and dtype.kind in 'iufb':
+                    if not complete and dtype.kind != 'f':
+                        dtype = np.dtype(np.float64)
+                    plan.append(
+                        (col, df[col], idx, complete, dtype, blocks_size.get(dtype, 0))
+                    )
+                    blocks_size[dtype] = blocks_size.get(dtype, 0) + 1
+                else:
+                    plan.append((col, df[col], idx, complete, None, 0))
+
+        blocks = {
+            dtype: np.empty((size, len(keys)), dtype=dtype)
+            for dtype, size in blocks_size.items()
+        }
+        data: dict = {timestamp.name: TSJoiner.int64_as_timestamps(keys, timestamp)}
+        for col, s, idx, complete, dtype, row in plan:
+            if dtype is None:
+                data[col] = take(s.array, idx, allow_fill=not complete)
+                continue
+            out = blocks[dtype][row]
+            if s.dtype == dtype:
+                np.take(s.to_numpy(), idx, out=out, mode='clip')
+            else:
+                out[:] = s.to_numpy()[idx]
+            if not complete:
+                out[idx < 0] = np.nan
+            data[col] = out
+        return pd.DataFrame(data, copy=False)
+
+    @staticmethod
+    def k_way_merge(dfs: list[pd.DataFrame], how: str = 'inner') -> pd.DataFrame | None:
+        if how not in TSJoiner.HOW:
+            raise ValueError(f'Unknown join type: {how}')
+        prepared = TSJoiner.sorted_keys(dfs)
+        if prepared is None:
+            return None
+        timestamp, sorted_keys, orders = prepared
+
+        keys = TSJoiner.merge_keys(sorted_keys, how)
+        if how == 'left':
+            keys = TSJoiner.timestamps_as_int64(timestamp)
+        indexers = [
+            TSJoiner.indexer(sorted_key, order, keys)
+            for sorted_key, order in zip(sorted_keys, orders)
+        ]
+        logger.debug(f'k_way_merge({how}): {len(dfs)} séries, {len(keys)} linhas')
+        return TSJoiner.assemble(dfs, timestamp, keys, indexers)
+
+    @staticmethod
+    def asof_indexer(
+        sorted_keys: np.ndarray,
+        order: np.ndarray | None,
+        keys: np.ndarray,
+        direction: str,
+        tolerance: int | None,
+    ):
+        # Posição, na série de origem, da amostra mais próxima de cada chave do
+        # relógio de referência segundo a direção escolhida (-1 quando não há amostra
+        # dentro da tolerância). Em caso de empate no modo 'nearest' a amostra anterior
+        # é escolhida, como no pd.merge_asof.
+        size = len(sorted_keys)
+        if size == 0:
+            return np.full(len(keys), -1), len(keys) == 0
+        backward = np.searchsorted(sorted_keys, keys, side='right') - 1
+        backward_distance = np.where(
+            backward >= 0,
+            keys - sorted_keys[np.maximum(backward, 0)],
+            np.iinfo(np.int64).max,
+        )
+        forward = np.searchsorted(sorted_keys, keys, side='left')
+        forward_distance = np.where(
+            forward < size,
+            sorted_keys[np.minimum(forward, size - 1)] - keys,
+            np.iinfo(np.int64).max,
+        )
+        if direction == 'backward':
+            pos, distance = backward, backward_distance
+        elif direction == 'forward':
+            pos, distance = forward, forward_distance
+        else:
+            use_forward = forward_distance < backward_distance
+            pos = np.where(use_forward, forward, backward)
+            distance = np.where(use_forward, forward_distance, backward_distance)
+        found = distance != np.iinfo(np.int64).max
+        if tolerance is not None:
+            found &= distance <= tolerance
+        pos = np.where(found, pos, -1)
+        if order is not None:
+            pos[found] = order[pos[found]]
+        return pos, bool(found.all())
+
+    @staticmethod
+    def asof_merge(
+        dfs: list[pd.DataFrame],
+        direction: str = 'backward',
+        tolerance: pd.Timedelta | str | None = None,
+    ) -> pd.DataFrame | None:
+        # Alinha as séries sobre o relógio de referência (timestamps da primeira
+        # série), tomando de cada série a amostra anterior ('backward'), posterior
+        # ('forward') ou mais próxima ('nearest') dentro da tolerância. Retorna None nos
+        # mesmos casos que k_way_merge().
+        if direction not in TSJoiner.DIRECTIONS:
+            raise ValueError(f'Unknown direction: {direction}')
+        if tolerance is not None and pd.Timedelta(tolerance) < pd.Timedelta(0):
+            # Como no pd.merge_asof
+            raise ValueError(f'tolerance must be positive: {tolerance}')
+        prepared = TSJoiner.sorted_keys(dfs)
+        if prepared is None:
+            return None
+        timestamp, sorted_keys, orders = prepared
+
+        tolerance_int: int | None = None
+        if tolerance is not None:
+            if isinstance(timestamp.dtype, pd.DatetimeTZDtype):
+                unit = timestamp.dtype.unit
+            else:
+                unit = np.datetime_data(timestamp.dtype)[0]
+            tolerance_int = int(
+                np.timedelta64(pd.Timedelta(tolerance))
+                .astype(f'm8[{unit}]')
+                .astype(np.int64)
+            )
+
+        keys = TSJoiner.timestamps_as_int64(timestamp)
+        indexers = [(np.arange(len(keys)), True)] + [
+            TSJoiner.asof_indexer(sorted_key, order, keys, direction, tolerance_int)
+            for sorted_key, order in zip(sorted_keys[1:], orders[1:])
+        ]
+        logger.debug(f'asof_merge({direction}): {len(dfs)} séries, {len(keys)} linhas')
+        return TSJoiner.assemble(dfs, timestamp, keys, indexers)
@@ -0,0 +1,678 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import base64
+import copy
+import importlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import sklearn  # type: ignore
+from scipy import stats  # type: ignore
+from sklearn.base import BaseEstimator, TransformerMixin, clone  # type: ignore
+from sklearn.preprocessing import (  # type: ignore
+    MaxAbsScaler,
+    MinMaxScaler,
+    RobustScaler,
+    StandardScaler,
+)
+
+from t8s.log_config import LogConfig
+
+logger = LogConfig().get_logger()
+
+
+class TSNormalizer:
+    """
+    Normalização de colunas de séries temporais sem DataFrames intermediários. Os
+    scalers do scikit-learn convertem a entrada para um bloco 2D e devolvem float64, o
+    que dobra o tamanho de séries float32. Aqui:
+
+    - o fit é feito por blocos de `block_rows` linhas com partial_fit() quando o scaler
+      o suporta (MinMaxScaler, StandardScaler, MaxAbsScaler). Os demais recebem um
+      único bloco 2D;
+    - scalers afins (os anteriores e o RobustScaler) são aplicados coluna a coluna
+      diretamente no dtype de saída, sem chamar transform(). Os demais passam pelo
+      transform() do scikit-learn e o resultado é convertido coluna a coluna;
+    - colunas float mantêm o dtype e colunas inteiras passam para o menor float que as
+      representa (ex.: int16 -> float32, int32 -> float64).
+
+    Após o ajuste, os nomes das colunas são registrados em `feature_names_in_`, como se o
+    scaler tivesse recebido um DataFrame, para que denormalize() saiba quais colunas
+    reverter.
+
+    O scaler ajustado pode ser serializado (scaler_to_json/scaler_from_json) nos
+    metadados dos arquivos Parquet, para que a série lida possa ser denormalizada sem
+    um novo ajuste.
+    """
+
+    BLOCK_ROWS = 65536
+    # Apenas classes destes pacotes são instanciadas por scaler_from_json()
+    TRUSTED_MODULES = ('sklearn.',)
+
+    @staticmethod
+    def output_dtype(dtype: np.dtype) -> np.dtype:
+        if dtype.kind == 'f':
+            return dtype
+        return np.result_type(dtype, np.float32)
+
+    @staticmethod
+    def affine_params(scaler: TransformerMixin):
+        # Parâmetros do scaler ajustado na forma (kind, a, b):
+        # - 'scale': y = x * a + b (MinMaxScaler)
+        # - 'shift': y = (x - a) / b (StandardScaler, RobustScaler e MaxAbsScaler)
+        # Retorna None se o scaler não for afim ou não for suportado.
+        if isinstance(scaler, MinMaxScaler):
+            if scaler.clip:
+                return None
+            return ('scale', scaler.scale_, scaler.min_)
+        if isinstance(scaler, StandardScaler):
+            return ('shift', scaler.mean_ if scaler.with_mean else None, scaler.scale_)
+        if isinstance(scaler, RobustScaler):
+            return ('shift', scaler.center_, scaler.scale_)
+        if isinstance(scaler, MaxAbsScaler):
+            return ('shift', None, scaler.scale_)
+        return None
+
+    @staticmethod
+    def block(columns: list[np.ndarray], start: int, stop: int, dtype) -> np.ndarray:
+        # Bloco 2D (linhas x colunas) com as linhas [start, stop) das colunas
+        result = np.empty((stop - start, len(columns)), dtype=dtype)
+        for idx, values in enumerate(columns):
+            result[:, idx] = values[start:stop]
+        return result
+
+    @staticmethod
+    def fit(
+        scaler: TransformerMixin,
+        columns: list[np.ndarray],
+        block_rows: int = BLOCK_ROWS,
+        reset: bool = True,
+    ) -> np.ndarray | None:
+        # Ajusta o scaler. Para scalers sem partial_fit() retorna o bloco 2D usado no fit,
+        # que é reaproveitado por transform() quando o scaler não for afim. Os nomes das
+        # colunas só são registrados no scaler depois do transform(), ver normalize_frame().
+        # Com reset=False o ajuste continua o anterior (apenas scalers com partial_fit).
+        dtype = np.result_type(*[TSNormalizer.output_dtype(c.dtype) for c in columns])
+        rows = len(columns[0])
+        if hasattr(scaler, 'partial_fit'):
+            # partial_fit() acumula sobre um ajuste anterior: o scaler é reiniciado, como
+            # faz o seu próprio fit()
+            if reset:
+                TSNormalizer.__unfit(scaler)
+            for start in range(0, rows, block_rows):
+                stop = min(start + block_rows, rows)
+                scaler.partial_fit(TSNormalizer.block(columns, start, stop, dtype))
+            full_block = None
+        else:
+            full_block = TSNormalizer.block(columns, 0, rows, dtype)
+            scaler.fit(full_block)
+        return full_block
+
+    @staticmethod
+    def __unfit(scaler: TransformerMixin) -> None:
+        # Descarta o ajuste anterior do scaler, mantendo o mesmo objeto: os atributos
+        # passam a ser apenas os hiperparâmetros, como no sklearn.base.clone()
+        unfitted = vars(clone(scaler))
+        vars(scaler).clear()
+        vars(scaler).update(unfitted)
+
+    @staticmethod
+    def apply(
+        kind: str, a, b, values: np.ndarray, dtype: np.dtype, inverse: bool = False
+    ) -> np.ndarray:
+        # Aplica a transformação afim (ou a sua inversa) a uma coluna, no dtype `dtype`.
+        # A ordem das operações é a mesma do scikit-learn.
+        out = np.array(values, dtype=dtype, copy=True)
+        if kind == 'scale':
+            if inverse:
+                out -= dtype.type(b)
+                out /= dtype.type(a)
+            else:
+                out *= dtype.type(a)
+                out += dtype.type(b)
+        else:
+            if inverse:
+                if b is not None:
+                    out *= dtype.type(b)
+                if a is not None:
+                    out += dtype.type(a)
+            else:
+                if a is not None:
+                    out -= dtype.type(a)
+                if b is not None:
+                    out /= dtype.type(b)
+        return out
+
+    @staticmethod
+    def transform(
+        scaler: TransformerMixin,
+        columns: list[np.ndarray],
+        inverse: bool = False,
+        fit_block: np.ndarray | None = None,
+    ) -> list[np.ndarray]:
+        # Aplica o scaler ajustado (ou a sua inversa) e retorna uma coluna nova por
+        # coluna de entrada, no dtype de saída correspondente
+        dtypes = [TSNormalizer.output_dtype(c.dtype) for c in columns]
+        params = TSNormalizer.affine_params(scaler)
+        if params is not None:
+            kind, a, b = params
+            return [
+                TSNormalizer.apply(
+                    kind,
+                    None if a is None else a[idx],
+                    None if b is None else b[idx],
+                    values,
+                    dtypes[idx],
+                    inverse,
+                )
+                for idx, values in enumerate(columns)
+            ]
+        # Scalers não afins: transform() do scikit-learn sobre um único bloco 2D
+        block = fit_block
+        if block is None:
+            block = TSNormalizer.block(
+                columns, 0, len(columns[0]), np.result_type(*dtypes)
+            )
+        names = getattr(scaler, 'feature_names_in_', None)
+        if names is not None:
+            # O scaler conhece os nomes das colunas e exige que a entrada também os tenha
+            block = pd.DataFrame(block, columns=names, copy=False)
+        if inverse:
+            result = np.asarray(scaler.inverse_transform(block))  # type: ignore
+        else:
+            result = np.asarray(scaler.transform(block))  # type: ignore
+        return [
+            result[:, idx].astype(dtype, copy=True) for idx, dtype in enumerate(dtypes)
+        ]
+
+    @staticmethod
+    def __replace_columns(
+        df: pd.DataFrame, replaced: dict[str, np.ndarray], copy: bool
+    ) -> dict[str, Any]:
+        # Colunas de `df`, na ordem original, com as colunas de `replaced` substituídas
+        return {
+            col: replaced[col] if col in replaced else df[col].copy(deep=copy)
+            for col in df.columns
+        }
+
+    @staticmethod
+    def normalize_frame(
+        df: pd.DataFrame,
+        scaler: TransformerMixin,
+        column_list: list[str],
+        fit: bool = True,
+        inverse: bool = False,
+        copy: bool = False,
+    ) -> pd.DataFrame:
+        # Retorna um DataFrame com o mesmo índice e as mesmas colunas de `df`, em que as
+        # colunas de `column_list` são substituídas pelos valores transformados. As demais
+        # colunas são compartilhadas com `df`, ou copiadas se `copy` for True.
+        columns = [df[col].to_numpy() for col in column_list]
+        fit_block = TSNormalizer.fit(scaler, columns) if fit else None
+        transformed = TSNormalizer.transform(scaler, columns, inverse, fit_block)
+        del fit_block
+        if fit:
+            # Como se o scaler tivesse recebido um DataFrame: denormalize() usa os nomes
+            scaler.feature_names_in_ = np.asarray(column_list, dtype=object)
+        replaced = dict(zip(column_list, transformed))
+        data = TSNormalizer.__replace_columns(df, replaced, copy)
+        logger.debug(
+            f'normalize_frame: {len(column_list)} colunas, {len(df)} linhas, '
+            + f'scaler {type(scaler).__name__}'
+        )
+        return pd.DataFrame(data, index=df.index, copy=False)
+
+    @staticmethod
+    def __bins(values: np.ndarray, low: float, high: float, bins: int) -> np.ndarray:
+        # Intervalo do histograma de cada valor (sem NaN) em [low, high]
+        if high <= low:
+            return np.zeros(len(values), dtype=np.int64)
+        position = (values.astype(np.float64) - low) * (bins / (high - low))
+        return np.clip(position.astype(np.int64), 0, bins - 1)
+
+    @staticmethod
+    def scalers_for(
+        scaler: dict[str, TransformerMixin] | Callable[[], TransformerMixin],
+        column_list: list[str],
+    ) -> dict[str, TransformerMixin]:
+        # Um scaler por coluna, a partir de um mapeamento (coluna -> scaler) ou de uma
+        # fábrica (ex.: a própria classe MinMaxScaler), chamada uma vez por coluna
+        if isinstance(scaler, dict):
+            missing = [col for col in column_list if col not in scaler]
+            if len(missing) > 0:
+                raise Exception(f'Não há scaler para as colunas {missing}')
+            return {col: scaler[col] for col in column_list}
+        return {col: scaler() for col in column_list}
+
+    @staticmethod
+    def normalize_columns(
+        df: pd.DataFrame,
+        scalers: dict[str, TransformerMixin],
+        fit: bool = True,
+        inverse: bool = False,
+        max_workers: int | None = None,
+        copy: bool = False,
+    ) -> pd.DataFrame:
+        # Como normalize_frame(), mas cada coluna tem o seu próprio scaler e as colunas
+        # são ajustadas e transformadas em paralelo, num pool de threads. Os kernels
+        # NumPy usados no ajuste e na transformação liberam o GIL.
+        def transform_column(col: str) -> np.ndarray:
+            scaler = scalers[col]
+            columns = [df[col].to_numpy()]
+            fit_block = TSNormalizer.fit(scaler, columns) if fit else None
+            transformed = TSNormalizer.transform(scaler, columns, inverse, fit_block)
+            if fit:
+                scaler.feature_names_in_ = np.asarray([col], dtype=object)
+            return transformed[0]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            replaced = dict(zip(scalers, executor.map(transform_column, scalers)))
+        data = TSNormalizer.__replace_columns(df, replaced, copy)
+        logger.debug(
+            f'normalize_columns: {len(scalers)} colunas, {len(df)} linhas, '
+            + f'max_workers {max_workers}'
+        )
+        return pd.DataFrame(data, index=df.index, copy=False)
+
+    @staticmethod
+    def stream_percentiles(
+        blocks: Callable[[], Iterator[list[np.ndarray]]],
+        percentiles: list[float],
+        bins: int = 4096,
+        max_candidates: int = 65536,
+    ) -> np.ndarray:
+        # Percentis exatos (interpolação linear, como np.nanpercentile) de cada coluna
+        # de uma sequência de blocos, com memória limitada a um bloco. `blocks` é chamada
+        # a cada passada e retorna um iterador de listas de colunas. As passadas são:
+        # 1. mínimo, máximo e quantidade de valores de cada coluna;
+        # 2. refinamento: para cada posição buscada, um histograma do intervalo que a
+        #    contém (de início, [mínimo, máximo]) localiza o intervalo do histograma da
+        #    posição, que passa a ser o novo intervalo (reduzido ao mínimo e ao máximo
+        #    dos seus valores). Repete-se enquanto algum intervalo tiver mais que
+        #    `max_candidates` valores não todos iguais, de modo que distribuições
+        #    assimétricas (ex.: um outlier muito grande) não concentram todos os
+        #    valores num único intervalo a ser coletado;
+        # 3. coleta dos valores de cada intervalo, que são ordenados.
+        low = high = count = None
+        for columns in blocks():
+            block_low = np.full(len(columns), np.inf)
+            block_high = np.full(len(columns), -np.inf)
+            block_count = np.zeros(len(columns), dtype=np.int64)
+            for idx, values in enumerate(columns):
+                values = values[~np.isnan(values)]
+                if len(values) > 0:
+                    block_low[idx], block_high[idx] = values.min(), values.max()
+                    block_count[idx] = len(values)
+            if low is None:
+                low, high, count = block_low, block_high, block_count
+            else:
+                low = np.minimum(low, block_low)
+                high = np.maximum(high, block_high)
+                count += block_count
+        if low is None:
+            raise Exception('Não há dados para calcular os percentis')
+
+        # Posições (0-based) buscadas: para cada percentil, os dois vizinhos da
+        # interpolação linear
+        ranks = (
+            np.asarray(percentiles, dtype=np.float64)[np.newaxis, :]
+            / 100
+            * (count[:, np.newaxis] - 1)
+        )
+        lower_rank = np.floor(ranks).astype(np.int64)
+        upper_rank = np.ceil(ranks).astype(np.int64)
+        # Intervalo fechado [lo, hi] de cada posição buscada, com `before` valores
+        # abaixo de lo e `inside` valores no intervalo
+        targets: list[dict[int, dict[str, Any]]] = []
+        for idx in range(len(low)):
+            wanted = np.concatenate((lower_rank[idx], upper_rank[idx]))
+            targets.append(
+                {
+                    int(rank): {
+                        'lo': float(low[idx]),
+                        'hi': float(high[idx]),
+                        'before': 0,
+                        'inside': int(count[idx]),
+                    }
+                    for rank in wanted
+                    if count[idx] > 0
+                }
+            )
+
+        def pending() -> dict[tuple[int, float, float], list[tuple[int, dict]]]:
+            # Intervalos a refinar, cada um com as posições buscadas que ele contém
+            intervals: dict[tuple[int, float, float], list[tuple[int, dict]]] = {}
+            for idx in range(len(low)):
+                for rank, target in targets[idx].items():
+                    if (
+                        target['inside'] > max_candidates
+                        and target['hi'] > target['lo']
+                    ):
+                        key = (idx, target['lo'], target['hi'])
+                        intervals.setdefault(key, []).append((rank, target))
+            return intervals
+
+        while len(refining := pending()) > 0:
+            histograms = {key: np.zeros(bins, dtype=np.int64) for key in refining}
+            bin_low = {key: np.full(bins, np.inf) for key in refining}
+            bin_high = {key: np.full(bins, -np.inf) for key in refining}
+            for columns in blocks():
+                for key in refining:
+                    idx, lo, hi = key
+                    values = columns[idx].astype(np.float64, copy=False)
+                    values = values[(values >= lo) & (values <= hi)]
+                    # A posição é crescente com o valor: cada intervalo do histograma
+                    # contém exatamente os valores entre o seu mínimo e o seu máximo
+                    positions = TSNormalizer.__bins(values, lo, hi, bins)
+                    histograms[key] += np.bincount(positions, minlength=bins)
+                    np.minimum.at(bin_low[key], positions, values)
+                    np.maximum.at(bin_high[key], positions, values)
+            for key, members in refining.items():
+                for rank, target in members:
+                    cumulative = target['before'] + np.cumsum(histograms[key])
+                    b = int(np.searchsorted(cumulative, rank, 'right'))
+                    target['before'] = int(cumulative[b] - histograms[key][b])
+                    target['inside'] = int(histograms[key][b])
+                    target['lo'] = float(bin_low[key][b])
+                    target['hi'] = float(bin_high[key][b])
+
+        collected: list[dict[int, list[np.ndarray]]] = [
+            {rank: [] for rank in targets[idx]} for idx in range(len(low))
+        ]
+        for columns in blocks():
+            for idx, values in enumerate(columns):
+                values = values.astype(np.float64, copy=False)
+                for rank, target in targets[idx].items():
+                    if target['hi'] > target['lo']:
+                        mask = (values >= target['lo']) & (values <= target['hi'])
+                        collected[idx][rank].append(values[mask])
+
+        def order_statistic(idx: int, rank: int) -> float:
+            target = targets[idx][rank]
+            if target['hi'] == target['lo']:
+                # Todos os valores do intervalo são iguais
+                return target['lo']
+            values = np.sort(np.concatenate(collected[idx][rank]))
+            return values[rank - target['before']]
+
+        result = np.full((len(low), len(percentiles)), np.nan)
+        for idx in range(len(low)):
+            if count[idx] == 0:
+                continue
+            for p in range(len(percentiles)):
+                lower = order_statistic(idx, int(lower_rank[idx, p]))
+                upper = order_statistic(idx, int(upper_rank[idx, p]))
+                fraction = ranks[idx, p] - lower_rank[idx, p]
+                result[idx, p] = lower + (upper - lower) * fraction
+        return result
+
+    @staticmethod
+    def fit_robust(
+        scaler: RobustScaler, blocks: Callable[[], Iterator[list[np.ndarray]]]
+    ) -> None:
+        # Ajusta um RobustScaler sobre uma sequência de blocos, com o mesmo resultado do
+        # fit() sobre os dados completos (mediana e intervalo interquantil exatos)
+        q_min, q_max = scaler.quantile_range
+        percentiles = TSNormalizer.stream_percentiles(blocks, [50, q_min, q_max])
+        scaler.center_ = percentiles[:, 0] if scaler.with_centering else None
+        if scaler.with_scaling:
+            scale = percentiles[:, 2] - percentiles[:, 1]
+            # Escalas (quase) nulas são substituídas por 1, como no scikit-learn
+            scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+            if scaler.unit_variance:
+                adjust = stats.norm.ppf(q_max / 100.0) - stats.norm.ppf(q_min / 100.0)
+                scale = scale / adjust
+            scaler.scale_ = scale
+        else:
+            scaler.scale_ = None
+        scaler.n_features_in_ = percentiles.shape[0]
+
+    @staticmethod
+    def __encode(value: Any) -> Any:
+        # Converte os atributos do scaler para tipos JSON. Arrays numéricos são
+        # gravados em base64 (bytes little-endian), o que mantém os metadados compactos
+        # e os valores exatos.
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind in 'biuf':
+                data = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<'))
+                return {
+                    '__ndarray__': data.dtype.str,
+                    'shape': list(value.shape),
+                    'data': base64.b64encode(data.tobytes()).decode(),
+                }
+            if value.dtype.kind in 'OU':
+                return {
+                    '__ndarray__': value.dtype.str,
+                    'shape': list(value.shape),
+                    'items': [TSNormalizer.__encode(v) for v in value.ravel().tolist()],
+                }
+        if isinstance(value, tuple):
+            return {'__tuple__': [TSNormalizer.__encode(v) for v in value]}
+        if isinstance(value, list):
+            return [TSNormalizer.__encode(v) for v in value]
+        if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+            return {'__dict__': {k: TSNormalizer.__encode(v) for k, v in value.items()}}
+        if isinstance(value, BaseEstimator):
+            # Ex.: o StandardScaler interno do PowerTransformer
+            return {'__estimator__': TSNormalizer.__state(value)}
+        raise TypeError(f'Unsupported scaler attribute: {type(value)}')
+
+    @staticmethod
+    def __decode(value: Any) -> Any:
+        if isinstance(value, list):
+            return [TSNormalizer.__decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if '__ndarray__' in value:
+            dtype = np.dtype(value['__ndarray__'])
+            if 'data' in value:
+                array = np.frombuffer(base64.b64decode(value['data']), dtype=dtype)
+                array = array.astype(dtype.newbyteorder('='))
+            else:
+                items = [TSNormalizer.__decode(v) for v in value['items']]
+                array = np.empty(len(items), dtype=dtype)
+                array[:] = items
+            return array.reshape(value['shape'])
+        if '__tuple__' in value:
+            return tuple(TSNormalizer.__decode(v) for v in value['__tuple__'])
+        if '__dict__' in value:
+            return {k: TSNormalizer.__decode(v) for k, v in value['__dict__'].items()}
+        if '__estimator__' in value:
+            return TSNormalizer.__restore(value['__estimator__'])
+        raise ValueError(f'Unknown scaler attribute: {value}')
+
+    @staticmethod
+    def __state(scaler: BaseEstimator) -> dict:
+        # Classe e atributos do scaler: os hiperparâmetros (get_params) e os atributos
+        # aprendidos no fit (data_min_, scale_, center_, quantiles_, lambdas_, etc.)
+        cls = type(scaler)
+        return {
+            'class': f'{cls.__module__}.{cls.__qualname__}',
+            'attributes': {
+                name: TSNormalizer.__encode(value)
+                for name, value in vars(scaler).items()
+            },
+        }
+
+    @staticmethod
+    def __restore(state: dict) -> BaseEstimator:
+        module_name, _, class_name = state['class'].rpartition('.')
+        if not module_name.startswith(TSNormalizer.TRUSTED_MODULES):
+            raise ValueError(f'Unsupported scaler: {state["class"]}')
+        cls = getattr(importlib.import_module(module_name), class_name)
+        if not (isinstance(cls, type) and issubclass(cls, BaseEstimator)):
+            raise ValueError(f'Unsupported scaler: {state["class"]}')
+        # Como no pickle, o objeto é criado sem __init__ e recebe os atributos gravados
+        scaler = cls.__new__(cls)
+        scaler.__dict__.update(
+            {
+                name: TSNormalizer.__decode(value)
+                for name, value in state['attributes'].items()
+            }
+        )
+        return scaler
+
+    @staticmethod
+    def scaler_to_json(scaler: TransformerMixin | dict[str, TransformerMixin]) -> str:
+        # Serializa o scaler ajustado (ou o mapeamento coluna -> scaler) sem pickle.
+        # Lança TypeError se algum atributo não for serializável (ex.: random_state com
+        # um np.random.RandomState).
+        if isinstance(scaler, dict):
+            state: dict = {
+                'columns': {
+                    col: TSNormalizer.__state(value) for col, value in scaler.items()
+                }
+            }
+        else:
+            state = TSNormalizer.__state(scaler)
+        return json.dumps(state, separators=(',', ':'))
+
+    @staticmethod
+    def scaler_from_json(
+        value: str | bytes,
+    ) -> TransformerMixin | dict[str, TransformerMixin]:
+        # Restaura um scaler serializado por scaler_to_json(), pronto para transform()
+        # e inverse_transform()
+        state = json.loads(value)
+        if 'columns' in state:
+            return {
+                col: TSNormalizer.__restore(value)
+                for col, value in state['columns'].items()
+            }
+        return TSNormalizer.__restore(state)
+
+    @staticmethod
+    def scaler_metadata(
+        scaler: TransformerMixin | dict[str, TransformerMixin] | None,
+    ) -> dict[bytes, bytes]:
+        # Metadados Parquet do scaler de uma série ({} se a série não foi normalizada
+        # ou se o scaler não pode ser serializado). A versão do scikit-learn é gravada
+        # junto, pois os atributos dos scalers podem mudar entre versões.
+        if scaler is None:
+            return {}
+        try:
+            return {
+                b'scaler': TSNormalizer.scaler_to_json(scaler).encode(),
+                b'sklearn_version': sklearn.__version__.encode(),
+            }
+        except TypeError as e:
+            logger.warning(f'O scaler {type(scaler)} não será gravado: {e}')
+            return {}
+
+    @staticmethod
+    def scaler_from_metadata(
+        metadata: dict[bytes, bytes] | None, columns: list[str] | None = None
+    ) -> TransformerMixin | dict[str, TransformerMixin] | None:
+        # Restaura o scaler gravado por scaler_metadata() (None se não houver). Se apenas
+        # as colunas `columns` forem lidas, o scaler é restrito a elas.
+        if not metadata or b'scaler' not in metadata:
+            return None
+        version = metadata.get(b'sklearn_version', b'').decode()
+        if version and version != sklearn.__version__:
+            logger.warning(
+                f'O scaler foi gravado com o scikit-learn {version} e será restaurado '
+                + f'com o scikit-learn {sklearn.__version__}'
+            )
+        scaler = TSNormalizer.scaler_from_json(metadata[b'scaler'])
+        if columns:
+            return TSNormalizer.select_columns(scaler, columns)
+        return scaler
+
+    @staticmethod
+    def select_columns(
+        scaler: TransformerMixin | dict[str, TransformerMixin], columns: list[str]
+    ) -> TransformerMixin | dict[str, TransformerMixin] | None:
+        # Scaler restrito às colunas normalizadas presentes em `columns` (None se não
+        # houver nenhuma). Um scaler ajustado sobre várias colunas só pode ser restrito
+        # se for afim (os atributos por coluna são vetores com uma posição por coluna);
+        # os demais não são restaurados.
+        if isinstance(scaler, dict):
+            selected = {col: value for col, value in scaler.items() if col in columns}
+            return selected or None
+        names = list(getattr(scaler, 'feature_names_in_', []))
+        positions = [idx for idx, name in enumerate(names) if name in columns]
+        if len(positions) == len(names):
+            return scaler
+        if len(positions) == 0:
+            return None
+        if not isinstance(
+            scaler, (MinMaxScaler, StandardScaler, RobustScaler, MaxAbsScaler)
+        ):
+            logger.warning(
+                f'O scaler {type(scaler).__name__} foi ajustado sobre as colunas '
+                + f'{names} e não será restaurado para as colunas {columns}'
+            )
+            return None
+        result = copy.copy(scaler)
+        for name, value in vars(scaler).items():
+            if isinstance(value, np.ndarray) and value.shape == (len(names),):
+                setattr(result, name, value[positions])
+        result.n_features_in_ = len(positions)
+        return result
+
+    @staticmethod
+    def normalize_parquet(
+        source: Path,
+        target: Path,
+        scaler: TransformerMixin,
+        numeric_columns: list[str] | None = None,
+    ) -> TransformerMixin:
+        # Normalização out-of-core de um arquivo Parquet gravado por WriteParquetFile: o
+        # scaler é ajustado row group a row group (partial_fit() ou, para o
+        # RobustScaler, percentis exatos calculados em passadas sobre os row groups) e,
+        # numa última passada, cada row group é normalizado e gravado em `target`, com o
+        # scaler nos metadados. A memória ocupada fica limitada a um row group. Retorna o
+        # scaler ajustado.
+        from t8s.ts import TimeSerie
+        from t8s.ts_builder import ReadParquetFile
+        from t8s.ts_writer import WriteParquetRowGroups
+
+        reader = ReadParquetFile(backend='arrow')
+        first = next(reader.read_row_groups(source), None)
+        if first is None:
+            raise Exception(f'O arquivo {source} não possui dados')
+        column_list = numeric_columns or first.get_numeric_column_names()
+        if len(column_list) == 0:
+            raise Exception('Não há colunas numéricas para normalizar')
+        timestamp_col = first.get_column_names()[0]
+        del first
+
+        def blocks() -> Iterator[list[np.ndarray]]:
+            # Apenas as colunas normalizadas são lidas nas passadas de ajuste
+            for ts in reader.read_row_groups(source, [timestamp_col] + column_list):
+                table: pa.Table = ts.to_arrow()
+                yield [table.column(col).to_numpy() for col in column_list]
+
+        TSNormalizer.__unfit(scaler)
+        if hasattr(scaler, 'partial_fit'):
+            for columns in blocks():
+                TSNormalizer.fit(scaler, columns, reset=False)
+        elif isinstance(scaler, RobustScaler):
+            TSNormalizer.fit_robust(scaler, blocks)
+        else:
+            raise ValueError(f'Unsupported scaler: {type(scaler)}')
+        scaler.feature_names_in_ = np.asarray(column_list, dtype=object)
+
+        with WriteParquetRowGroups(target) as writer:
+            for ts in ReadParquetFile().read_row_groups(source):
+                df = TSNormalizer.normalize_frame(ts.df, scaler, column_list, fit=False)
+                ts_norm = TimeSerie(df, format=ts.format, features_qty=int(ts.features))
+                # O scaler vai para os metadados de `target`
+                ts_norm.scaler = scaler
+                writer.write(ts_norm)
+        logger.info(
+            f'normalize_parquet: {source} -> {target}, colunas {column_list}, '
+            + f'scaler {type(scaler).__name__}'
+        )
+        return scaler
@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from t8s.log_config import LogConfig
+from t8s.stats import TSStats
+
+if TYPE_CHECKING:
+    from t8s.ts import TimeSerie
+
+logger = LogConfig().get_logger()
+
+
+class TSOutliers:
+    """
+    Detecção de outliers em todas as colunas numéricas de uma série, sem laços em
+    Python sobre os valores. Os métodos e os seus limiares padrão são:
+
+    - 'zscore': |x - média| > limiar * desvio padrão (ddof=0, como o scipy.stats.zscore);
+    - 'iqr': x < Q1 - limiar * IQR ou x > Q3 + limiar * IQR;
+    - 'mad': z-score modificado (Iglewicz e Hoaglin), 0.6745 * |x - mediana| / MAD >
+      limiar. Se mais da metade dos valores forem iguais (MAD = 0), todo valor diferente
+      da mediana é outlier.
+
+    Os valores NaN são ignorados nas estatísticas e nunca são outliers. No formato wide
+    as colunas do mesmo dtype são empilhadas num bloco 2D (features x amostras) e as
+    estatísticas de todas elas são calculadas de uma vez: médias e desvios com
+    np.nanmean/np.nanstd e quantis com uma única chamada a np.partition(). No formato
+    long as estatísticas são calculadas por `ds`, sobre os códigos do `ds`: médias e
+    desvios com np.bincount e quantis com a ordenação por grupo de TSStats.
+    """
+
+    THRESHOLDS = {'zscore': 2.0, 'iqr': 1.5, 'mad': 3.5}
+    MAD_FACTOR = 0.6745
+
+    @staticmethod
+    def thresholds(
+        methods: list[str], threshold: float | dict[str, float] | None
+    ) -> dict[str, float]:
+        # Limiar de cada método: o informado (um valor para todos os métodos ou um
+        # dicionário método -> limiar) ou o padrão
+        if len(methods) == 0:
+            raise ValueError('At least one method must be informed')
+        result = {}
+        for method in methods:
+            if method not in TSOutliers.THRESHOLDS:
+                raise ValueError(f'Unknown method: {method}')
+            if threshold is None:
+                result[method] = TSOutliers.THRESHOLDS[method]
+            elif isinstance(threshold, dict):
+                result[method] = threshold.get(method, TSOutliers.THRESHOLDS[method])
+            else:
+                result[method] = float(threshold)
+        return result
+
+    @staticmethod
+    def row_quantiles(block: np.ndarray, q: list[float]) -> np.ndarray:
+        # Quantis (interpolação linear) de cada linha de `block`, ignorando NaN, com
+        # uma única chamada a np.partition() para todas as linhas e todos os quantis.
+        # Retorna (quantis x linhas).
+        if block.dtype.kind == 'f':
+            count = block.shape[1] - np.isnan(block).sum(axis=1)
+        else:
+            count = np.full(block.shape[0], block.shape[1])
+        ranks = np.asarray(q)[:, np.newaxis] * (count - 1)
+        lower = np.floor(ranks).astype(np.int64)
+        upper = np.ceil(ranks).astype(np.int64)
+        kth = np.unique(np.clip(np.concatenate((lower, upper)), 0, None))
+        # NaN ficam ao final de cada linha, após os valores válidos
+        partitioned = np.partition(block, kth, axis=1)
+        rows = np.arange(block.shape[0])
+        low = partitioned[rows, np.clip(lower, 0, None)].astype(np.float64)
+        high = partitioned[rows, np.clip(upper, 0, None)].astype(np.float64)
+        return np.where(count > 0, low + (high - low) * (ranks - lower), np.nan)
+
+    @staticmethod
+    def __mask(method: str, threshold: float, block: np.ndarray, stats) -> np.ndarray:
+        # Máscara do método `method` para `block` (features x amostras). `stats` calcula
+        # as estatísticas de cada feature (_RowStats) ou de cada `ds` (_GroupStats) e as
+        # devolve num formato que pode ser comparado diretamente com `block`
+        with np.errstate(invalid='ignore'):
+            if method == 'zscore':
+                mean, std = stats.moments(block)
+                return np.abs(block - mean) > threshold * std
+            if method == 'iqr':
+                q1, q3 = stats.quantiles(block, [0.25, 0.75])
+                iqr = q3 - q1
+                return (block < q1 - threshold * iqr) | (block > q3 + threshold * iqr)
+            (median,) = stats.quantiles(block, [0.5])
+            deviation = np.abs(block - median)
+            (mad,) = stats.quantiles(deviation, [0.5])
+            return TSOutliers.MAD_FACTOR * deviation > threshold * mad
+
+    class _RowStats:
+        # Estatísticas por linha de um bloco 2D (formato wide)
+        @staticmethod
+        def moments(block: np.ndarray):
+            if block.dtype.kind == 'f' and np.isnan(block).any():
+                mean = np.nanmean(block, axis=1, keepdims=True)
+                std = np.nanstd(block, axis=1, keepdims=True)
+            else:
+                mean = block.mean(axis=1, keepdims=True)
+                std = block.std(axis=1, keepdims=True)
+            return mean, std
+
+        @staticmethod
+        def quantiles(block: np.ndarray, q: list[float]):
+            return list(TSOutliers.row_quantiles(block, q)[:, :, np.newaxis])
+
+    class _GroupStats:
+        # Estatísticas por `ds` (formato long), expandidas de volta para as linhas
+        def __init__(self, codes: np.ndarray, groups: int):
+            self.codes = codes
+            self.groups = groups
+
+        def moments(self, block: np.ndarray):
+            values = block[0]
+            valid = ~np.isnan(values) if values.dtype.kind == 'f' else None
+            filled = values if valid is None else np.where(valid, values, 0)
+            weights = None if valid is None else valid.astype(np.float64)
+            count = np.bincount(self.codes, weights=weights, minlength=self.groups)
+            total = np.bincount(self.codes, weights=filled, minlength=self.groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = total / count
+                deviation = filled - mean[self.codes]
+                if valid is not None:
+                    deviation = np.where(valid, deviation, 0)
+                variance = (
+                    np.bincount(self.codes, weights=deviation**2, minlength=self.groups)
+                    / count
+                )
+            return mean[self.codes], np.sqrt(variance)[self.codes]
+
+        def quantiles(self, block: np.ndarray, q: list[float]):
+            values = block[0]
+            order = TSStats.group_order(self.codes, values)
+            keys, values = self.codes[order], values[order]
+            starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+            lengths = np.diff(np.append(starts, len(keys)))
+            count = lengths
+            if values.dtype.kind == 'f':
+                count = np.add.reduceat(~np.isnan(values), starts)
+            by_group = np.full((len(q), self.groups), np.nan)
+            by_group[:, keys[starts]] = TSStats.group_quantiles(
+                values, starts, count, q
+            )
+            return [quantile[self.codes] for quantile in by_group]
+
+    @staticmethod
+    def __names(columns: list[str], thresholds: dict[str, float]) -> list[str]:
+        # Mesmo padrão de nomes do resample(): `<coluna>_<método>` com mais de um método
+        if len(thresholds) == 1:
+            return list(columns)
+        return [f'{col}_{method}' for col in columns for method in thresholds]
+
+    @staticmethod
+    def detect_wide(
+        df: pd.DataFrame,
+        methods: list[str],
+        threshold: float | dict[str, float] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        # Máscara booleana (mesmo índice de `df`) com uma coluna por coluna numérica e
+        # método. Por contrato a primeira coluna é o timestamp.
+        thresholds = TSOutliers.thresholds(methods, threshold)
+        if columns is None:
+            columns = [col for col in df.columns[1:] if df[col].dtype.kind in 'iuf']
+        if len(columns) == 0:
+            raise Exception('A série temporal não possui colunas numéricas')
+        by_dtype: dict[np.dtype, list] = {}
+        for col in columns:
+            by_dtype.setdefault(df[col].dtype, []).append(col)
+        masks: dict[tuple[str, str], np.ndarray] = {}
+        for cols in by_dtype.values():
+            block = np.stack([df[col].to_numpy() for col in cols])
+            for method, limit in thresholds.items():
+                mask = TSOutliers.__mask(method, limit, block, TSOutliers._RowStats)
+                for idx, col in enumerate(cols):
+                    masks[(col, method)] = mask[idx]
+        names = TSOutliers.__names(columns, thresholds)
+        keys = [(col, method) for col in columns for method in thresholds]
+        logger.debug(
+            f'detect_wide: {len(df)} linhas, {len(columns)} colunas, '
+            + f'limiares {thresholds}'
+        )
+        return pd.DataFrame(
+            {name: masks[key] for name, key in zip(names, keys)},
+            index=df.index,
+            copy=False,
+        )
+
+    @staticmethod
+    def detect_long(
+        df: pd.DataFrame,
+        methods: list[str],
+        threshold: float | dict[str, float] | None = None,
+    ) -> pd.DataFrame:
+        # Máscara booleana (mesmo índice de `df`) com uma coluna por método, em que as
+        # estatísticas de cada linha são as do seu `ds`
+        thresholds = TSOutliers.thresholds(methods, threshold)
+        ds = df['ds']
+        if isinstance(ds.dtype, pd.CategoricalDtype):
+            codes = ds.cat.codes.to_numpy().astype(np.intp)
+            groups = len(ds.cat.categories)
+        else:
+            codes, categories = pd.factorize(ds, sort=True)
+            groups = len(categories)
+        # Linhas com `ds` nulo (código -1) não pertencem a nenhum grupo e não são
+        # marcadas como outliers
+        valid = codes >= 0
+        rows = slice(None) if valid.all() else np.flatnonzero(valid)
+        masks = [np.zeros(len(df), dtype=bool) for _ in thresholds]
+        if valid.any():
+            stats = TSOutliers._GroupStats(codes[rows], groups)
+            block = df['value'].to_numpy()[np.newaxis, rows]
+            for mask, (method, limit) in zip(masks, thresholds.items()):
+                mask[rows] = TSOutliers.__mask(method, limit, block, stats)[0]
+        names = TSOutliers.__names(['value'], thresholds)
+        logger.debug(
+            f'detect_long: {len(df)} linhas, {groups} ds, limiares {thresholds}'
+        )
+        return pd.DataFrame(dict(zip(names, masks)), index=df.index, copy=False)
+
+
+class TSHampelFilter:
+    """
+    Filtro de Hampel (MAD móvel) para séries em memória ou recebidas em blocos. Para cada
+    amostra x, a janela são as `window` amostras mais recentes da mesma coluna (wide) ou
+    do mesmo `ds` (long), incluindo x. Com m a mediana da janela e
+    MAD = 1.4826 * mediana(|janela - m|), x é outlier se |x - m| > n_sigmas * MAD. Os
+    valores NaN ocupam posições na janela, mas são ignorados nas estatísticas, e janelas
+    com menos de `min_periods` valores válidos (por padrão `window`, como no pd.rolling
+    com janela inteira) não marcam outliers.
+
+    O filtro guarda as últimas `window - 1` amostras de cada coluna/`ds` entre as
+    chamadas a process(), de modo que processar uma série em blocos produz exatamente o
+    mesmo resultado que processá-la de uma só vez (que é o caso de um único bloco). As
+    janelas usam sempre os valores originais, também no modo 'replace'.
+
+    Modos:
+    - 'flag': process() retorna a máscara booleana (como TimeSerie.detect_outliers);
+    - 'replace': process() retorna uma TimeSerie em que os outliers são substituídos
+      pela mediana da janela. Colunas inteiras recebem a mediana arredondada e mantêm o
+      dtype, para que o esquema dos blocos não mude durante a ingestão.
+
+    As medianas de cada bloco de janelas são calculadas com uma única chamada a
+    np.partition() (ver TSOutliers.row_quantiles) sobre uma visão deslizante das amostras.
+    """
+
+    SCALE = 1.4826
+    MODES = ['flag', 'replace']
+    BLOCK_VALUES = 2**22  # Valores (janelas x window) processados por vez
+
+    def __init__(
+        self,
+        window: int,
+        n_sigmas: float = 3.0,
+        mode: str = 'flag',
+        min_periods: int | None = None,
+    ):
+        if window < 1:
+            raise ValueError(f'Invalid window: {window}')
+        if mode not in TSHampelFilter.MODES:
+            raise ValueError(f'Unknown mode: {mode}')
+        self.window = window
+        self.n_sigmas = n_sigmas
+        self.mode = mode
+        self.min_periods = window if min_periods is None else min_periods
+        # coluna/`ds` -> últimas `window - 1` amostras (float64, NaN à esquerda)
+        self._history: dict[str, np.ndarray] = {}
+
+    def __repr__(self):
+        return (
+            f'TSHampelFilter(window={self.window}, n_sigmas={self.n_sigmas}, '
+            + f'mode={self.mode}, segments={len(self._history)})'
+        )
+
+    def reset(self) -> None:
+        self._history.clear()
+
+    def __filter(
+        self, names: list, segments: list[np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Aplica o filtro aos segmentos (um por coluna/`ds`), precedidos pelo histórico
+        # de cada um. Retorna a máscara e a mediana de cada amostra, concatenadas na
+        # ordem dos segmentos, e atualiza o histórico.
+        lag = self.window - 1
+        padded, starts = [], []
+        offset = 0
+        for name, segment in zip(names, segments):
+            history = self._history.get(name, np.full(lag, np.nan))
+            values = np.concatenate((history, segment))
+            padded.append(values)
+            starts.append(offset + np.arange(len(segment)))
+            offset += len(values)
+            self._history[name] = values[len(values) - lag :]
+        starts = np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
+        if len(starts) == 0:
+            return np.zeros(0, dtype=bool), np.empty(0)
+        samples = np.concatenate(padded)
+        windows = np.lib.stride_tricks.sliding_window_view(samples, self.window)
+        current = samples[starts + lag]
+        mask = np.zeros(len(starts), dtype=bool)
+        median = np.full(len(starts), np.nan)
+        block_rows = max(1, TSHampelFilter.BLOCK_VALUES // self.window)
+        for first in range(0, len(starts), block_rows):
+            rows = slice(first, first + block_rows)
+            block = windows[starts[rows]]
+            valid = self.window - np.isnan(block).sum(axis=1)
+            (center,) = TSOutliers.row_quantiles(block, [0.5])
+            (mad,) = TSOutliers.row_quantiles(
+                np.abs(block - center[:, np.newaxis]), [0.5]
+            )
+            with np.errstate(invalid='ignore'):
+                mask[rows] = (valid >= self.min_periods) & (
+                    np.abs(current[rows] - center)
+                    > self.n_sigmas * TSHampelFilter.SCALE * mad
+                )
+            median[rows] = center
+        return mask, median
+
+    def process(self, data: TimeSerie | pd.DataFrame, format: str = 'wide'):
+        # Processa um bloco (TimeSerie ou DataFrame no formato `format`). Retorna a
+        # máscara de outliers (modo 'flag') ou o bloco com os outliers substituídos
+        # (modo 'replace'), do mesmo tipo da entrada. Os blocos devem ser processados em
+        # ordem cronológica.
+        from t8s.ts import TimeSerie
+
+        if isinstance(data, TimeSerie):
+            df, format = data.df, data.format
+        else:
+            df = data
+        if format == 'long':
+            codes, categories = pd.factorize(df['ds'], sort=True)
+            # Linhas com `ds` nulo (código -1) não têm histórico e não são filtradas
+            rows = np.flatnonzero(codes >= 0)
+            order = rows[np.argsort(codes[rows], kind='stable')]
+            values = df['value'].to_numpy()
+            sorted_codes = codes[order]
+            bounds = np.flatnonzero(
+                np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1]))
+            )
+            sorted_values = values[order].astype(np.float64)
+            names = [str(categories[code]) for code in sorted_codes[bounds]]
+            segments = np.split(sorted_values, bounds[1:])
+            sorted_mask, sorted_median = self.__filter(names, segments)
+            mask = np.zeros(len(df), dtype=bool)
+            mask[order] = sorted_mask
+            median = np.full(len(df), np.nan)
+            median[order] = sorted_median
+            masks = {'value': mask}
+            medians = {'value': median}
+        else:
+            columns = [col for col in df.columns[1:] if df[col].dtype.kind in 'iuf']
+            if len(columns) == 0:
+                raise Exception('A série temporal não possui colunas numéricas')
+            segments = [df[col].to_numpy(dtype=np.float64) for col in columns]
+            mask, median = self.__filter(list(columns), segments)
+            masks = dict(zip(columns, np.split(mask, len(columns))))
+            medians = dict(zip(columns, np.split(median, len(columns))))
+        logger.debug(
+            f'TSHampelFilter: {len(df)} linhas, {sum(m.sum() for m in masks.values())} '
+            + 'outliers'
+        )
+        if self.mode == 'flag':
+            return pd.DataFrame(masks, index=df.index, copy=False)
+        replaced = {}
+        for col, mask in masks.items():
+            values = df[col].to_numpy()
+            median = medians[col]
+            if values.dtype.kind in 'iu':
+                median = np.rint(median)
+            replaced[col] = np.where(mask, median, values).astype(values.dtype)
+        # As demais colunas são compartilhadas com o bloco apenas com Copy-on-Write
+        shared = pd.options.mode.copy_on_write
+        data_replaced = {
+            col: replaced[col] if col in replaced else df[col].copy(deep=not shared)
+            for col in df.columns
+        }
+        result = pd.DataFrame(data_replaced, index=df.index, copy=False)
+        if not isinstance(data, TimeSerie):
+            return result
+        return TimeSerie(result, format=format, features_qty=int(data.features))
@@ -40,12 +40,12 @@ class TSPlotting:
         pass
 
     # Retorna uma cópia do Dataframe para ser usada nos gráficos sem afetar
-    # o objeto original.
+    # o objeto original. Com Copy-on-Write a cópia compartilha os buffers das colunas.
     def to_new_df(self) -> pd.DataFrame:
         if self.ts.format == 'wide':
-            return self.ts.df.copy()
+            return self.ts.df.copy(deep=not pd.options.mode.copy_on_write)
         else:
-            # Atenção: o método to_wide() altera o objeto ts original, por isso faço uma deep-copy antes.
+            # Atenção: o método to_wide() altera o objeto ts original, por isso faço uma cópia antes.
             ts_copy = self.ts.copy()
             ts_copy.to_wide()
             result: TimeSerie = ts_copy
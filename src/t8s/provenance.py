@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+
+from t8s.log_config import LogConfig
+
+logger = LogConfig().get_logger()
+
+
+class TSProvenance:
+    """
+    Log de proveniência de uma série temporal. É uma lista append-only de tuplas
+    (chave, transformação, parâmetros canonicalizados, hash da entrada, hash da saída,
+    duração, linhas), em que a chave identifica o passo: ela é o hash da transformação,
+    dos parâmetros e do conteúdo da entrada. Dois passos com a mesma chave produzem,
+    portanto, o mesmo resultado e o segundo pode ser evitado.
+
+    O registro é barato: os parâmetros são serializados uma única vez (JSON com chaves
+    ordenadas) e os hashes de conteúdo, que custam uma passada sobre os dados, são
+    opcionais e calculados apenas por quem precisa deles (ver apply_transformation()).
+    As séries derivadas herdam uma cópia rasa do log da série de origem.
+    """
+
+    FIELDS = [
+        'step',
+        'transformation',
+        'parameters',
+        'input_hash',
+        'output_hash',
+        'duration',
+        'rows',
+    ]
+
+    def __init__(self, records: list[tuple] | None = None):
+        self._records: list[tuple] = [] if records is None else list(records)
+        # Posição do registro mais recente de cada passo (chave)
+        self._index: dict[str, int] = {
+            record[0]: position for position, record in enumerate(self._records)
+        }
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self.__as_dict(record) for record in self._records)
+
+    def __repr__(self):
+        steps = [record[1] for record in self._records]
+        return f'TSProvenance(steps={steps})'
+
+    def copy(self) -> TSProvenance:
+        # Cópia rasa: as tuplas (imutáveis) são compartilhadas com o log de origem
+        return TSProvenance(self._records)
+
+    def to_json(self) -> str:
+        # Serializa o log (ex.: para os metadados de um arquivo Parquet)
+        return json.dumps(self._records)
+
+    @staticmethod
+    def from_json(value: str | bytes) -> TSProvenance:
+        return TSProvenance([tuple(record) for record in json.loads(value)])
+
+    @staticmethod
+    def __json_default(value: Any) -> Any:
+        # Converte para tipos JSON os valores que aparecem nos parâmetros das
+        # transformações (escalares NumPy, timestamps, scalers do scikit-learn, etc.)
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, (set, frozenset)):
+            return sorted(value, key=str)
+        if isinstance(value, type):
+            return f'{value.__module__}.{value.__qualname__}'
+        if hasattr(value, 'get_params'):
+            return {
+                'class': f'{type(value).__module__}.{type(value).__qualname__}',
+                'params': value.get_params(),
+            }
+        return str(value)
+
+    @staticmethod
+    def canonicalize(parameters: dict) -> str:
+        # Representação canônica dos parâmetros: dicionários equivalentes geram a mesma
+        # string, independentemente da ordem das chaves
+        return json.dumps(
+            parameters,
+            sort_keys=True,
+            separators=(',', ':'),
+            default=TSProvenance.__json_default,
+        )
+
+    @staticmethod
+    def step_key(transformation: str, parameters: str, input_hash: str | None) -> str:
+        digest = hashlib.sha256(
+            f'{transformation}\0{parameters}\0{input_hash}'.encode()
+        )
+        return digest.hexdigest()[:32]
+
+    @staticmethod
+    def column_values(s: pd.Series | pd.Index) -> np.ndarray:
+        # Array NumPy (sem cópia, quando possível) com os valores de uma coluna
+        if pd.api.types.is_datetime64_any_dtype(s.dtype):
+            return s.array.asi8  # type: ignore
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            return s.array.codes  # type: ignore
+        return s.to_numpy()
+
+    @staticmethod
+    def __update_hash(digest, s: pd.Series | pd.Index) -> None:
+        values = TSProvenance.column_values(s)
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            categories = s.array.categories  # type: ignore
+            digest.update(pd.util.hash_array(categories.to_numpy()).data)
+        if values.dtype.kind == 'O':
+            # Strings e outros objetos: hash vetorizado de cada elemento
+            values = pd.util.hash_array(values, categorize=False)
+        digest.update(np.ascontiguousarray(values).data)
+
+    @staticmethod
+    def content_hash(data: pd.DataFrame | pa.Table) -> str:
+        # Hash (SHA-256 truncado) dos nomes, tipos e valores de todas as colunas. O índice
+        # só é considerado quando não é o RangeIndex padrão (ex.: após o to_wide()).
+        digest = hashlib.sha256()
+        if isinstance(data, pa.Table):
+            for name, column in zip(data.column_names, data.columns):
+                column_type = column.type
+                if column.null_count == 0 and (
+                    pa.types.is_integer(column_type)
+                    or pa.types.is_floating(column_type)
+                    or pa.types.is_timestamp(column_type)
+                ):
+                    dtype = column_type.to_pandas_dtype()
+                    if not isinstance(dtype, pd.DatetimeTZDtype):
+                        dtype = np.dtype(dtype)
+                    digest.update(f'{name}\0{dtype}\0'.encode())
+                    for chunk in column.chunks:
+                        if pa.types.is_timestamp(column_type):
+                            chunk = chunk.view(pa.int64())
+                        digest.update(np.ascontiguousarray(chunk.to_numpy()).data)
+                else:
+                    s = column.to_pandas()
+                    digest.update(f'{name}\0{s.dtype}\0'.encode())
+                    TSProvenance.__update_hash(digest, s)
+            return digest.hexdigest()[:32]
+
+        for col in data.columns:
+            s = data[col]
+            digest.update(f'{col}\0{s.dtype}\0'.encode())
+            TSProvenance.__update_hash(digest, s)
+        index = data.index
+        if not (
+            isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+        ):
+            digest.update(f'index\0{index.name}\0{index.dtype}\0'.encode())
+            TSProvenance.__update_hash(digest, index)
+        return digest.hexdigest()[:32]
+
+    def record(
+        self,
+        transformation: str,
+        parameters: dict,
+        input_hash: str | None = None,
+        output_hash: str | None = None,
+        duration: float | None = None,
+        rows: int | None = None,
+    ) -> str:
+        # Acrescenta um registro ao log e retorna a chave do passo
+        canonical = TSProvenance.canonicalize(parameters)
+        step = TSProvenance.step_key(transformation, canonical, input_hash)
+        self._index[step] = len(self._records)
+        self._records.append(
+            (step, transformation, canonical, input_hash, output_hash, duration, rows)
+        )
+        return step
+
+    def find(self, step: str) -> dict[str, Any]:
+        # Registro mais recente do passo `step` ({} se o passo não estiver no log)
+        position = self._index.get(step)
+        if position is None:
+            return {}
+        return self.__as_dict(self._records[position])
+
+    def last(self, transformation: str | None = None) -> dict[str, Any]:
+        # Registro mais recente da transformação informada (ou de qualquer transformação)
+        for record in reversed(self._records):
+            if transformation is None or record[1] == transformation:
+                return self.__as_dict(record)
+        return {}
+
+    @staticmethod
+    def __as_dict(record: tuple) -> dict[str, Any]:
+        result = dict(zip(TSProvenance.FIELDS, record))
+        result['parameters'] = json.loads(result['parameters'])
+        return result
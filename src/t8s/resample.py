@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from t8s.log_config import LogConfig
+
+logger = LogConfig().get_logger()
+
+
+class TSResampler:
+    """
+    Motor de reamostragem de séries temporais para grades regulares. Os timestamps são
+    convertidos em ids de intervalo (bucket) a partir da sua representação int64 e todas
+    as agregações de todas as colunas numéricas são calculadas numa única passada, com
+    ufunc.reduceat sobre blocos 2D contíguos, em vez de um pd.resample por coluna e por
+    agregação.
+
+    Assim como no pd.resample, a grade cobre todos os intervalos entre o primeiro e o
+    último timestamp, os valores NaN são ignorados pelas agregações e intervalos sem
+    amostras válidas resultam em NaN (ou 0 para 'count' e 'sum'). Os intervalos são
+    fechados à esquerda e rotulados pelo seu início. Para timestamps com timezone os
+    intervalos são alinhados pelo horário local.
+
+    Por contrato a primeira coluna do DataFrame é o timestamp.
+    """
+
+    AGGREGATIONS = ['mean', 'min', 'max', 'first', 'last', 'sum', 'count', 'std']
+    DEFAULT_AGGREGATIONS = ['mean', 'min', 'max', 'last', 'count']
+
+    @staticmethod
+    def check_aggregations(aggs: list[str]) -> None:
+        if len(aggs) == 0:
+            raise ValueError('At least one aggregation must be informed')
+        for agg in aggs:
+            if agg not in TSResampler.AGGREGATIONS:
+                raise ValueError(f'Unknown aggregation: {agg}')
+
+    @staticmethod
+    def bucket_ids(timestamp: pd.Series, freq: str | pd.Timedelta):
+        # Id do intervalo de cada linha, o tamanho do intervalo na unidade do timestamp e
+        # os próprios timestamps como int64
+        dtype = timestamp.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            unit = dtype.unit
+            timestamp = timestamp.dt.tz_localize(None)
+        else:
+            unit = np.datetime_data(dtype)[0]
+        step = int(
+            np.timedelta64(pd.Timedelta(freq)).astype(f'm8[{unit}]').astype(np.int64)
+        )
+        if step <= 0:
+            raise ValueError(f'Invalid frequency: {freq}')
+        keys = timestamp.array.asi8  # type: ignore
+        if np.isnat(timestamp.to_numpy()).any():
+            raise Exception('A coluna de timestamp não pode conter valores nulos (NaT)')
+        return np.floor_divide(keys, step), step, keys
+
+    @staticmethod
+    def grid_timestamps(
+        grid: np.ndarray, step: int, like: pd.Series
+    ) -> pd.DatetimeIndex:
+        # Converte os ids dos intervalos da grade em timestamps com o dtype de `like`
+        dtype = like.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            index = pd.DatetimeIndex((grid * step).view(f'M8[{dtype.unit}]'))
+            return index.tz_localize(dtype.tz)
+        return pd.DatetimeIndex((grid * step).view(dtype))
+
+    @staticmethod
+    def reduce(block: np.ndarray, starts: np.ndarray, aggs: list[str]) -> dict:
+        # Calcula as agregações de `block` (uma linha por feature, amostras ordenadas por
+        # grupo nas colunas) para os grupos que começam nas posições `starts`. Com esse
+        # layout cada reduceat percorre memória contígua. Retorna um dicionário
+        # agregação -> array (features x grupos).
+        samples = block.shape[1]
+        lengths = np.diff(np.append(starts, samples))
+        if block.dtype.kind == 'f':
+            valid = ~np.isnan(block)
+            count = np.add.reduceat(valid, starts, axis=1, dtype=np.int64)
+        else:
+            valid = np.ones(block.shape, dtype=bool)
+            count = np.broadcast_to(lengths, (block.shape[0], len(starts)))
+        result: dict[str, np.ndarray] = {}
+        if 'count' in aggs:
+            result['count'] = count
+        if {'sum', 'mean', 'std'} & set(aggs):
+            sum_dtype = np.float64 if block.dtype.kind == 'f' else np.int64
+            filled = np.where(valid, block, 0)
+            total = np.add.reduceat(filled, starts, axis=1, dtype=sum_dtype)
+            result['sum'] = total
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = total / count
+            result['mean'] = mean
+            if 'std' in aggs:
+                deviation = filled - np.repeat(mean, lengths, axis=1)
+                squares = np.where(valid, deviation * deviation, 0.0)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    result['std'] = np.sqrt(
+                        np.add.reduceat(squares, starts, axis=1) / (count - 1)
+                    )
+        if 'min' in aggs:
+            result['min'] = np.fmin.reduceat(block, starts, axis=1)
+        if 'max' in aggs:
+            result['max'] = np.fmax.reduceat(block, starts, axis=1)
+        if 'first' in aggs or 'last' in aggs:
+            positions = np.arange(samples)[np.newaxis, :]
+            features = np.arange(block.shape[0])[:, np.newaxis]
+            if 'first' in aggs:
+                first = np.minimum.reduceat(
+                    np.where(valid, positions, samples), starts, axis=1
+                )
+                result['first'] = TSResampler.__take(
+                    block, features, first, first == samples
+                )
+            if 'last' in aggs:
+                last = np.maximum.reduceat(
+                    np.where(valid, positions, -1), starts, axis=1
+                )
+                result['last'] = TSResampler.__take(block, features, last, last < 0)
+        return {agg: result[agg] for agg in aggs}
+
+    @staticmethod
+    def __take(block, features, positions, missing) -> np.ndarray:
+        values = block[features, np.clip(positions, 0, block.shape[1] - 1)]
+        if missing.any():
+            values = values.astype(np.result_type(values.dtype, np.float32))
+            values[missing] = np.nan
+        return values
+
+    @staticmethod
+    def output_dtype(agg: str, dtype: np.dtype) -> np.dtype:
+        # Tipo de dado do resultado de cada agregação. Colunas float preservam a precisão
+        # original (float32 continua float32); as demais colunas resultam em float64.
+        if agg == 'count':
+            return np.dtype(np.int64)
+        if agg == 'sum' and dtype.kind in 'iub':
+            return np.dtype(np.int64)
+        if dtype.kind == 'f':
+            return dtype
+        return np.dtype(np.float64)
+
+    @staticmethod
+    def fill(agg: str, dtype: np.dtype, shape: tuple) -> np.ndarray:
+        # Array da grade completa, já preenchido com o valor dos intervalos vazios
+        if agg in ['count', 'sum']:
+            return np.zeros(shape, dtype=dtype)
+        return np.full(shape, np.nan, dtype=dtype)
+
+    @staticmethod
+    def group_starts(
+        keys: np.ndarray, timestamps: np.ndarray, order: np.ndarray | None = None
+    ):
+        # Ordena (se necessário) as chaves de grupo e retorna a permutação, as chaves
+        # distintas e a posição inicial de cada grupo. Dentro de cada grupo as linhas
+        # ficam em ordem cronológica, o que define o 'first' e o 'last'. Se `order` for
+        # informado ele já deve ser uma permutação com essas propriedades.
+        if order is not None:
+            keys = keys[order]
+        elif len(keys) > 1 and not (
+            (keys[1:] >= keys[:-1]).all() and (timestamps[1:] >= timestamps[:-1]).all()
+        ):
+            order = np.lexsort((timestamps, keys))
+            keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        return order, keys[starts], starts
+
+    @staticmethod
+    def resample_wide(df: pd.DataFrame, freq: str | pd.Timedelta, aggs: list[str]):
+        TSResampler.check_aggregations(aggs)
+        timestamp = df[df.columns[0]]
+        value_columns = [col for col in df.columns[1:] if df[col].dtype.kind in 'iufb']
+        if len(df) == 0 or len(value_columns) == 0:
+            raise Exception(
+                'A série temporal não possui dados numéricos para reamostrar'
+            )
+        buckets, step, keys = TSResampler.bucket_ids(timestamp, freq)
+        order, unique_buckets, starts = TSResampler.group_starts(buckets, keys)
+        grid = np.arange(unique_buckets[0], unique_buckets[-1] + 1)
+        positions = unique_buckets - unique_buckets[0]
+
+        # Colunas do mesmo dtype são agregadas juntas, num único bloco 2D (features x amostras)
+        by_dtype: dict[np.dtype, list] = {}
+        for col in value_columns:
+            by_dtype.setdefault(df[col].dtype, []).append(col)
+        aggregated: dict = {}
+        for dtype, columns in by_dtype.items():
+            block = np.stack([df[col].to_numpy() for col in columns])
+            if order is not None:
+                block = block[:, order]
+            reduced = TSResampler.reduce(block, starts, aggs)
+            for agg, values in reduced.items():
+                out_dtype = TSResampler.output_dtype(agg, dtype)
+                out = TSResampler.fill(agg, out_dtype, (len(columns), len(grid)))
+                out[:, positions] = values
+                for idx, col in enumerate(columns):
+                    aggregated[(col, agg)] = out[idx]
+
+        data: dict = {
+            timestamp.name: TSResampler.grid_timestamps(grid, step, timestamp)
+        }
+        for col in value_columns:
+            for agg in aggs:
+                name = col if len(aggs) == 1 else f'{col}_{agg}'
+                data[name] = aggregated[(col, agg)]
+        logger.debug(
+            f'resample_wide({freq}): {len(df)} linhas -> {len(grid)} intervalos, '
+            f'{len(value_columns)} colunas, agregações {aggs}'
+        )
+        return pd.DataFrame(data, copy=False)
+
+    @staticmethod
+    def resample_long(df: pd.DataFrame, freq: str | pd.Timedelta, aggs: list[str]):
+        # Reamostra uma série long (timestamp, ds, value) por `ds`. O resultado segue o
+        # formato long, ordenado por (timestamp, ds), com uma grade comum a todos os `ds`.
+        # Com mais de uma agregação o `ds` do resultado recebe o sufixo `_<agregação>`.
+        TSResampler.check_aggregations(aggs)
+        codes, categories = pd.factorize(df['ds'], sort=True)
+        if (codes < 0).any():
+            # Linhas com `ds` nulo (código -1) não pertencem a nenhum `ds` e são
+            # descartadas
+            rows = np.flatnonzero(codes >= 0)
+            df, codes = df.iloc[rows], codes[rows]
+        timestamp = df[df.columns[0]]
+        if len(df) == 0:
+            raise Exception('A série temporal não possui dados para reamostrar')
+        buckets, step, keys = TSResampler.bucket_ids(timestamp, freq)
+        first_bucket, last_bucket = buckets.min(), buckets.max()
+        grid = np.arange(first_bucket, last_bucket + 1)
+        # Chave composta (ds, intervalo): uma única ordenação agrupa as duas dimensões
+        composite = codes.astype(np.int64) * len(grid) + (buckets - first_bucket)
+        order = None
+        if len(categories) < 2**15 and (keys[1:] >= keys[:-1]).all():
+            # Série long ordenada por timestamp (o caso usual): basta uma ordenação
+            # estável pelo código do `ds`, que para int16 é um radix sort
+            order = np.argsort(codes.astype(np.int16), kind='stable')
+        order, unique_keys, starts = TSResampler.group_starts(composite, keys, order)
+        block = df['value'].to_numpy()[np.newaxis, :]
+        if order is not None:
+            block = block[:, order]
+        reduced = TSResampler.reduce(block, starts, aggs)
+
+        labels = [
+            str(ds) if len(aggs) == 1 else f'{ds}_{agg}'
+            for ds in categories
+            for agg in aggs
+        ]
+        label_order = np.argsort(np.array(labels, dtype=object), kind='stable')
+        label_position = np.empty(len(labels), dtype=np.int64)
+        label_position[label_order] = np.arange(len(labels))
+        dtypes = [TSResampler.output_dtype(agg, block.dtype) for agg in aggs]
+        value_dtype = np.result_type(*dtypes)
+        values = np.empty((len(grid), len(labels)), dtype=value_dtype)
+        rows = unique_keys % len(grid)
+        ds_codes = unique_keys // len(grid)
+        for agg_idx, (agg, agg_values) in enumerate(reduced.items()):
+            column = TSResampler.fill(agg, value_dtype, (len(grid), len(categories)))
+            column[rows, ds_codes] = agg_values[0]
+            target = label_position[np.arange(len(categories)) * len(aggs) + agg_idx]
+            values[:, target] = column
+
+        logger.debug(
+            f'resample_long({freq}): {len(df)} linhas -> {len(grid)} intervalos, '
+            f'{len(categories)} ds, agregações {aggs}'
+        )
+        return pd.DataFrame(
+            {
+                timestamp.name: TSResampler.grid_timestamps(
+                    grid, step, timestamp
+                ).repeat(len(labels)),
+                'ds': pd.Categorical.from_codes(
+                    np.tile(np.arange(len(labels)), len(grid)),
+                    categories=np.array(labels, dtype=object)[label_order],
+                ),
+                'value': values.ravel(),
+            },
+            copy=False,
+        )
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from t8s.log_config import LogConfig
+
+logger = LogConfig().get_logger()
+
+
+class _WindowBounds(BaseIndexer):
+    # Janelas pré-calculadas, para que o rolling do pandas use os mesmos limites
+    # (inclusive entre segmentos de `ds` no formato long)
+    def __init__(self, start: np.ndarray, end: np.ndarray):
+        super().__init__()
+        self.start = start
+        self.end = end
+
+    def get_window_bounds(
+        self, num_values=0, min_periods=None, center=None, closed=None, step=None
+    ):
+        return self.start, self.end
+
+
+class TSRolling:
+    """
+    Motor de estatísticas em janelas móveis baseadas em tempo (ex.: '5min'). Para cada
+    linha a janela é o intervalo (t - window, t], como no pd.rolling com janela de tempo,
+    e os valores NaN são ignorados. Todas as colunas numéricas são processadas juntas,
+    num bloco 2D (features x amostras):
+
+    - soma, contagem, média e desvio padrão vêm de somas acumuladas (running sums), de
+      modo que cada janela custa O(1), independentemente do seu tamanho;
+    - mínimo e máximo usam o algoritmo de van Herk/Gil-Werman (O(n), o equivalente
+      vetorizado da deque monotônica) e, para as janelas com menos amostras (início da
+      série e lacunas nos dados), uma sparse table construída por dobramento;
+    - mediana e quantis usam o rolling do pandas (skiplist incremental) com os limites
+      de janela já calculados, numa única chamada para todas as colunas.
+
+    Por contrato a primeira coluna do DataFrame é o timestamp.
+    """
+
+    STATISTICS = ['mean', 'std', 'min', 'max', 'median', 'sum', 'count']
+    DEFAULT_STATISTICS = ['mean', 'std', 'min', 'max']
+
+    @staticmethod
+    def stat_names(stats: list[str], quantiles: list[float]) -> list[str]:
+        for stat in stats:
+            if stat not in TSRolling.STATISTICS:
+                raise ValueError(f'Unknown statistic: {stat}')
+        for q in quantiles:
+            if not 0 <= q <= 1:
+                raise ValueError(f'Invalid quantile: {q}')
+        names = list(stats) + [f'q{q:g}' for q in quantiles]
+        if len(names) == 0:
+            raise ValueError('At least one statistic must be informed')
+        return names
+
+    @staticmethod
+    def window_size(window: str | pd.Timedelta, like: pd.Series) -> int:
+        # Tamanho da janela na unidade do timestamp
+        dtype = like.dtype
+        unit = (
+            dtype.unit
+            if isinstance(dtype, pd.DatetimeTZDtype)
+            else np.datetime_data(dtype)[0]
+        )
+        size = int(
+            np.timedelta64(pd.Timedelta(window)).astype(f'm8[{unit}]').astype(np.int64)
+        )
+        if size <= 0:
+            raise ValueError(f'Invalid window: {window}')
+        return size
+
+    @staticmethod
+    def window_bounds(keys: np.ndarray, size: int, segments: np.ndarray):
+        # Limites [start, end) da janela de cada linha. `keys` deve estar ordenado dentro
+        # de cada segmento e `segments` contém a posição inicial de cada segmento (um por
+        # `ds` no formato long); as janelas nunca atravessam segmentos.
+        end = np.arange(1, len(keys) + 1)
+        start = np.empty(len(keys), dtype=np.int64)
+        bounds = np.append(segments, len(keys))
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            segment = keys[first:last]
+            start[first:last] = first + np.searchsorted(
+                segment, segment - size, side='right'
+            )
+        return start, end
+
+    @staticmethod
+    def regular_rows(start: np.ndarray) -> tuple[int, np.ndarray]:
+        # O maior comprimento de janela (em linhas), `size`, é o das janelas em regime
+        # permanente de uma série com amostragem regular. As linhas cuja janela tem
+        # exatamente `size` linhas são tratadas com fatias, sem gather. As demais (início
+        # da série e linhas logo após lacunas nos dados) são retornadas em `irregular`.
+        lengths = np.arange(1, len(start) + 1) - start
+        size = int(lengths.max())
+        return size, np.flatnonzero(lengths != size)
+
+    @staticmethod
+    def window_sums(
+        values: np.ndarray, start: np.ndarray, size: int, irregular: np.ndarray
+    ) -> np.ndarray:
+        # Soma de cada janela a partir da soma acumulada (float64): como a janela da linha
+        # i termina na própria linha, a soma é cumulative[:, i + 1] - cumulative[:, start]
+        rows = values.shape[1]
+        cumulative = np.empty((values.shape[0], rows + 1))
+        cumulative[:, 0] = 0.0
+        np.cumsum(values, axis=1, dtype=np.float64, out=cumulative[:, 1:])
+        window_sum = np.empty(values.shape)
+        np.subtract(
+            cumulative[:, size:],
+            cumulative[:, : rows + 1 - size],
+            out=window_sum[:, size - 1 :],
+        )
+        if len(irregular) > 0:
+            window_sum[:, irregular] = (
+                cumulative[:, irregular + 1] - cumulative[:, start[irregular]]
+            )
+        return window_sum
+
+    @staticmethod
+    def window_extreme(
+        block: np.ndarray, start: np.ndarray, size: int, irregular: np.ndarray, ufunc
+    ) -> np.ndarray:
+        # Mínimo (np.fmin) ou máximo (np.fmax) de cada janela.
+        # Janelas de `size` linhas: algoritmo de van Herk/Gil-Werman. Com o bloco dividido
+        # em trechos de `size` linhas, toda janela é a junção de um sufixo de um trecho com
+        # um prefixo do trecho seguinte, ambos obtidos com ufunc.accumulate.
+        features, rows = block.shape
+        result = np.empty(block.shape, dtype=block.dtype)
+        chunks = -(-rows // size)
+        padded = np.full((features, chunks * size), np.nan, dtype=block.dtype)
+        padded[:, :rows] = block
+        shaped = padded.reshape(features, chunks, size)
+        prefix = ufunc.accumulate(shaped, axis=2).reshape(features, -1)
+        suffix = ufunc.accumulate(shaped[:, :, ::-1], axis=2)[:, :, ::-1]
+        suffix = suffix.reshape(features, -1)
+        ufunc(
+            suffix[:, : rows + 1 - size],
+            prefix[:, size - 1 : rows],
+            out=result[:, size - 1 :],
+        )
+        if len(irregular) == 0:
+            return result
+
+        # Janelas que começam na primeira linha: extremo acumulado
+        warmup = irregular[start[irregular] == 0]
+        if len(warmup) > 0:
+            accumulated = ufunc.accumulate(block[:, : warmup[-1] + 1], axis=1)
+            result[:, warmup] = accumulated[:, warmup]
+        # Demais janelas (após lacunas): sparse table, em que no nível k `level[:, j]` é
+        # o extremo de block[:, j:j + 2**k]. Uma janela de L linhas é coberta por dois
+        # intervalos do nível floor(log2(L)).
+        irregular = irregular[start[irregular] > 0]
+        if len(irregular) == 0:
+            return result
+        levels = np.log2(irregular + 1 - start[irregular]).astype(np.int64)
+        level = block
+        for k in range(int(levels.max()) + 1):
+            if k > 0:
+                half = 2 ** (k - 1)
+                level = ufunc(level[:, :-half], level[:, half:])
+            selected = irregular[levels == k]
+            if len(selected) > 0:
+                result[:, selected] = ufunc(
+                    level[:, start[selected]], level[:, selected + 1 - 2**k]
+                )
+        return result
+
+    @staticmethod
+    def compute(
+        block: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        names: list[str],
+        min_periods: int,
+    ) -> dict:
+        # Calcula as estatísticas `names` para um bloco float (features x amostras).
+        # Retorna um dicionário estatística -> array (features x amostras).
+        window_rows = (end - start).astype(np.float64)
+        size, irregular = TSRolling.regular_rows(start)
+        missing = np.isnan(block)
+        has_nan = bool(missing.any())
+        if has_nan:
+            count = TSRolling.window_sums(~missing, start, size, irregular)
+        else:
+            count = np.broadcast_to(window_rows, block.shape)
+        result: dict[str, np.ndarray] = {}
+        if 'count' in names:
+            result['count'] = np.array(count)
+        if {'sum', 'mean', 'std'} & set(names):
+            # Deslocar pela média global reduz o cancelamento numérico das somas acumuladas
+            with np.errstate(invalid='ignore'):
+                shift = np.nan_to_num(np.nanmean(block, axis=1, keepdims=True))
+            centered = block - shift  # float64
+            if has_nan:
+                centered[missing] = 0.0
+            window_sum = TSRolling.window_sums(centered, start, size, irregular)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if 'sum' in names:
+                    result['sum'] = window_sum + shift * count
+                if 'mean' in names:
+                    mean = window_sum / count
+                    mean += shift
+                    result['mean'] = mean
+                if 'std' in names:
+                    np.multiply(centered, centered, out=centered)
+                    window_squares = TSRolling.window_sums(
+                        centered, start, size, irregular
+                    )
+                    window_squares -= window_sum * window_sum / count
+                    window_squares /= count - 1
+                    std = np.sqrt(np.maximum(window_squares, 0.0, out=window_squares))
+                    std[count < 2] = np.nan
+                    result['std'] = std
+        if 'min' in names:
+            result['min'] = TSRolling.window_extreme(
+                block, start, size, irregular, np.fmin
+            )
+        if 'max' in names:
+            result['max'] = TSRolling.window_extreme(
+                block, start, size, irregular, np.fmax
+            )
+        order_stats = [
+            name for name in names if name == 'median' or name.startswith('q')
+        ]
+        if len(order_stats) > 0:
+            rolling = pd.DataFrame(block.T, copy=False).rolling(
+                _WindowBounds(start, end), min_periods=min_periods
+            )
+            for name in order_stats:
+                if name == 'median':
+                    values = rolling.median()
+                else:
+                    values = rolling.quantile(float(name[1:]))
+                result[name] = values.to_numpy().T
+        # O rolling do pandas já aplica o min_periods às estatísticas de ordem. Para a
+        # contagem, como no pandas, o min_periods considera também as linhas com NaN.
+        if has_nan or min_periods > 1:
+            insufficient = count < min_periods
+            for name in names:
+                if name == 'count':
+                    result[name][:, window_rows < min_periods] = np.nan
+                elif name not in order_stats:
+                    result[name][insufficient] = np.nan
+        return {name: result[name] for name in names}
+
+    @staticmethod
+    def output_dtype(name: str, dtype: np.dtype) -> np.dtype:
+        # Colunas float preservam a precisão original (float32 continua float32)
+        if name != 'count' and dtype.kind == 'f':
+            return dtype
+        return np.dtype(np.float64)
+
+    @staticmethod
+    def timestamps_as_int64(timestamp: pd.Series) -> np.ndarray:
+        if timestamp.isna().any():
+            raise Exception('A coluna de timestamp não pode conter valores nulos (NaT)')
+        return timestamp.array.asi8  # type: ignore
+
+    @staticmethod
+    def rolling_wide(
+        df: pd.DataFrame,
+        window: str | pd.Timedelta,
+        stats: list[str],
+        quantiles: list[float],
+        min_periods: int,
+    ) -> pd.DataFrame:
+        names = TSRolling.stat_names(stats, quantiles)
+        timestamp = df[df.columns[0]]
+        value_columns = [col for col in df.columns[1:] if df[col].dtype.kind in 'iufb']
+        if len(value_columns) == 0:
+            raise Exception('A série temporal não possui dados numéricos')
+        keys = TSRolling.timestamps_as_int64(timestamp)
+        if len(keys) > 1 and not (keys[1:] >= keys[:-1]).all():
+            raise Exception('A coluna de timestamp deve estar em ordem crescente')
+        size = TSRolling.window_size(window, timestamp)
+        start, end = TSRolling.window_bounds(keys, size, np.array([0]))
+        # Colunas float32 são processadas em float32; as somas acumuladas usam float64
+        dtype = np.result_type(*[df[col].dtype for col in value_columns], np.float32)
+        block = np.stack([df[col].to_numpy(dtype=dtype) for col in value_columns])
+        result = TSRolling.compute(block, start, end, names, min_periods)
+
+        data: dict = {timestamp.name: timestamp}
+        for idx, col in enumerate(value_columns):
+            for name in names:
+                column = col if len(names) == 1 else f'{col}_{name}'
+                dtype = TSRolling.output_dtype(name, df[col].dtype)
+                data[column] = result[name][idx].astype(dtype, copy=False)
+        logger.debug(
+            f'rolling_wide({window}): {len(df)} linhas, {len(value_columns)} colunas, '
+            f'estatísticas {names}'
+        )
+        return pd.DataFrame(data, index=df.index, copy=False)
+
+    @staticmethod
+    def rolling_long(
+        df: pd.DataFrame,
+        window: str | pd.Timedelta,
+        stats: list[str],
+        quantiles: list[float],
+        min_periods: int,
+    ) -> pd.DataFrame:
+        # As janelas são calculadas por `ds`. Cada linha da série de origem dá origem a
+        # uma linha por estatística, na mesma ordem, e com mais de uma estatística o `ds`
+        # do resultado recebe o sufixo `_<estatística>`.
+        names = TSRolling.stat_names(stats, quantiles)
+        timestamp = df[df.columns[0]]
+        keys = TSRolling.timestamps_as_int64(timestamp)
+        codes, categories = pd.factorize(df['ds'])
+        if len(keys) > 1 and (keys[1:] >= keys[:-1]).all() and len(categories) < 2**15:
+            order = np.argsort(codes.astype(np.int16), kind='stable')
+        else:
+            order = np.lexsort((keys, codes))
+        sorted_codes = codes[order]
+        sorted_keys = keys[order]
+        segments = np.flatnonzero(
+            np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1]))
+        )
+        size = TSRolling.window_size(window, timestamp)
+        start, end = TSRolling.window_bounds(sorted_keys, size, segments)
+        values = df['value'].to_numpy(dtype=np.float64)[order][np.newaxis, :]
+        result = TSRolling.compute(values, start, end, names, min_periods)
+
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        block = np.empty((len(df), len(names)))
+        for idx, name in enumerate(names):
+            block[:, idx] = result[name][0][inverse]
+        value_dtype = np.result_type(
+            *[TSRolling.output_dtype(name, df['value'].dtype) for name in names]
+        )
+        # `ds` categórico, como no to_long(): códigos inteiros e um rótulo por categoria
+        if len(names) == 1:
+            ds = pd.Categorical.from_codes(
+                codes, categories=np.asarray(categories, dtype=object)
+            )
+        else:
+            labels = np.array(
+                [f'{category}_{name}' for category in categories for name in names],
+                dtype=object,
+            )
+            label_codes = codes[:, np.newaxis] * len(names) + np.arange(len(names))
+            label_codes[codes < 0] = -1
+            ds = pd.Categorical.from_codes(label_codes.ravel(), categories=labels)
+        logger.debug(
+            f'rolling_long({window}): {len(df)} linhas, {len(categories)} ds, '
+            f'estatísticas {names}'
+        )
+        return pd.DataFrame(
+            {
+                timestamp.name: timestamp.array.repeat(len(names)),
+                'ds': ds,
+                'value': block.ravel().astype(value_dtype, copy=False),
+            },
+            copy=False,
+        )
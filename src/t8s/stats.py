@@ -2,90 +2,809 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Iterable, Protocol
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
 from pandas.core.series import Series
 
 from t8s.log_config import LogConfig
+from t8s.resample import TSResampler
+
+if TYPE_CHECKING:
+    from t8s.ts import TimeSerie
 
 logger = LogConfig().get_logger()
 
 
+class TSStreamStats:
+    """
+    Estatísticas de colunas numéricas calculadas em uma única passada, bloco a bloco
+    (ex.: row group a row group de um arquivo Parquet), sem manter os dados em memória.
+    Para cada coluna são mantidos a contagem de valores válidos, a contagem de nulos/NaN,
+    o mínimo e o máximo (exatos) e a média e a soma dos quadrados dos desvios (M2),
+    atualizadas pelo método de Welford. A atualização de cada bloco é vetorizada: as
+    estatísticas do bloco são calculadas com NumPy e combinadas com as acumuladas pela
+    fórmula de Chan et al., a mesma usada por merge().
+
+    Como merge() é associativo, os resultados parciais calculados em paralelo (por
+    arquivo, partição ou processo, já que o objeto é serializável com pickle) podem ser
+    combinados em qualquer ordem. Colunas presentes em apenas uma das partes são
+    mantidas. Os quartis não podem ser calculados desta forma e ficam como NaN em
+    describe().
+    """
+
+    def __init__(self, columns: Iterable[str] | None = None):
+        self.columns: list[str] = []
+        self._count = np.zeros(0, dtype=np.int64)
+        self._nan = np.zeros(0, dtype=np.int64)
+        self._mean = np.zeros(0)
+        self._m2 = np.zeros(0)
+        self._min = np.zeros(0)
+        self._max = np.zeros(0)
+        if columns is not None:
+            self.__align(list(columns))
+
+    def __repr__(self):
+        return f'TSStreamStats(columns={self.columns}, count={self._count.tolist()})'
+
+    def __align(self, columns: list[str]) -> None:
+        # Acrescenta as colunas ainda não acumuladas, com estado vazio
+        new = [col for col in columns if col not in self.columns]
+        if len(new) == 0:
+            return
+        self.columns = self.columns + new
+        k = len(new)
+        self._count = np.concatenate((self._count, np.zeros(k, dtype=np.int64)))
+        self._nan = np.concatenate((self._nan, np.zeros(k, dtype=np.int64)))
+        self._mean = np.concatenate((self._mean, np.zeros(k)))
+        self._m2 = np.concatenate((self._m2, np.zeros(k)))
+        self._min = np.concatenate((self._min, np.full(k, np.inf)))
+        self._max = np.concatenate((self._max, np.full(k, -np.inf)))
+
+    @staticmethod
+    def __numeric_columns(data: pd.DataFrame | pa.Table) -> Iterable[tuple[str, Any]]:
+        # Pares (nome, valores) das colunas numéricas, sem materializar um DataFrame
+        if isinstance(data, pa.Table):
+            for field, column in zip(data.schema, data.columns):
+                if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                    yield field.name, column
+        else:
+            for col in data.columns:
+                if data[col].dtype.kind in 'iuf':
+                    yield str(col), data[col]
+
+    @staticmethod
+    def __values(column: Any) -> tuple[np.ndarray, int]:
+        # Valores válidos (float64) e quantidade de nulos/NaN de uma coluna
+        if isinstance(column, pa.ChunkedArray):
+            nulls = column.null_count
+            values = np.asarray(pc.drop_null(column).to_numpy(), dtype=np.float64)
+        else:
+            values = np.asarray(column.to_numpy(dtype=np.float64, na_value=np.nan))
+            nulls = 0
+        nan_mask = np.isnan(values)
+        nan_count = int(np.count_nonzero(nan_mask))
+        if nan_count > 0:
+            values = values[~nan_mask]
+        return values, nulls + nan_count
+
+    def update(self, data: pd.DataFrame | pa.Table | TimeSerie) -> TSStreamStats:
+        # Acrescenta um bloco de dados (DataFrame, pa.Table ou TimeSerie) às estatísticas
+        if not isinstance(data, (pd.DataFrame, pa.Table)):
+            data = data.to_arrow() if data.is_arrow_backed() else data.df
+        columns, stats = [], []
+        for name, column in TSStreamStats.__numeric_columns(data):
+            values, nan_count = TSStreamStats.__values(column)
+            n = len(values)
+            if n > 0:
+                mean = values.mean()
+                m2 = np.square(values - mean).sum()
+                stats.append((n, nan_count, mean, m2, values.min(), values.max()))
+            else:
+                stats.append((0, nan_count, 0.0, 0.0, np.inf, -np.inf))
+            columns.append(name)
+        chunk = TSStreamStats()
+        if len(columns) > 0:
+            # Uma linha por estatística e uma coluna por coluna do bloco
+            arrays = np.array(stats, dtype=np.float64).T
+            chunk.columns = columns
+            chunk._count = arrays[0].astype(np.int64)
+            chunk._nan = arrays[1].astype(np.int64)
+            chunk._mean, chunk._m2, chunk._min, chunk._max = arrays[2:]
+        self.__merge_in(chunk)
+        return self
+
+    def __merge_in(self, other: TSStreamStats) -> None:
+        if len(other.columns) == 0:
+            return
+        self.__align(other.columns)
+        positions = {col: idx for idx, col in enumerate(self.columns)}
+        idx = np.array([positions[col] for col in other.columns])
+        n_a, n_b = self._count[idx], other._count
+        n = n_a + n_b
+        delta = other._mean - self._mean[idx]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, n_b / n, 0.0)
+            self._mean[idx] = self._mean[idx] + delta * weight
+            self._m2[idx] = self._m2[idx] + other._m2 + delta**2 * n_a * weight
+        self._count[idx] = n
+        self._nan[idx] += other._nan
+        self._min[idx] = np.minimum(self._min[idx], other._min)
+        self._max[idx] = np.maximum(self._max[idx], other._max)
+
+    def merge(self, other: TSStreamStats) -> TSStreamStats:
+        # Combina duas estatísticas parciais em uma nova (as originais não são alteradas)
+        result = self.copy()
+        result.__merge_in(other)
+        return result
+
+    def __add__(self, other: TSStreamStats) -> TSStreamStats:
+        return self.merge(other)
+
+    def copy(self) -> TSStreamStats:
+        result = TSStreamStats()
+        result.columns = list(self.columns)
+        result._count, result._nan = self._count.copy(), self._nan.copy()
+        result._mean, result._m2 = self._mean.copy(), self._m2.copy()
+        result._min, result._max = self._min.copy(), self._max.copy()
+        return result
+
+    @staticmethod
+    def from_parquet(
+        file_path: Path, select_features: list[str] | None = None
+    ) -> TSStreamStats:
+        # Estatísticas de um arquivo Parquet, lido um row group por vez
+        from t8s.ts_builder import ReadParquetFile
+
+        result = TSStreamStats()
+        for ts in ReadParquetFile(backend='arrow').read_row_groups(
+            file_path, select_features
+        ):
+            result.update(ts)
+        return result
+
+    def __position(self, column_name: str) -> int:
+        if column_name not in self.columns:
+            raise KeyError(column_name)
+        return self.columns.index(column_name)
+
+    # Contagem de valores válidos (não nulos e não NaN) da coluna `column_name`
+    def count(self, column_name: str) -> float:
+        return float(self._count[self.__position(column_name)])
+
+    # Contagem de valores nulos ou NaN da coluna `column_name`
+    def nan_count(self, column_name: str) -> int:
+        return int(self._nan[self.__position(column_name)])
+
+    def mean(self, column_name: str) -> float:
+        idx = self.__position(column_name)
+        return float(self._mean[idx]) if self._count[idx] > 0 else np.nan
+
+    # Variância amostral (ddof=1), como no describe() do Pandas
+    def var(self, column_name: str, ddof: int = 1) -> float:
+        idx = self.__position(column_name)
+        if self._count[idx] <= ddof:
+            return np.nan
+        return float(self._m2[idx] / (self._count[idx] - ddof))
+
+    def std(self, column_name: str, ddof: int = 1) -> float:
+        return float(np.sqrt(self.var(column_name, ddof)))
+
+    def min(self, column_name: str) -> float:
+        idx = self.__position(column_name)
+        return float(self._min[idx]) if self._count[idx] > 0 else np.nan
+
+    def max(self, column_name: str) -> float:
+        idx = self.__position(column_name)
+        return float(self._max[idx]) if self._count[idx] > 0 else np.nan
+
+    def describe(self) -> pd.DataFrame:
+        # Resumo no formato do describe() do Pandas (quartis = NaN)
+        empty = self._count == 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(
+                self._count > 1, np.sqrt(self._m2 / (self._count - 1)), np.nan
+            )
+        quartile = np.full(len(self.columns), np.nan)
+        rows = {
+            'count': self._count.astype(np.float64),
+            'mean': np.where(empty, np.nan, self._mean),
+            'std': std,
+            'min': np.where(empty, np.nan, self._min),
+            '25%': quartile,
+            '50%': quartile,
+            '75%': quartile,
+            'max': np.where(empty, np.nan, self._max),
+        }
+        return pd.DataFrame(rows, index=self.columns).T
+
+
+class TSParquetStats:
+    """
+    Estatísticas de um arquivo Parquet, ou de todos os arquivos *.parquet de um
+    diretório, obtidas do rodapé (footer) dos arquivos, sem ler os dados: cada row group
+    traz, por coluna, o mínimo, o máximo e a quantidade de nulos. Assim count(),
+    nan_count(), min(), max() e amplitude() são respondidos lendo apenas os metadados,
+    lidos em paralelo num pool de threads.
+
+    Os dados são lidos (coluna a coluna, um row group por vez) apenas:
+    - para mean(), std() e values() (usado nos quantis), e
+    - para as colunas em que algum row group não possui estatísticas.
+
+    O pa.Table.from_pandas, usado por WriteParquetFile, grava os NaN das colunas float
+    como nulos, de modo que a quantidade de nulos do rodapé é a quantidade de NaN. Em
+    arquivos gravados com NaN (e não nulos), esses valores são contados por count().
+    """
+
+    def __init__(self, path: Path, max_workers: int | None = None):
+        path = Path(path)
+        self.paths: list[Path] = (
+            sorted(path.glob('*.parquet')) if path.is_dir() else [path]
+        )
+        if len(self.paths) == 0:
+            raise Exception(f'Não há arquivos Parquet em {path}')
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            self._metadata: list[pq.FileMetaData] = list(
+                executor.map(pq.read_metadata, self.paths)
+            )
+        # Estatísticas de cada arquivo: coluna -> [linhas, nulos, mínimo, máximo], ou
+        # None se algum row group não possui estatísticas
+        self._files = [TSParquetStats.__read_footer(m) for m in self._metadata]
+        self.columns: list[str] = []
+        self._types: dict[str, pa.DataType] = {}
+        for metadata in self._metadata:
+            for field in metadata.schema.to_arrow_schema():
+                self._types.setdefault(field.name, field.type)
+        self._footer: dict[str, list[Any] | None] = {}
+        for footers in self._files:
+            for name, footer in footers.items():
+                if name not in self._footer:
+                    self.columns.append(name)
+                    self._footer[name] = [0, 0, None, None]
+                self._footer[name] = TSParquetStats.__merge_footer(
+                    self._footer[name], footer
+                )
+        self._scanned: dict[str, TSStreamStats] = {}
+        logger.debug(
+            f'TSParquetStats: {len(self.paths)} arquivos, {self.num_rows} linhas, '
+            + f'colunas sem estatísticas: {self.__incomplete()}'
+        )
+
+    def __repr__(self):
+        return f'TSParquetStats(files={len(self.paths)}, columns={self.columns})'
+
+    @staticmethod
+    def __merge_footer(a: list[Any] | None, b: list[Any] | None) -> list[Any] | None:
+        if a is None or b is None:
+            return None
+        minimum = b[2] if a[2] is None else a[2] if b[2] is None else min(a[2], b[2])
+        maximum = b[3] if a[3] is None else a[3] if b[3] is None else max(a[3], b[3])
+        return [a[0] + b[0], a[1] + b[1], minimum, maximum]
+
+    @staticmethod
+    def __read_footer(metadata: pq.FileMetaData) -> dict[str, list[Any] | None]:
+        names = metadata.schema.to_arrow_schema().names
+        positions = {
+            metadata.schema.column(idx).path: idx for idx in range(metadata.num_columns)
+        }
+        footers: dict[str, list[Any] | None] = {
+            name: [0, 0, None, None] for name in names
+        }
+        for rg in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg)
+            for name in names:
+                statistics = row_group.column(positions[name]).statistics
+                if statistics is None or not statistics.has_null_count:
+                    footers[name] = None
+                    continue
+                valid = row_group.num_rows - statistics.null_count
+                if valid > 0 and not statistics.has_min_max:
+                    footers[name] = None
+                    continue
+                footer = [row_group.num_rows, statistics.null_count, None, None]
+                if valid > 0:
+                    footer[2:] = [statistics.min, statistics.max]
+                footers[name] = TSParquetStats.__merge_footer(footers[name], footer)
+        return footers
+
+    def __incomplete(self) -> list[str]:
+        return [name for name, footer in self._footer.items() if footer is None]
+
+    def numeric_columns(self) -> list[str]:
+        return [
+            name
+            for name in self.columns
+            if pa.types.is_integer(self._types[name])
+            or pa.types.is_floating(self._types[name])
+        ]
+
+    @property
+    def num_rows(self) -> int:
+        return sum(metadata.num_rows for metadata in self._metadata)
+
+    def __arrays(self, column_name: str) -> Iterable[pa.ChunkedArray]:
+        # Lê a coluna `column_name` de cada arquivo, um row group por vez
+        for path in self.paths:
+            parquet_file = pq.ParquetFile(path)
+            if column_name not in parquet_file.schema_arrow.names:
+                continue
+            for rg in range(parquet_file.num_row_groups):
+                yield parquet_file.read_row_group(rg, columns=[column_name])[
+                    column_name
+                ]
+
+    def __scan_footer(self, column_name: str) -> list[Any] | None:
+        # Reconstrói as estatísticas do rodapé a partir dos dados
+        footer: list[Any] | None = [0, 0, None, None]
+        for array in self.__arrays(column_name):
+            nulls = array.null_count
+            if pa.types.is_floating(array.type):
+                nulls += pc.sum(pc.is_nan(array)).as_py() or 0
+            chunk = [len(array), nulls, None, None]
+            if len(array) > nulls:
+                min_max = pc.min_max(array)
+                chunk[2:] = [min_max['min'].as_py(), min_max['max'].as_py()]
+            footer = TSParquetStats.__merge_footer(footer, chunk)
+        return footer
+
+    def __get_footer(self, column_name: str) -> list[Any]:
+        if column_name not in self._footer:
+            raise KeyError(column_name)
+        footer = self._footer[column_name]
+        if footer is None:
+            footer = self.__scan_footer(column_name)
+            self._footer[column_name] = footer
+        return footer
+
+    # Contagem de valores válidos (não nulos) da coluna `column_name`
+    def count(self, column_name: str) -> float:
+        rows, nulls, _, _ = self.__get_footer(column_name)
+        return float(rows - nulls)
+
+    # Contagem de valores nulos (NaN) da coluna `column_name`
+    def nan_count(self, column_name: str) -> int:
+        return int(self.__get_footer(column_name)[1])
+
+    def min(self, column_name: str) -> Any:
+        value = self.__get_footer(column_name)[2]
+        return np.nan if value is None else value
+
+    def max(self, column_name: str) -> Any:
+        value = self.__get_footer(column_name)[3]
+        return np.nan if value is None else value
+
+    def amplitude(self, column_name: str) -> Any:
+        return self.max(column_name) - self.min(column_name)
+
+    def scan(self, column_name: str) -> TSStreamStats:
+        # Estatísticas em streaming (média, desvio padrão) da coluna, lendo os dados
+        if column_name not in self._scanned:
+            stream = TSStreamStats()
+            for array in self.__arrays(column_name):
+                stream.update(pa.table({column_name: array}))
+            self._scanned[column_name] = stream
+        return self._scanned[column_name]
+
+    def mean(self, column_name: str) -> float:
+        return self.scan(column_name).mean(column_name)
+
+    def std(self, column_name: str) -> float:
+        return self.scan(column_name).std(column_name)
+
+    def values(self, column_name: str) -> np.ndarray:
+        # Valores válidos da coluna em todos os arquivos (usado no cálculo dos quantis)
+        arrays = [
+            pc.drop_null(array).to_numpy() for array in self.__arrays(column_name)
+        ]
+        if len(arrays) == 0:
+            return np.empty(0)
+        values = np.concatenate(arrays)
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        return values
+
+    def inventory(self) -> pd.DataFrame:
+        # Uma linha por (arquivo, coluna) com linhas, nulos, mínimo e máximo, a partir
+        # dos rodapés (as colunas sem estatísticas ficam com None)
+        records = [
+            (str(path), name, *(footer or [None] * 4))
+            for path, footers in zip(self.paths, self._files)
+            for name, footer in footers.items()
+        ]
+        return pd.DataFrame(
+            records, columns=['file', 'column', 'rows', 'nulls', 'min', 'max']
+        )
+
+
 class TSStats:
-    def __init__(self, df: pd.DataFrame):
-        assert isinstance(df, pd.DataFrame), "df must be a Pandas DataFrame"
-        # Obtendo o resumo estatístico do DataFrame
-        summary_en_us: pd.DataFrame = df.describe()
-        self.summary_en_us = summary_en_us
-        # Renomeando os índices do DataFrame resultante para PT_BR
-        summary_pt_br = summary_en_us.rename(
-            index={
-                'count': 'Contagem',
-                'mean': 'Média',
-                'std': 'Desvio padrão',
-                'min': 'Mínimo',
-                '25%': 'Primeiro quartil',
-                '50%': 'Mediana',
-                '75%': 'Terceiro quartil',
-                'max': 'Máximo',
-            }
+    """
+    Estatísticas descritivas das colunas de uma série temporal, calculadas sob demanda.
+    Cada acessor (mean(), q1(), amplitude(), etc.) calcula apenas o que precisa para a
+    coluna pedida e memoriza o resultado em `_cache`, indexado por (estatística, coluna).
+    Estatísticas relacionadas compartilham o trabalho: o mínimo e o máximo saem de uma
+    única passada e os três quartis de uma única chamada a np.partition(), sem ordenar a
+    coluna. Os resumos completos (`summary_en_us` e `summary_pt_br`, equivalentes ao
+    describe() do Pandas) também só são calculados quando acessados.
+    """
+
+    QUARTILES = {'25%': 0.25, '50%': 0.5, '75%': 0.75}
+    LABELS_PT_BR = {
+        'count': 'Contagem',
+        'mean': 'Média',
+        'std': 'Desvio padrão',
+        'min': 'Mínimo',
+        '25%': 'Primeiro quartil',
+        '50%': 'Mediana',
+        '75%': 'Terceiro quartil',
+        'max': 'Máximo',
+    }
+
+    def __init__(self, df: pd.DataFrame | pa.Table | TSStreamStats | TSParquetStats):
+        assert isinstance(
+            df, (pd.DataFrame, pa.Table, TSStreamStats, TSParquetStats)
+        ), "df must be a Pandas DataFrame, a pyarrow Table, a TSStreamStats or a TSParquetStats"
+        self._data = df
+        # (estatística, coluna) -> valor
+        self._cache: dict[tuple[str, str], Any] = {}
+        self._summary_en_us: pd.DataFrame | None = None
+        self._summary_pt_br: pd.DataFrame | None = None
+
+    @staticmethod
+    def from_parquet(path: Path) -> TSStats:
+        # Estatísticas de um arquivo Parquet ou de um diretório de arquivos, a partir dos
+        # rodapés (ver TSParquetStats)
+        return TSStats(TSParquetStats(path))
+
+    @property
+    def summary_en_us(self) -> pd.DataFrame:
+        # Resumo estatístico de todas as colunas, no formato do describe() do Pandas
+        if self._summary_en_us is None:
+            if isinstance(self._data, TSStreamStats):
+                # Estatísticas calculadas em streaming: os quartis não estão disponíveis
+                self._summary_en_us = self._data.describe()
+            elif isinstance(self._data, TSParquetStats):
+                # Contagem, mínimo e máximo vêm dos rodapés; os demais, dos dados
+                index = list(TSStats.LABELS_PT_BR)
+                self._summary_en_us = pd.DataFrame(
+                    {
+                        col: [self.__get(stat, col) for stat in index]
+                        for col in self._data.numeric_columns()
+                    },
+                    index=index,
+                )
+            elif isinstance(self._data, pa.Table):
+                self._summary_en_us = TSStats.describe_arrow(self._data)
+            else:
+                self._summary_en_us = self._data.describe()
+        return self._summary_en_us
+
+    @property
+    def summary_pt_br(self) -> pd.DataFrame:
+        # Renomeando os índices do resumo para PT_BR
+        if self._summary_pt_br is None:
+            self._summary_pt_br = self.summary_en_us.rename(index=TSStats.LABELS_PT_BR)
+            logger.debug(f'summary_pt_br =\n{self._summary_pt_br}\n')
+        return self._summary_pt_br
+
+    # Equivalente ao método describe() do Pandas, calculado diretamente sobre os buffers
+    # Arrow com pyarrow.compute, sem materializar um DataFrame. Assim como no Pandas,
+    # são consideradas as colunas numéricas e de timestamp, ignorando valores nulos e NaN.
+    @staticmethod
+    def describe_arrow(table: pa.Table) -> pd.DataFrame:
+        index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        summary: dict[str, list[Any]] = {}
+        has_timestamp = False
+        for field in table.schema:
+            is_timestamp = pa.types.is_timestamp(field.type)
+            if is_timestamp:
+                has_timestamp = True
+                values = pc.drop_null(table[field.name]).cast(pa.int64())
+            elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                values = pc.drop_null(table[field.name]).cast(pa.float64())
+                if pa.types.is_floating(field.type):
+                    values = pc.filter(values, pc.invert(pc.is_nan(values)))
+            else:
+                continue
+            count = len(values)
+            if count == 0:
+                summary[field.name] = [0.0] + [np.nan] * (len(index) - 1)
+                continue
+            min_max = pc.min_max(values)
+            quartiles = pc.quantile(values, q=[0.25, 0.5, 0.75], interpolation='linear')
+            column_summary = [
+                pc.mean(values).as_py(),
+                min_max['min'].as_py(),
+                *quartiles.to_pylist(),
+                min_max['max'].as_py(),
+            ]
+            if is_timestamp:
+                unit, tz = field.type.unit, field.type.tz
+                column_summary = [
+                    pd.Timestamp(int(v), unit=unit, tz=tz) for v in column_summary
+                ]
+                std = np.nan
+            else:
+                std = pc.stddev(values, ddof=1).as_py() if count > 1 else np.nan
+            summary[field.name] = [
+                count if is_timestamp else float(count),
+                column_summary[0],
+                std,
+                *column_summary[1:],
+            ]
+        result = pd.DataFrame(summary, index=index)
+        if has_timestamp:
+            # O Pandas posiciona a linha `std` ao final quando há colunas de timestamp
+            result = result.reindex(index[:2] + index[3:] + ['std'])
+        return result
+
+    GROUPED_STATISTICS = [
+        'count',
+        'nan_count',
+        'mean',
+        'std',
+        'min',
+        '25%',
+        '50%',
+        '75%',
+        'max',
+    ]
+
+    @staticmethod
+    def group_order(keys: np.ndarray, values: np.ndarray | None = None):
+        # Permutação que agrupa as linhas pela chave inteira `keys` (None se já estão
+        # agrupadas). Com `values`, dentro de cada grupo as linhas ficam ordenadas pelo
+        # valor (NaN ao final): ordena pelos valores e, de forma estável, pela chave. Com
+        # chaves menores que 2**15 a segunda ordenação é um radix sort de int16, mais
+        # rápido que o np.lexsort((values, keys)) equivalente.
+        if values is None:
+            if len(keys) > 1 and (keys[1:] < keys[:-1]).any():
+                return np.argsort(keys, kind='stable')
+            return None
+        order = np.argsort(values)
+        sorted_keys = keys[order]
+        if len(keys) > 0 and keys.max() < 2**15:
+            sorted_keys = sorted_keys.astype(np.int16)
+        return order[np.argsort(sorted_keys, kind='stable')]
+
+    @staticmethod
+    def group_quantiles(
+        values: np.ndarray, starts: np.ndarray, count: np.ndarray, q: list[float]
+    ) -> np.ndarray:
+        # Quantis (interpolação linear) de cada grupo de `values`, ordenado por
+        # group_order(keys, values). `starts` é a posição inicial de cada grupo e
+        # `count` a quantidade de valores válidos (não NaN). Retorna (quantis x grupos).
+        result = np.empty((len(q), len(starts)))
+        empty = count == 0
+        for idx, quantile in enumerate(q):
+            ranks = quantile * (count - 1)
+            lower = np.floor(ranks).astype(np.int64)
+            upper = np.ceil(ranks).astype(np.int64)
+            low = values[starts + np.where(empty, 0, lower)].astype(np.float64)
+            high = values[starts + np.where(empty, 0, upper)].astype(np.float64)
+            result[idx] = np.where(empty, np.nan, low + (high - low) * (ranks - lower))
+        return result
+
+    @staticmethod
+    def describe_grouped(
+        df: pd.DataFrame,
+        format: str,
+        freq: str | pd.Timedelta | None = None,
+        stats: list[str] | None = None,
+    ) -> pd.DataFrame:
+        # Estatísticas por `ds` (formato long) ou por coluna numérica (formato wide) e,
+        # se `freq` for informado (ex.: '1h', '1D', '7D'), por intervalo de tempo. Os
+        # grupos são identificados por uma chave inteira (código do `ds` e id do
+        # intervalo, como em TSResampler) e todas as estatísticas são calculadas numa
+        # única ordenação pela chave, com ufunc.reduceat, sem laço sobre os grupos.
+        # Quando há quartis a ordenação é por (chave, valor), o que dá os quartis de
+        # todos os grupos por indexação. O resultado tem uma linha por grupo não vazio:
+        # `ds`, o início do intervalo (com o nome da coluna de timestamp) e as
+        # estatísticas pedidas.
+        stats = list(TSStats.GROUPED_STATISTICS if stats is None else stats)
+        for stat in stats:
+            if stat not in TSStats.GROUPED_STATISTICS:
+                raise ValueError(f'Unknown statistic: {stat}')
+        timestamp = df[df.columns[0]]
+        if format == 'long':
+            ds = df['ds']
+            if isinstance(ds.dtype, pd.CategoricalDtype):
+                codes = ds.cat.codes.to_numpy().astype(np.int64)
+                categories = ds.cat.categories
+            else:
+                codes, categories = pd.factorize(ds, sort=True)
+            values = df['value'].to_numpy()
+            rows = len(df)
+        else:
+            # As colunas numéricas são concatenadas (sem DataFrame intermediário) e cada
+            # uma recebe o seu código, como um `ds`
+            categories = pd.Index(
+                [col for col in df.columns[1:] if df[col].dtype.kind in 'iuf']
+            )
+            rows = len(df)
+            values = np.concatenate([df[col].to_numpy() for col in categories])
+            codes = np.repeat(np.arange(len(categories), dtype=np.int64), rows)
+        if len(values) == 0:
+            raise Exception('A série temporal não possui dados numéricos')
+
+        keys = codes.astype(np.int64)
+        if freq is not None:
+            buckets, step, _ = TSResampler.bucket_ids(timestamp, freq)
+            first_bucket = buckets.min()
+            buckets = buckets - first_bucket
+            buckets_qty = int(buckets.max()) + 1
+            if format != 'long':
+                buckets = np.tile(buckets, len(categories))
+            keys = keys * buckets_qty + buckets
+        quartiles = [stat for stat in stats if stat in TSStats.QUARTILES]
+        order = TSStats.group_order(keys, values if len(quartiles) > 0 else None)
+        if order is not None:
+            keys, values = keys[order], values[order]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        group_keys = keys[starts]
+        lengths = np.diff(np.append(starts, len(keys)))
+
+        aggs = ['count'] + [s for s in stats if s in ['mean', 'std', 'min', 'max']]
+        reduced = TSResampler.reduce(values[np.newaxis, :], starts, aggs)
+        count = reduced['count'][0]
+        result: dict[str, Any] = {}
+        if freq is not None:
+            ds_codes = group_keys // buckets_qty
+            grid = group_keys % buckets_qty + first_bucket
+            result['ds'] = pd.Categorical.from_codes(ds_codes, categories=categories)
+            result[timestamp.name] = TSResampler.grid_timestamps(grid, step, timestamp)
+        else:
+            result['ds'] = pd.Categorical.from_codes(group_keys, categories=categories)
+        for stat in stats:
+            if stat == 'nan_count':
+                result[stat] = lengths - count
+            elif stat in TSStats.QUARTILES:
+                result[stat] = TSStats.group_quantiles(
+                    values, starts, count, [TSStats.QUARTILES[stat]]
+                )[0]
+            else:
+                result[stat] = reduced[stat][0]
+        logger.debug(
+            f'describe_grouped({freq}): {rows} linhas, {len(categories)} ds, '
+            + f'{len(starts)} grupos, estatísticas {stats}'
         )
-        self.summary_pt_br: pd.DataFrame = summary_pt_br
-        logger.info(f'summary_pt_br =\n{self.summary_pt_br}\n')
+        return pd.DataFrame(result, copy=False)
 
     def __str__(self) -> str:
         return str(self.summary_pt_br)
 
+    def __valid_values(self, column_name: str) -> np.ndarray:
+        # Valores não nulos e não NaN da coluna `column_name`
+        data = self._data
+        if isinstance(data, pa.Table):
+            column = data[column_name]
+            values = pc.drop_null(column)
+            if pa.types.is_floating(column.type):
+                values = pc.filter(values, pc.invert(pc.is_nan(values)))
+            return values.to_numpy()
+        return data[column_name].dropna().to_numpy()
+
+    def __compute(self, stat: str, column_name: str) -> None:
+        # Calcula `stat` (e as estatísticas que saem da mesma passada) e guarda no cache
+        data = self._data
+        cache = self._cache
+        if isinstance(data, (TSStreamStats, TSParquetStats)):
+            if stat not in TSStats.QUARTILES:
+                cache[(stat, column_name)] = getattr(data, stat)(column_name)
+            elif isinstance(data, TSStreamStats):
+                cache[(stat, column_name)] = np.nan
+            else:
+                self.__compute_quartiles(data.values(column_name), column_name)
+        elif stat == 'nan_count':
+            column = data[column_name]
+            if isinstance(column, pa.ChunkedArray):
+                nan_count = column.null_count
+                if pa.types.is_floating(column.type):
+                    nan_count += pc.sum(pc.is_nan(column)).as_py() or 0
+            else:
+                nan_count = column.isna().sum()
+            cache[(stat, column_name)] = nan_count
+        elif stat in ['min', 'max']:
+            if isinstance(data, pa.Table):
+                min_max = pc.min_max(pc.drop_null(data[column_name]))
+                minimum, maximum = min_max['min'].as_py(), min_max['max'].as_py()
+            else:
+                minimum, maximum = data[column_name].min(), data[column_name].max()
+            cache[('min', column_name)] = minimum
+            cache[('max', column_name)] = maximum
+        elif stat in TSStats.QUARTILES:
+            self.__compute_quartiles(self.__valid_values(column_name), column_name)
+        elif isinstance(data, pa.Table):
+            column = data[column_name]
+            if stat == 'count':
+                nan_count = 0
+                if pa.types.is_floating(column.type):
+                    nan_count = pc.sum(pc.is_nan(column)).as_py() or 0
+                cache[(stat, column_name)] = len(column) - column.null_count - nan_count
+            else:
+                values = pa.array(self.__valid_values(column_name)).cast(pa.float64())
+                if stat == 'mean':
+                    cache[(stat, column_name)] = pc.mean(values).as_py()
+                else:
+                    std = pc.stddev(values, ddof=1).as_py() if len(values) > 1 else None
+                    cache[(stat, column_name)] = np.nan if std is None else std
+        else:
+            cache[(stat, column_name)] = getattr(data[column_name], stat)()
+
+    def __compute_quartiles(self, values: np.ndarray, column_name: str) -> None:
+        quartiles = TSStats.quantiles(values, list(TSStats.QUARTILES.values()))
+        for key, value in zip(TSStats.QUARTILES, quartiles):
+            self._cache[(key, column_name)] = value
+
+    def __get(self, stat: str, column_name: str) -> float:
+        key = (stat, column_name)
+        if key not in self._cache:
+            self.__compute(stat, column_name)
+        value = self._cache[key]
+        return np.nan if value is None else float(value)
+
+    @staticmethod
+    def quantiles(values: np.ndarray, q: list[float]) -> list[float]:
+        # Quantis com interpolação linear (como np.quantile), mas com uma única chamada
+        # a np.partition() para todos os quantis pedidos, em vez de ordenar os valores
+        n = len(values)
+        if n == 0:
+            return [np.nan] * len(q)
+        ranks = np.asarray(q) * (n - 1)
+        lower = np.floor(ranks).astype(np.int64)
+        upper = np.ceil(ranks).astype(np.int64)
+        partitioned = np.partition(values, np.unique(np.concatenate((lower, upper))))
+        low = partitioned[lower].astype(np.float64)
+        high = partitioned[upper].astype(np.float64)
+        return (low + (high - low) * (ranks - lower)).tolist()
+
     # obtem a contagem de elementos na coluna `column_name`
     def count(self, column_name: str) -> float:
-        # Extraindo o valor da quantidade de elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['count', column_name])  # type: ignore
+        return self.__get('count', column_name)
+
+    # obtem a contagem de valores nulos/NaN na coluna `column_name`
+    def nan_count(self, column_name: str) -> int:
+        return int(self.__get('nan_count', column_name))
 
     # obtem a média dos elementos na coluna `column_name`
     def mean(self, column_name: str) -> float:
-        # Extraindo o valor da média dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['mean', column_name])  # type: ignore
+        return self.__get('mean', column_name)
 
     # obtem o desvio padrão dos elementos na coluna `column_name`
     def std(self, column_name: str) -> float:
-        # Extraindo o valor do desvio padrão dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['std', column_name])  # type: ignore
+        return self.__get('std', column_name)
 
     # obtem o valor mínimo dos elementos na coluna `column_name`
     def min(self, column_name: str) -> float:
-        # Extraindo o valor mínimo dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['min', column_name])  # type: ignore
+        return self.__get('min', column_name)
 
     # obtem o primeiro quartil dos elementos na coluna `column_name`
     def q1(self, column_name: str) -> float:
-        # Extraindo o valor do primeiro quartil dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['25%', column_name])  # type: ignore
+        return self.__get('25%', column_name)
 
     # obtem a mediana dos elementos na coluna `column_name`
     def median(self, column_name: str) -> float:
-        # Extraindo o valor da mediana dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['50%', column_name])  # type: ignore
+        return self.__get('50%', column_name)
 
     # obtem o segundo quartil dos elementos na coluna `column_name`
     def q2(self, column_name: str) -> float:
-        # Extraindo o valor do segundo quartil dos elementos na coluna `column_name`
         return self.median(column_name)
 
     # obtem o terceiro quartil dos elementos na coluna `column_name`
     def q3(self, column_name: str) -> float:
-        # Extraindo o valor do terceiro quartil dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['75%', column_name])  # type: ignore
+        return self.__get('75%', column_name)
 
     # obtem o valor máximo dos elementos na coluna `column_name`
     def max(self, column_name: str) -> float:
-        # Extraindo o valor máximo dos elementos na coluna `column_name`
-        return float(self.summary_en_us.loc['max', column_name])  # type: ignore
+        return self.__get('max', column_name)
 
     # obtem o valor da amplitude dos elementos na coluna `column_name`
     def amplitude(self, column_name: str) -> float:
-        # Extraindo o valor da amplitude dos elementos na coluna `column_name`
+        # O mínimo e o máximo vêm da mesma passada
         return self.max(column_name) - self.min(column_name)
@@ -3,16 +3,18 @@
 from __future__ import annotations
 
 import copy
+import time
 import types
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Protocol, Type, TypeVar
+from typing import Any, Callable, Optional, Protocol, Type, TypeVar
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import pyarrow as pa  # type: ignore
+import pyarrow.compute as pc  # type: ignore
 import pyarrow.parquet as pq  # type: ignore
 import yaml
 from pandas.core.series import Series
@@ -23,14 +25,27 @@ from sklearn.preprocessing import (  # type: ignore
     StandardScaler,
 )
 
+from t8s.cache import TSResultCache
+from t8s.join import TSJoiner
 from t8s.log_config import LogConfig
+from t8s.normalize import TSNormalizer
+from t8s.outliers import TSHampelFilter, TSOutliers
 from t8s.plot import TSPlotting
+from t8s.provenance import TSProvenance
+from t8s.resample import TSResampler
+from t8s.rolling import TSRolling
 from t8s.stats import TSStats
 
 # TODO: Esclarecer duvida coceitual sobre o conceito de feture em séries temporais multivariadas
 
 logger = LogConfig().get_logger()
 
+# O Copy-on-Write do Pandas é opcional e deve ser habilitado pela aplicação, com
+# pd.set_option('mode.copy_on_write', True). Com ele, TimeSerie.copy(), split() e as
+# transformações que não são inplace compartilham os buffers das colunas que não foram
+# alteradas com a série de origem, e uma coluna só é copiada quando for modificada. Sem
+# ele essas séries recebem cópias das colunas, como nas versões anteriores.
+
 TS = TypeVar('TS', bound='TimeSerie')
 
 # ts = pd.read_parquet('lixo.parquet', engine='pyarrow')
@@ -83,7 +98,12 @@ class ITimeSeriesProcessor(ABC):
 
     @staticmethod
     @abstractmethod
-    def join(list_of_ts: list['TimeSerie']) -> TimeSerie:
+    def join(
+        list_of_ts: list['TimeSerie'],
+        how: str = 'inner',
+        tolerance: pd.Timedelta | str | None = None,
+        direction: str = 'backward',
+    ) -> TimeSerie:
         pass
 
 
@@ -151,20 +171,54 @@ class TimeSerie(ITimeSerie):
     é simplesmente uma simplificação para facilitar a implementação.
     """
 
+    # Transformações aceitas por apply_transformation()
+    TRANSFORMATIONS = [
+        'normalize',
+        'denormalize',
+        'resample',
+        'rolling',
+        'between',
+        'add_nan_mask',
+    ]
+
     def __init__(self, *args, format, features_qty, **kwargs):
         assert isinstance(format, str), "format must be a string"
         assert isinstance(features_qty, int), "features_qty must be a int"
         assert format in ['long', 'wide'], "format must be 'long' or 'wide'"
         self.format: str = format
         self.features: str = str(features_qty)
+        # Quando a série é criada a partir de um pa.Table, a tabela Arrow é a fonte da
+        # verdade e o DataFrame só é materializado no primeiro acesso à propriedade `df`.
+        self._table: pa.Table | None = None
+        # Cache do resultado da verificação de ordenação da coluna de timestamp das
+        # séries Arrow, usado pelos métodos between() e at(). Ver
+        # __get_sorted_timestamps().
+        self._sorted_timestamps: tuple[Any, np.ndarray | None] | None = None
+        # Log de proveniência (ver TSProvenance)
+        self._provenance = TSProvenance()
+        # Cache dos resultados de apply_transformation(), desativado por padrão. Pode
+        # receber, por exemplo, TSResultCache() ou TSResultCache(spill_dir=Path(...)) e
+        # é herdado pelas séries derivadas por apply_transformation() e copy(); o mesmo
+        # cache pode ser atribuído a várias séries.
+        self.result_cache: TSResultCache | None = None
+        # Se True, apply_transformation() registra na proveniência os hashes do conteúdo
+        # de entrada e de saída mesmo sem cache (ver content_hash()). Também é herdado
+        # pelas séries derivadas.
+        self.hash_provenance: bool = False
+        # Arquivo de origem da série e o seu mtime (em ns), usados para invalidar o
+        # cache de resultados de apply_transformation() quando o arquivo é modificado.
+        self.source: tuple[str, int] | None = None
         self.df = pd.DataFrame()
         # scaler indica se dados já foram normalizados e qual foi a classe
-        # da implementação do scaler usado na normalização.
-        self.scaler: TransformerMixin | None = None
+        # da implementação do scaler usado na normalização. Na normalização por coluna
+        # é um dicionário coluna -> scaler.
+        self.scaler: TransformerMixin | dict[str, TransformerMixin] | None = None
         if len(args) > 0:
             for idx, arg in enumerate(args):
                 if idx == 0 and isinstance(arg, pd.DataFrame):
                     self.df = arg
+                if idx == 0 and isinstance(arg, pa.Table):
+                    self._table = arg
                 if idx == 0 and isinstance(arg, dict):
                     if 'content' in arg.keys() and arg['content'] == 'EMPTY':
                         return
@@ -174,6 +228,8 @@ class TimeSerie(ITimeSerie):
             for key, kwarg_value in kwargs.items():
                 if key == 'data' and isinstance(kwarg_value, pd.DataFrame):
                     self.df = kwarg_value
+                if key == 'data' and isinstance(kwarg_value, pa.Table):
+                    self._table = kwarg_value
                 if key == 'data' and isinstance(kwarg_value, dict):
                     self.df = pd.DataFrame(*args, **kwargs)
                 if (
@@ -184,6 +240,11 @@ class TimeSerie(ITimeSerie):
                     return
                 break  # Apenas o parâmetro 'data' precisa de tratamento especial.
 
+        if self._table is not None:
+            self.__check_arrow_table(self._table)
+            logger.debug('Objeto TimeSerie (Arrow) construido com sucesso')
+            return
+
         # TODO: garantir que a primeira coluna seja um Timestamp tanto para o formato long quanto wide
         # Por hora lanço Exception
         if self.df.empty:
@@ -208,6 +269,55 @@ class TimeSerie(ITimeSerie):
             )
         logger.debug('Objeto TimeSerie construido com sucesso')
 
+    @staticmethod
+    def __check_arrow_table(table: pa.Table) -> None:
+        # Mesmas verificações feitas para o DataFrame, mas sobre o schema Arrow,
+        # sem materializar os dados.
+        if table.num_rows == 0 or table.num_columns == 0:
+            raise Exception(
+                'Não foram fornecidos dados para criação da série temporal. Use o método TimeSerie.empty() se desejar criar uma série temporal vazia'
+            )
+        first_column_type = table.schema.field(0).type
+        if not pa.types.is_timestamp(first_column_type):
+            raise Exception(
+                'A primeira coluna deve ser um Timestamp.'
+                + ' Experado '
+                + 'timestamp[ns]'
+                + ', recebido '
+                + str(first_column_type)
+                + f'\nschema =\n{table.schema}\n'
+            )
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # Materializa o DataFrame a partir da tabela Arrow no primeiro acesso. A partir
+        # daí o DataFrame passa a ser a fonte da verdade, pois ele pode ser modificado
+        # pelo cliente, e a referência à tabela é liberada para não manter duas cópias.
+        if self._table is not None:
+            self._df = self._table.to_pandas()
+            self._table = None
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._df = value
+        self._table = None
+
+    def is_arrow_backed(self) -> bool:
+        # Indica se a série ainda é representada pela tabela Arrow (DataFrame não materializado)
+        return self._table is not None
+
+    def to_arrow(self) -> pa.Table:
+        # Retorna a série como pa.Table sem materializar o DataFrame quando possível
+        if self._table is not None:
+            return self._table
+        return pa.Table.from_pandas(self._df)
+
+    def get_column_names(self) -> list[str]:
+        if self._table is not None:
+            return list(self._table.column_names)
+        return list(self._df.columns)
+
     def __repr__(self):
         columns_types = [type(self.df[col][0]) for col in self.df.columns]
         # Retorna uma representação em string do objeto TimeSerie
@@ -217,15 +327,31 @@ class TimeSerie(ITimeSerie):
         )
 
     def copy(self):
-        # cria uma cópia profunda do DataFrame
-        df_copy = self.df.copy(deep=True)
-
         # clona o objeto TransformerMixin
         scaler_copy = copy.deepcopy(self.scaler)
 
-        # cria uma nova instância do objeto TimeSerie com as cópias profundas
+        if self._table is not None:
+            # pa.Table é imutável e pode ser compartilhada sem cópia
+            result = TimeSerie(
+                self._table, format=self.format, features_qty=int(self.features)
+            )
+            result.scaler = scaler_copy
+            result._provenance = self._provenance.copy()
+            result.source = self.source
+            result.result_cache = self.result_cache
+            result.hash_provenance = self.hash_provenance
+            return result
+
+        # Com Copy-on-Write a cópia compartilha os buffers das colunas
+        df_copy = self.df.copy(deep=not pd.options.mode.copy_on_write)
+
+        # cria uma nova instância do objeto TimeSerie com as cópias
         result = TimeSerie(df_copy, format=self.format, features_qty=int(self.features))
         result.scaler = scaler_copy
+        result._provenance = self._provenance.copy()
+        result.source = self.source
+        result.result_cache = self.result_cache
+        result.hash_provenance = self.hash_provenance
         return result
 
     def to_long(self):
@@ -234,13 +360,26 @@ class TimeSerie(ITimeSerie):
         # timestamp e as outras são as features. A série transformada "inplace" terá
         # 3 colunas: `timestamp`, `ds` e `value`, com `ds` sendo o nome ou id do `datasource`.
         # Em algumas situações `ds` pode ser o id do par `datasource/indicator`.
+        # A coluna `ds` é categórica (cada nome é armazenado uma única vez e as linhas
+        # guardam apenas um código inteiro) e `value` usa o menor dtype numérico comum às
+        # features. Ao gravar em Parquet, `ds` se torna uma coluna dictionary.
         assert self.format == 'wide', 'A série temporal deve estar no formato wide'
-        first_column_name = self.df.columns[0]
-        df_long_format = pd.melt(
-            self.df, id_vars=[first_column_name], var_name='ds', value_name='value'
-        )
-        # Ordena o DataFrame pela coluna 'timestamp' em ordem crescente
-        df_long_format.sort_values(by=['timestamp', 'ds'], inplace=True)
+        df_long_format = TimeSerie.__wide_to_long_without_sort(self.df)
+        if df_long_format is None:
+            first_column_name = self.df.columns[0]
+            df_long_format = pd.melt(
+                self.df, id_vars=[first_column_name], var_name='ds', value_name='value'
+            )
+            # Ordena o DataFrame pela coluna 'timestamp' em ordem crescente
+            df_long_format.sort_values(by=['timestamp', 'ds'], inplace=True)
+            df_long_format['ds'] = df_long_format['ds'].astype('category')
+            value_dtypes = [self.df[col].dtype for col in self.df.columns[1:]]
+            if all(dtype.kind in 'biuf' for dtype in value_dtypes):
+                # Mesmo dtype de `value` do caminho rápido (o melt converte bool e
+                # números para object)
+                df_long_format['value'] = df_long_format['value'].astype(
+                    np.result_type(*value_dtypes), copy=False
+                )
         # logger.debug(df_long_format)
         self.df = df_long_format
         self.format = 'long'
@@ -250,14 +389,132 @@ class TimeSerie(ITimeSerie):
     def to_wide(self) -> None:
         # Converte a série temporal para o formato Wide
         # Converte o DataFrame do formato long para o formato wide
-        df_wide_format = self.df.pivot(index='timestamp', columns='ds', values='value')
+        df_wide_format = TimeSerie.__long_to_wide_by_reshape(self.df)
+        if df_wide_format is None:
+            df_wide_format = self.df.pivot(
+                index='timestamp', columns='ds', values='value'
+            )
+            if isinstance(df_wide_format.columns, pd.CategoricalIndex):
+                # As colunas do formato wide são sempre um Index comum
+                df_wide_format.columns = pd.Index(
+                    list(df_wide_format.columns), name='ds'
+                )
         # logger.debug(f'Conversão para formato wide: \n{df_wide_format}')
         self.df = df_wide_format
         self.format = 'wide'
         # logger.debug('\n' + str(self))
 
+    @staticmethod
+    def __wide_to_long_without_sort(df: pd.DataFrame) -> pd.DataFrame | None:
+        # Caminho rápido do to_long() para séries wide regulares: timestamps estritamente
+        # crescentes, nomes de colunas do tipo str e valores numéricos. Nesse caso a ordem
+        # (timestamp, ds) é conhecida de antemão e o formato long é montado intercalando
+        # os buffers das colunas, sem melt e sem sort. O resultado é idêntico ao do
+        # caminho lento, inclusive o índice herdado do melt. Retorna None se a série não
+        # for regular.
+        timestamp_col = df.columns[0]
+        value_columns = list(df.columns[1:])
+        if len(value_columns) == 0 or not all(
+            isinstance(col, str) for col in value_columns
+        ):
+            return None
+        if not all(df[col].dtype.kind in 'iuf' for col in value_columns):
+            return None
+        timestamps = df[timestamp_col]
+        if not (timestamps.is_monotonic_increasing and timestamps.is_unique):
+            return None
+
+        rows = len(df)
+        # Posição (no melt) de cada coluna, na ordem alfabética usada pelo sort por `ds`
+        positions = sorted(range(len(value_columns)), key=lambda k: value_columns[k])
+        sorted_columns = [value_columns[k] for k in positions]
+        # Menor dtype capaz de representar todas as features (ex.: float32 e int16
+        # resultam em float32, float32 e int32 em float64)
+        value_dtype = np.result_type(*[df[col].dtype for col in value_columns])
+        values = np.empty((rows, len(value_columns)), dtype=value_dtype)
+        for idx, col in enumerate(sorted_columns):
+            values[:, idx] = df[col].to_numpy()
+        index = (
+            np.arange(rows)[:, np.newaxis] + rows * np.array(positions)[np.newaxis, :]
+        ).ravel()
+        ds_dtype = pd.CategoricalDtype(sorted_columns)
+        codes = np.tile(np.arange(len(sorted_columns)), rows)
+        ds = pd.Categorical.from_codes(codes, dtype=ds_dtype)
+        return pd.DataFrame(
+            {
+                timestamp_col: timestamps.array.take(
+                    np.repeat(np.arange(rows), len(value_columns))
+                ),
+                'ds': ds,
+                'value': values.ravel(),
+            },
+            index=index,
+        )
+
+    @staticmethod
+    def __long_to_wide_by_reshape(df: pd.DataFrame) -> pd.DataFrame | None:
+        # Caminho rápido do to_wide() para séries long já ordenadas por (timestamp, ds)
+        # e regulares, ou seja, em que cada timestamp tem exatamente os mesmos `ds`. Nesse
+        # caso o formato wide é apenas um reshape da coluna `value`, sem o hash de todas
+        # as linhas feito pelo pivot. Retorna None se a série não atender a essas condições.
+        if len(df) == 0:
+            return None
+        timestamps = df['timestamp'].to_numpy()
+        if isinstance(df['ds'].dtype, pd.CategoricalDtype):
+            # `ds` categórico: as comparações são feitas sobre os códigos inteiros
+            ds = df['ds'].array.codes  # type: ignore
+            labels = np.asarray(df['ds'].array.categories, dtype=object)  # type: ignore
+        else:
+            ds = df['ds'].to_numpy()
+            labels = None
+        changes = np.flatnonzero(timestamps != timestamps[0])
+        ds_qty = int(changes[0]) if len(changes) > 0 else len(df)
+        if len(df) % ds_qty != 0:
+            return None
+        keys = ds[:ds_qty]
+        if labels is not None and (keys < 0).any():
+            return None
+        columns = keys if labels is None else labels[keys]
+        if not all(isinstance(col, str) for col in columns):
+            return None
+        if ds_qty > 1 and not (columns[1:] > columns[:-1]).all():
+            return None
+        rows = len(df) // ds_qty
+        ds_matrix = ds.reshape(rows, ds_qty)
+        timestamps_matrix = timestamps.reshape(rows, ds_qty)
+        if not (ds_matrix == keys).all():
+            return None
+        if not (timestamps_matrix == timestamps_matrix[:, :1]).all():
+            return None
+        index_values = timestamps_matrix[:, 0]
+        if rows > 1 and not (index_values[1:] > index_values[:-1]).all():
+            return None
+        index = pd.Index(df['timestamp'].array[::ds_qty], name='timestamp')
+        return pd.DataFrame(
+            df['value'].to_numpy().reshape(rows, ds_qty),
+            index=index,
+            columns=pd.Index(columns, name='ds'),
+        )
+
+    def __count_distinct_ds(self) -> int:
+        if self._table is not None:
+            column = self._table['ds']
+            if pa.types.is_dictionary(column.type):
+                # Conta os códigos distintos, após unificar os dicionários dos chunks
+                column = column.unify_dictionaries()
+                column = pa.chunked_array(
+                    [chunk.indices for chunk in column.chunks],
+                    type=column.type.index_type,
+                )
+            return pc.count_distinct(column).as_py()
+        return self.df['ds'].unique().size
+
     def is_univariate(self) -> bool:
         # Verifica se a série temporal é univariada
+        if self._table is not None:
+            if self.format == 'long':
+                return self.__count_distinct_ds() == 1
+            return self._table.num_columns == 2
         if self.format == 'long':
             # Obtém os valores distintos da coluna 'ds'
             distinct_ds_values = self.df['ds'].unique()
@@ -268,6 +525,10 @@ class TimeSerie(ITimeSerie):
 
     def is_multivariate(self):
         # Verifica se a série temporal é multivariada
+        if self._table is not None:
+            if self.format == 'long':
+                return self.__count_distinct_ds() > 1
+            return self._table.num_columns > 2
         if self.format == 'long':
             # Obtém os valores distintos da coluna 'ds'
             distinct_ds_values = self.df['ds'].unique()
@@ -283,20 +544,27 @@ class TimeSerie(ITimeSerie):
         # As séries temporais univariadas estão sempre no formato wide
         result = []
         if self.format == 'long':
-            # TODO: Implementar para o caso de formato longo.
-            pass
+            result = self.__split_long()
+        elif self.format == 'wide' and self._table is not None:
+            # As colunas Arrow são apenas referenciadas, sem cópia dos buffers
+            timestamp_col = self._table.column_names[0]
+            for col in self._table.column_names[1:]:
+                my_table = self._table.select([timestamp_col, col])
+                result.append(TimeSerie(my_table, format='wide', features_qty=2))
         elif self.format == 'wide':
             # Por contrato a primeira coluna é sempre o timestamp
-            timestamp_col = self.df.columns[0]
-            for idx, col in enumerate(self.df.columns):
-                if idx == 0:
-                    continue
-                my_df = self.df[[timestamp_col, col]]
+            # Com Copy-on-Write as séries univariadas referenciam as colunas da série
+            # original (timestamp compartilhado e uma visão da feature), sem cópia, e uma
+            # coluna só é copiada se for modificada.
+            timestamp = self.df[self.df.columns[0]]
+            shared = pd.options.mode.copy_on_write
+            for col in self.df.columns[1:]:
+                my_df = pd.DataFrame(
+                    {timestamp.name: timestamp, col: self.df[col]}, copy=not shared
+                )
                 # Criaando um novo objeto TimeSerie
-                my_ts = TimeSerie(data=my_df, format='wide', features_qty=2)
-                logger.debug('---------------------------------------------------')
-                logger.debug(f'univariate {idx}' + '\n ' + str(my_df))
-                result.append(my_ts)
+                result.append(TimeSerie(data=my_df, format='wide', features_qty=2))
+            logger.debug(f'split: {len(result)} séries univariadas')
         else:
             raise Exception('Formato de série temporal não suportado')
 
@@ -307,8 +575,41 @@ class TimeSerie(ITimeSerie):
 
         return result
 
+    def __split_long(self) -> list[TimeSerie]:
+        # Separa a série long por `ds` numa única passada de agrupamento: os códigos de
+        # `ds` são ordenados de forma estável (radix sort para até 2^15 datasources) e as
+        # linhas são reordenadas uma única vez. Cada datasource passa a ocupar um bloco
+        # contíguo e as séries univariadas (formato wide) são fatias desse bloco.
+        timestamp_col = self.df.columns[0]
+        codes, ds_values = pd.factorize(self.df['ds'], sort=True)
+        codes_dtype = np.int16 if len(ds_values) <= np.iinfo(np.int16).max else np.int64
+        order = np.argsort(codes.astype(codes_dtype), kind='stable')
+        # Códigos -1 correspondem a `ds` nulos e ficam no início da ordenação
+        counts = np.bincount(codes[codes >= 0], minlength=len(ds_values))
+        offset = len(codes) - int(counts.sum())
+        timestamps = self.df[timestamp_col].array.take(order)
+        values = self.df['value'].to_numpy().take(order)
+        result = []
+        for ds, count in zip(ds_values, counts):
+            my_df = pd.DataFrame(
+                {
+                    timestamp_col: timestamps[offset : offset + count],
+                    ds: values[offset : offset + count],
+                },
+                copy=False,
+            )
+            result.append(TimeSerie(data=my_df, format='wide', features_qty=2))
+            offset += count
+        return result
+
     def get_numeric_column_names(self) -> list:
         ret: list = []
+        if self._table is not None:
+            for field in self._table.schema:
+                if field.type in [pa.float64(), pa.int64(), pa.float32(), pa.int32()]:
+                    ret.append(field.name)
+            ret.sort()
+            return ret
         for idx, c in enumerate(self.df.columns):
             if (
                 self.df[c].dtype == float
@@ -324,26 +625,46 @@ class TimeSerie(ITimeSerie):
 
     def normalize(
         self,
-        scaler: TransformerMixin,
+        scaler: (
+            TransformerMixin
+            | dict[str, TransformerMixin]
+            | Callable[[], TransformerMixin]
+        ),
         numeric_columns: list[str] | None = None,
         inplace: bool = False,
+        max_workers: int | None = None,
     ) -> TimeSerie:
+        # `scaler` pode ser um scaler do scikit-learn, ajustado sobre todas as colunas,
+        # ou, para a normalização por coluna, um dicionário coluna -> scaler ou uma
+        # fábrica de scalers (ex.: MinMaxScaler). Neste caso cada coluna recebe o seu
+        # scaler, as colunas são processadas em paralelo (até `max_workers` threads) e
+        # `self.scaler` passa a ser o dicionário coluna -> scaler ajustado.
         column_list: list[str] = []
-        if numeric_columns is None:
-            column_list = self.get_numeric_column_names()
-        else:
+        if numeric_columns is not None:
             column_list = numeric_columns
+        elif isinstance(scaler, dict):
+            column_list = list(scaler)
+        else:
+            column_list = self.get_numeric_column_names()
         logger.info(f'columns -> {self.df.columns} -> column_list: {column_list}')
         if len(column_list) == 0:
             # TODO: escolher uma Exception mais adequada, tipo InvalidStateError
             raise Exception('Não há colunas numéricas para normalizar')
 
-        df_norm = self.df.copy(deep=True)
-
-        df_norm[column_list] = pd.DataFrame(scaler.fit_transform(self.df[column_list]))
-        # Restaura a coluna timestamp
-        timestamp_col = self.df.columns[0]
-        df_norm[timestamp_col] = self.df[timestamp_col]
+        # Apenas as colunas normalizadas são substituídas, as demais são compartilhadas
+        # (inplace ou com Copy-on-Write) ou copiadas. O ajuste e a transformação são
+        # feitos por TSNormalizer sem DataFrames intermediários, mantendo o dtype
+        # (float32 continua float32) e o índice.
+        copy_columns = not inplace and not pd.options.mode.copy_on_write
+        if isinstance(scaler, dict) or callable(scaler):
+            scaler = TSNormalizer.scalers_for(scaler, column_list)
+            df_norm = TSNormalizer.normalize_columns(
+                self.df, scaler, max_workers=max_workers, copy=copy_columns
+            )
+        else:
+            df_norm = TSNormalizer.normalize_frame(
+                self.df, scaler, column_list, copy=copy_columns
+            )
         # Trata o parâmetro inplace para o caso de imutabilidade.
         if inplace:
             self.df = df_norm
@@ -361,33 +682,284 @@ class TimeSerie(ITimeSerie):
             )
             return ret
 
-    def denormalize(self, inplace: bool = False) -> TimeSerie | None:
-        def denormalize_row():
-            if isinstance(self.scaler, MinMaxScaler):
-                return lambda x: (x + 1) / 2 * (self.scaler.data_max_ - self.scaler.data_min_) + self.scaler.data_min_  # type: ignore
-            elif isinstance(self.scaler, RobustScaler):
-                return lambda x: (x * self.scaler.scale_) + self.scaler.center_  # type: ignore
-            else:
-                raise ValueError('Unsupported scaler')
-
+    def get_normalized_column_names(self) -> list[str]:
+        # Retorna as colunas que foram normalizadas pelo scaler armazenado. O scikit-learn
+        # registra em `feature_names_in_` as colunas usadas no fit quando ele recebe um
+        # DataFrame, o que permite reverter normalizações feitas em apenas algumas colunas.
+        if self.scaler is None:
+            return []
+        if isinstance(self.scaler, dict):
+            return list(self.scaler)
+        feature_names = getattr(self.scaler, 'feature_names_in_', None)
+        if feature_names is not None:
+            return [str(name) for name in feature_names]
+        return self.get_numeric_column_names()
+
+    def denormalize(self, inplace: bool = False) -> TimeSerie:
         # Reverte a normalização de um conjunto de valores. Observe que podem haver diferenças de arredondamento
         # entre os valores originais e os valores revertidos devido a questões intrinsecas do formato float.
         # Considere epsilon = 1e-6 para valores float32 e epsilon = 1e-8 para valores float64
-        numeric_columns = self.get_numeric_column_names()
-        for idx, row in self.df.iterrows():
-            row_numeric_values: pd.Series = row[numeric_columns]
-            row_denormalized = denormalize_row()(row_numeric_values)
-            logger.info('-----------------------------------------------------')
-            logger.info(f'idx = {idx}, row =\n{row}')
-            logger.info(f'row[numeric_columns] =\n{row[numeric_columns]}')
-            logger.info(
-                f'denormalize(scaler)(row[numeric_columns]) = {row_denormalized}'
+        if self.scaler is None:
+            # TODO: escolher uma Exception mais adequada, tipo InvalidStateError
+            raise Exception('A série temporal não está normalizada')
+        scalers = (
+            self.scaler.values() if isinstance(self.scaler, dict) else [self.scaler]
+        )
+        for scaler in scalers:
+            if not hasattr(scaler, 'inverse_transform'):
+                raise ValueError(f'Unsupported scaler: {type(scaler)}')
+
+        column_list = self.get_normalized_column_names()
+        # A inversão é feita por TSNormalizer, coluna a coluna para scalers afins, no
+        # dtype das colunas normalizadas.
+        copy_columns = not inplace and not pd.options.mode.copy_on_write
+        if isinstance(self.scaler, dict):
+            df_denorm = TSNormalizer.normalize_columns(
+                self.df, self.scaler, fit=False, inverse=True, copy=copy_columns
+            )
+        else:
+            df_denorm = TSNormalizer.normalize_frame(
+                self.df,
+                self.scaler,
+                column_list,
+                fit=False,
+                inverse=True,
+                copy=copy_columns,
+            )
+        logger.info(
+            f'Time Serie denormalized -> scaler type: {type(self.scaler)} -> columns: {column_list}'
+        )
+        if inplace:
+            self.df = df_denorm
+            self.scaler = None
+            return self
+        return TimeSerie(
+            data=df_denorm, format=self.format, features_qty=int(self.features)
+        )
+
+    def __get_sorted_timestamps(self) -> np.ndarray | None:
+        # Retorna os timestamps como int64 se a coluna de timestamp estiver ordenada de
+        # forma crescente, ou None caso contrário. A verificação é uma única passada
+        # vetorizada, O(n). O resultado fica em cache apenas para as séries Arrow, que
+        # são imutáveis: o DataFrame pode ser modificado inplace (ts.df.loc[...] = ...)
+        # sem que a série seja avisada, e por isso a sua coluna é verificada a cada vez.
+        if self._table is None:
+            values = self.df[self.df.columns[0]].array.asi8  # type: ignore
+            return TimeSerie.__sorted_or_none(values)
+        cache_key = id(self._table)
+        if self._sorted_timestamps is None or self._sorted_timestamps[0] != cache_key:
+            values = pc.cast(self._table.column(0), pa.int64()).to_numpy()
+            self._sorted_timestamps = (cache_key, TimeSerie.__sorted_or_none(values))
+        return self._sorted_timestamps[1]
+
+    @staticmethod
+    def __sorted_or_none(values: np.ndarray) -> np.ndarray | None:
+        return values if len(values) < 2 or (values[1:] >= values[:-1]).all() else None
+
+    def __as_timestamp_value(self, value: Any) -> int:
+        # Converte `value` para o inteiro usado na representação int64 da coluna de tempo
+        if self._table is not None:
+            column_type = self._table.schema.field(0).type
+            unit, tz = column_type.unit, column_type.tz
+        else:
+            dtype = self.df[self.df.columns[0]].dtype
+            if isinstance(dtype, pd.DatetimeTZDtype):
+                unit, tz = dtype.unit, str(dtype.tz)
+            else:
+                unit, tz = np.datetime_data(dtype)[0], None
+        timestamp = pd.Timestamp(value)
+        if tz is not None:
+            timestamp = (
+                timestamp.tz_localize(tz)
+                if timestamp.tz is None
+                else timestamp.tz_convert(tz)
+            )
+        elif timestamp.tz is not None:
+            raise TypeError('Cannot compare tz-naive and tz-aware timestamps')
+        return int(
+            np.datetime64(timestamp.value, 'ns').astype(f'M8[{unit}]').astype(np.int64)
+        )
+
+    def __rows(self, start: int, stop: int) -> TimeSerie:
+        # Fatia de linhas sem cópia (pa.Table.slice ou iloc com Copy-on-Write)
+        if stop <= start:
+            return TimeSerie.empty()
+        if self._table is not None:
+            data: pd.DataFrame | pa.Table = self._table.slice(start, stop - start)
+        else:
+            data = self.df.iloc[start:stop]
+            if not pd.options.mode.copy_on_write:
+                data = data.copy()
+        result = TimeSerie(data, format=self.format, features_qty=int(self.features))
+        result.scaler = self.scaler
+        return result
+
+    def between(self, start: Any, end: Any, inclusive: str = 'both') -> TimeSerie:
+        # Seleciona a janela de tempo [start, end]. O parâmetro `inclusive` ('both',
+        # 'neither', 'left' ou 'right') segue a semântica de pd.Series.between. Se a coluna
+        # de timestamp estiver ordenada, os limites são localizados por busca binária e o
+        # resultado é uma fatia sem cópia da série. Caso contrário é aplicada uma máscara
+        # booleana. Se não houver linhas na janela é retornado TimeSerie.empty().
+        assert inclusive in [
+            'both',
+            'neither',
+            'left',
+            'right',
+        ], "inclusive must be 'both', 'neither', 'left' or 'right'"
+        start_value = self.__as_timestamp_value(start)
+        end_value = self.__as_timestamp_value(end)
+        keys = self.__get_sorted_timestamps()
+        if keys is not None:
+            left_side = 'left' if inclusive in ['both', 'left'] else 'right'
+            right_side = 'right' if inclusive in ['both', 'right'] else 'left'
+            first = int(np.searchsorted(keys, start_value, side=left_side))
+            last = int(np.searchsorted(keys, end_value, side=right_side))
+            return self.__rows(first, last)
+
+        timestamps = self.df[self.df.columns[0]]
+        mask = timestamps.between(
+            pd.Timestamp(start), pd.Timestamp(end), inclusive=inclusive  # type: ignore
+        )
+        if not mask.any():
+            return TimeSerie.empty()
+        result = TimeSerie(
+            self.df[mask], format=self.format, features_qty=int(self.features)
+        )
+        result.scaler = self.scaler
+        return result
+
+    def at(self, timestamp: Any) -> TimeSerie:
+        # Seleciona as linhas com o timestamp informado (no formato long há uma linha por
+        # `ds`). Lança KeyError se o timestamp não existir na série.
+        result = self.between(timestamp, timestamp)
+        if result.df.empty:
+            raise KeyError(f'Timestamp {timestamp} não encontrado na série temporal')
+        return result
+
+    def resample(
+        self,
+        freq: str | pd.Timedelta,
+        aggs: list[str] | None = None,
+    ) -> TimeSerie:
+        # Reamostra a série para uma grade regular de frequência `freq` (ex.: '1min'),
+        # calculando todas as agregações de `aggs` (ver TSResampler.AGGREGATIONS; por
+        # padrão TSResampler.DEFAULT_AGGREGATIONS) para todas as colunas numéricas numa
+        # única passada. No formato wide as colunas do resultado se chamam
+        # `<coluna>_<agregação>` e no formato long a reamostragem é feita por `ds` e o
+        # `ds` do resultado é `<ds>_<agregação>`. Com uma única agregação os nomes
+        # originais são mantidos.
+        if aggs is None:
+            aggs = TSResampler.DEFAULT_AGGREGATIONS
+        if self.format == 'long':
+            df_resampled = TSResampler.resample_long(self.df, freq, list(aggs))
+            features_qty = 1 + int(df_resampled['ds'].nunique())
+        else:
+            df_resampled = TSResampler.resample_wide(self.df, freq, list(aggs))
+            features_qty = df_resampled.columns.size
+        return TimeSerie(df_resampled, format=self.format, features_qty=features_qty)
+
+    def rolling(
+        self,
+        window: str | pd.Timedelta,
+        stats: list[str] | None = None,
+        quantiles: list[float] | None = None,
+        min_periods: int = 1,
+    ) -> TimeSerie:
+        # Calcula estatísticas em janelas móveis de tempo `window` (ex.: '5min') para
+        # todas as colunas numéricas de uma só vez (ver TSRolling.STATISTICS; por padrão
+        # TSRolling.DEFAULT_STATISTICS). Os quantis são informados em `quantiles` (ex.:
+        # [0.05, 0.95]) e chamados `q<quantil>` no resultado. Os nomes das colunas
+        # (wide) ou dos `ds` (long) do resultado seguem o mesmo padrão do resample():
+        # `<nome>_<estatística>`. Colunas float32 continuam float32 e a operação é
+        # registrada na proveniência da nova série.
+        start = time.perf_counter()
+        if stats is None:
+            stats = TSRolling.DEFAULT_STATISTICS
+        if quantiles is None:
+            quantiles = []
+        if self.format == 'long':
+            df_rolling = TSRolling.rolling_long(
+                self.df, window, list(stats), list(quantiles), min_periods
+            )
+            features_qty = 1 + int(df_rolling['ds'].nunique())
+        else:
+            df_rolling = TSRolling.rolling_wide(
+                self.df, window, list(stats), list(quantiles), min_periods
             )
+            features_qty = df_rolling.columns.size
+        result = TimeSerie(df_rolling, format=self.format, features_qty=features_qty)
+        result._provenance = self._provenance.copy()
+        result.add_provenance(
+            'rolling',
+            {
+                'window': str(pd.Timedelta(window)),
+                'stats': list(stats),
+                'quantiles': list(quantiles),
+                'min_periods': min_periods,
+            },
+            duration=time.perf_counter() - start,
+        )
+        return result
 
     def get_statistics(self) -> TSStats:
+        if self._table is not None:
+            return TSStats(self._table)
         result = TSStats(self.df)
         return result
 
+    def get_grouped_statistics(
+        self, freq: str | pd.Timedelta | None = None, stats: list[str] | None = None
+    ) -> pd.DataFrame:
+        # Estatísticas por `ds` (long) ou por coluna (wide) e, se `freq` for informado
+        # (ex.: '1h', '1D', '7D'), por intervalo de tempo, numa tabela com uma linha por
+        # grupo (ver TSStats.describe_grouped e TSStats.GROUPED_STATISTICS)
+        return TSStats.describe_grouped(self.df, self.format, freq, stats)
+
+    def detect_outliers(
+        self,
+        methods: str | list[str] = 'zscore',
+        threshold: float | dict[str, float] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        # Máscara booleana de outliers, com o mesmo índice da série, para os métodos
+        # 'zscore', 'iqr' e 'mad' (ver TSOutliers). `threshold` é um limiar para todos os
+        # métodos ou um dicionário método -> limiar (os demais usam o padrão de
+        # TSOutliers.THRESHOLDS). No formato wide há uma coluna por coluna numérica (ou
+        # por coluna de `columns`) e no formato long a coluna `value`, avaliada por `ds`.
+        # Com mais de um método as colunas se chamam `<coluna>_<método>`.
+        methods = [methods] if isinstance(methods, str) else list(methods)
+        if self.format == 'long':
+            return TSOutliers.detect_long(self.df, methods, threshold)
+        return TSOutliers.detect_wide(self.df, methods, threshold, columns)
+
+    def hampel(
+        self,
+        window: int,
+        n_sigmas: float = 3.0,
+        mode: str = 'flag',
+        min_periods: int | None = None,
+    ) -> pd.DataFrame | TimeSerie:
+        # Filtro de Hampel sobre as últimas `window` amostras de cada coluna numérica
+        # (wide) ou de cada `ds` (long), ver TSHampelFilter. No modo 'flag' retorna a
+        # máscara de outliers e no modo 'replace' uma nova série com os outliers
+        # substituídos pela mediana da janela, registrando a operação na proveniência.
+        # Para séries lidas em blocos use TSHampelFilter.process() em cada bloco.
+        start = time.perf_counter()
+        hampel = TSHampelFilter(window, n_sigmas, mode, min_periods)
+        result = hampel.process(self)
+        if mode == 'replace':
+            result._provenance = self._provenance.copy()
+            result.add_provenance(
+                'hampel',
+                {
+                    'window': window,
+                    'n_sigmas': n_sigmas,
+                    'min_periods': hampel.min_periods,
+                },
+                duration=time.perf_counter() - start,
+            )
+        return result
+
     """
     Neste método adicionanos uma feature que contém os valores NaN da série temporal corrigidos,
     segundo uma interpolação especificada pelo parâmetro `method`. O método retorna um novo objeto
@@ -407,7 +979,7 @@ class TimeSerie(ITimeSerie):
         if inplace:
             df_interpolated = self.df
         else:
-            df_interpolated = self.df.copy()
+            df_interpolated = self.df.copy(deep=not pd.options.mode.copy_on_write)
 
         time_column = self.df.columns[0]
         feature_column = self.df.columns[1]
@@ -459,9 +1031,24 @@ class TimeSerie(ITimeSerie):
         return TSPlotting(self)
 
     @staticmethod
-    def join(list_of_ts: list['TimeSerie']) -> 'TimeSerie':
+    def join(
+        list_of_ts: list['TimeSerie'],
+        how: str = 'inner',
+        tolerance: pd.Timedelta | str | None = None,
+        direction: str = 'backward',
+    ) -> 'TimeSerie':
+        # O parâmetro `how` define a semântica da junção: 'inner' (apenas timestamps
+        # presentes em todas as séries), 'outer' (união dos timestamps), 'left'
+        # (timestamps da primeira série) ou 'asof'. No modo 'asof' as séries são alinhadas
+        # ao relógio de referência (timestamps da primeira série) usando, de cada série, a
+        # amostra anterior ('backward'), posterior ('forward') ou mais próxima ('nearest')
+        # conforme `direction`, desde que dentro da `tolerance` (ex.: '500ms').
         if len(list_of_ts) == 0:
             raise Exception('A lista de séries temporais não pode estar vazia')
+        if how not in TSJoiner.HOW + ['asof']:
+            raise ValueError(f'Unknown join type: {how}')
+        if how == 'asof':
+            return TimeSerie.__join_asof(list_of_ts, tolerance, direction)
 
         multivariate_ts = list_of_ts[0]
         multivariate_df = multivariate_ts.df
@@ -485,7 +1072,15 @@ class TimeSerie(ITimeSerie):
             #     (list_of_ts[0].df).set_index(timestamp_column_name, inplace=True)
             return list_of_ts[0]
 
-        # Junta os dataframes em uma série temporal multivariada
+        # Junta os dataframes em uma série temporal multivariada, alinhando todas as
+        # séries numa única passada (merge k-way) sobre os timestamps ordenados.
+        merged_df = TSJoiner.k_way_merge([ts.df for ts in list_of_ts], how)
+        if merged_df is not None:
+            return TimeSerie(
+                format='wide', features_qty=merged_df.columns.size, data=merged_df
+            )
+
+        # Caso geral (timestamps repetidos, colunas homônimas, etc.): pd.merge encadeado
         if not isinstance(multivariate_df[timestamp_column_name][0], datetime):
             # Se a coluna timestamp não for do tipo datetime, converter para datetime.
             # Alternativamente podemeos usar o método astype(datetime) que faz o cast.
@@ -500,7 +1095,7 @@ class TimeSerie(ITimeSerie):
                 # Se a coluna timestamp não for do tipo datetime, converter para datetime
                 ts.df['timestamp'] = pd.to_datetime(ts.df['timestamp'])
                 # Faz o merge dos dois Datasets, sobre a coluna timestamp
-            multivariate_df = pd.merge(multivariate_df, ts.df, on='timestamp')
+            multivariate_df = pd.merge(multivariate_df, ts.df, on='timestamp', how=how)
 
         # Ao final crio a série temporal multivariada usando a lista de univariadas
         features_qty = multivariate_df.columns.size
@@ -519,6 +1114,34 @@ class TimeSerie(ITimeSerie):
         logger.debug(multivariate_ts)
         return multivariate_ts
 
+    @staticmethod
+    def __join_asof(
+        list_of_ts: list['TimeSerie'],
+        tolerance: pd.Timedelta | str | None,
+        direction: str,
+    ) -> 'TimeSerie':
+        dfs = [ts.df for ts in list_of_ts]
+        merged_df = TSJoiner.asof_merge(dfs, direction, tolerance)
+        if merged_df is None:
+            # Caso geral: pd.merge_asof encadeado, que exige todas as séries ordenadas,
+            # inclusive a primeira
+            timestamp_column_name = dfs[0].columns[0]
+            merged_df = dfs[0].sort_values(
+                by=timestamp_column_name, kind='stable', ignore_index=True
+            )
+            for df in dfs[1:]:
+                merged_df = pd.merge_asof(
+                    merged_df,
+                    df.sort_values(by=df.columns[0]),
+                    left_on=timestamp_column_name,
+                    right_on=df.columns[0],
+                    tolerance=None if tolerance is None else pd.Timedelta(tolerance),
+                    direction=direction,
+                )
+        return TimeSerie(
+            format='wide', features_qty=merged_df.columns.size, data=merged_df
+        )
+
     """
     Este método cria uma máscara para os valores nulos de uma série temporal univariada.
     Ela é construida de tal forma que se multimplicada pela série temporal corrigida com
@@ -528,47 +1151,73 @@ class TimeSerie(ITimeSerie):
 
     @staticmethod
     def build_mask_serie(s: pd.Series) -> pd.Series:
-        mask = np.full(len(s), 1.0)
-        print(f'len(s) = {len(s)}, len(mask) = {len(mask)}')
-        previus = s[0]
-        for idx, v in enumerate(mask):
-            value = s[idx]
-            if not np.isnan(value):  # operador == não funciona com NaN
-                mask[idx] = np.nan
-            if idx < len(mask) - 2 and np.isnan(s[idx + 1]):
-                mask[idx] = 1.0
-            if idx > 0 and not np.isnan(value) and np.isnan(previus):
-                mask[idx] = 1.0
-            previus = value
-
-        print(f'mask = {mask}')
-        print(f's    = {s.to_numpy()}')
+        # A máscara é construída de forma vetorizada sobre arrays booleanos deslocados,
+        # sem percorrer a série elemento a elemento. As regras são:
+        # - posições NaN valem 1.0 e posições com valor valem NaN;
+        # - a posição imediatamente anterior a um NaN vale 1.0 (exceto as duas últimas
+        #   posições da série, preservando o comportamento da implementação original);
+        # - a primeira posição com valor após um bloco de NaNs vale 1.0.
+        # Assim o bloco imputado fica "ancorado" nos valores vizinhos ao ser desenhado.
+        is_nan: np.ndarray = s.isna().to_numpy()
+        size = len(is_nan)
+        mask = np.where(is_nan, 1.0, np.nan)
+        if size > 1:
+            next_is_nan = np.zeros(size, dtype=bool)
+            next_is_nan[: size - 2] = is_nan[1 : size - 1]
+            previous_is_nan = np.zeros(size, dtype=bool)
+            previous_is_nan[1:] = is_nan[:-1]
+            mask[next_is_nan | (previous_is_nan & ~is_nan)] = 1.0
         return pd.Series(mask)
 
     ### ----------------------------- Métodos de IProvenanceable ----------------------------------
 
-    def add_provenance(self, transformation: str, parameters: dict):
+    def add_provenance(
+        self,
+        transformation: str,
+        parameters: dict,
+        input_hash: str | None = None,
+        output_hash: str | None = None,
+        duration: float | None = None,
+        rows: int | None = None,
+    ) -> str:
         # Este método adiciona informações de proveniência ao objeto TimeSerie para
         # uma transformação específica. Ele recebe como parâmetros o nome da transformação
-        # e um dicionário com os parâmetros usados na transformação.
-        # TODO: Implementar add_provenance()
-        pass
+        # e um dicionário com os parâmetros usados na transformação. Opcionalmente recebe
+        # os hashes do conteúdo da entrada e da saída, a duração (em segundos) e o número
+        # de linhas produzidas (por padrão, as linhas da série). Retorna a chave do passo.
+        if rows is None:
+            rows = self._table.num_rows if self._table is not None else len(self._df)
+        return self._provenance.record(
+            transformation, parameters, input_hash, output_hash, duration, rows
+        )
 
     def get_provenances(self) -> list[dict[str, Any]]:
         # Este método retorna uma lista de dicionários com as informações de
-        # proveniência de todas as transformações realizadas no objeto TimeSerie.
-        # TODO: Implementar get_provenances()
-        return []
+        # proveniência de todas as transformações realizadas no objeto TimeSerie,
+        # da mais antiga para a mais recente.
+        return list(self._provenance)
 
     def get_provenance_by_transformation(self, transformation: str) -> dict[str, Any]:
-        # Este método retorna as informações de proveniência de uma dada transformação
-        # realizadas no objeto TimeSerie.
-        # TODO: Implementar get_provenance_by_transformation()
-        return {}
-
-    def get_last_transformation(self, transformation: str) -> dict[str, Any]:
-        # TODO: Implementar get_provenance_by_transformation()
-        return {}
+        # Este método retorna as informações de proveniência da execução mais recente de
+        # uma dada transformação realizada no objeto TimeSerie ({} se não houver).
+        return self._provenance.last(transformation)
+
+    def get_last_transformation(
+        self, transformation: str | None = None
+    ) -> dict[str, Any]:
+        # Retorna a última transformação realizada. Se `transformation` for informada,
+        # retorna {} quando a última transformação tiver sido outra.
+        last = self._provenance.last()
+        if transformation is not None and last.get('transformation') != transformation:
+            return {}
+        return last
+
+    def content_hash(self) -> str:
+        # Hash do conteúdo da série (ver TSProvenance.content_hash), calculado sobre os
+        # bytes das colunas a cada chamada: o DataFrame pode ser modificado inplace
+        # (ts.df.loc[...] = ...) sem que a série seja avisada.
+        data = self._table if self._table is not None else self._df
+        return TSProvenance.content_hash(data)
 
     def apply_transformation(
         self, transformation: str, **kwargs
@@ -577,8 +1226,66 @@ class TimeSerie(ITimeSerie):
         objeto TimeSerie com as informações de proveniência atualizadas. Ele recebe como
         parâmetros o nome da transformação e os parâmetros específicos da transformação.
         """
-        # TODO: Implementar apply_transformation()
-        return TimeSerie.empty()
+        # O passo é identificado pelo hash da transformação, dos parâmetros e do conteúdo
+        # da série. Se `self.result_cache` estiver ativo e o mesmo passo já tiver sido
+        # executado (por esta ou por outra série com o mesmo conteúdo e o mesmo cache),
+        # o resultado é obtido do cache sem recálculo. O cache não é usado nas
+        # transformações inplace, que devem modificar a série, nem quando a
+        # transformação depende de objetos com estado, que o resultado em cache não
+        # atualizaria ou não identifica: scalers informados nos parâmetros (ajustados
+        # pelo normalize()) ou o scaler da própria série.
+        # Os hashes percorrem todas as colunas da série (custo O(n), maior que o de
+        # muitas transformações) e por isso só são calculados quando o cache é usado
+        # ou quando `self.hash_provenance` for True. Nos demais casos a proveniência
+        # registra None como input_hash e output_hash.
+        if transformation not in TimeSerie.TRANSFORMATIONS:
+            raise ValueError(f'Unknown transformation: {transformation}')
+        cache = self.result_cache
+        if (
+            kwargs.get('inplace', False)
+            or self.scaler is not None
+            or any(TimeSerie.__has_state(value) for value in kwargs.values())
+        ):
+            cache = None
+        hashing = cache is not None or self.hash_provenance
+        input_hash = self.content_hash() if hashing else None
+        step = TSProvenance.step_key(
+            transformation, TSProvenance.canonicalize(kwargs), input_hash
+        )
+        if cache is not None:
+            cached = cache.get(step)
+            if cached is not None:
+                logger.debug(f'apply_transformation({transformation}): passo em cache')
+                cached.result_cache = cache
+                return cached
+
+        start = time.perf_counter()
+        result = getattr(self, transformation)(**kwargs)
+        duration = time.perf_counter() - start
+        if result is not self:
+            # Nas transformações inplace o passo é registrado na própria série
+            result._provenance = self._provenance.copy()
+            result.source = self.source
+            result.result_cache = self.result_cache
+            result.hash_provenance = self.hash_provenance
+        result.add_provenance(
+            transformation,
+            kwargs,
+            input_hash=input_hash,
+            output_hash=result.content_hash() if hashing else None,
+            duration=duration,
+        )
+        if cache is not None:
+            cache.put(step, result)
+        return result
+
+    @staticmethod
+    def __has_state(value: Any) -> bool:
+        # Indica se `value` é (ou contém) um estimador do scikit-learn. As classes, usadas
+        # como fábricas de scalers, não têm estado.
+        if isinstance(value, dict):
+            return any(TimeSerie.__has_state(item) for item in value.values())
+        return hasattr(value, 'fit') and not isinstance(value, type)
 
     ### ------------------------- Outros Métodos Estáticos da classe -----------------------------
 
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from t8s.log_config import LogConfig
+from t8s.ts import TimeSerie
+
+logger = LogConfig().get_logger()
+
+
+class TSAppendBuffer:
+    """
+    Buffer colunar para ingestão incremental de séries temporais no formato wide. Cada
+    coluna é um array NumPy com o dtype da primeira carga (float32 e int32 continuam
+    float32 e int32) e o conteúdo atual é exposto como TimeSerie sem cópia, através de
+    fatias desses arrays. Há dois modos:
+
+    - crescimento geométrico (capacity=None): a capacidade dobra quando o buffer enche,
+      de modo que o custo amortizado de cada linha anexada é O(1), em vez do O(n) de um
+      pd.concat por lote. As séries já expostas continuam válidas após novos append().
+    - buffer circular (capacity=N): mantém apenas as N linhas mais recentes (ex.: a
+      janela "últimas N horas"). Cada linha é gravada em duas posições (i e i + N) de um
+      array de 2N linhas, o que mantém as N linhas mais recentes sempre contíguas e permite
+      expô-las sem cópia. Neste modo a série exposta compartilha memória com o buffer e é
+      sobrescrita pelos próximos append(); use to_timeserie(copy=True) para obter uma
+      cópia independente.
+
+    Por contrato a primeira coluna é o timestamp.
+    """
+
+    def __init__(self, capacity: int | None = None, initial_size: int = 1024):
+        assert capacity is None or capacity > 0, 'capacity must be a positive int'
+        assert initial_size > 0, 'initial_size must be a positive int'
+        self.capacity = capacity
+        self._initial_size = initial_size
+        self._columns: list[str] = []
+        self._timestamp_dtype = None
+        self._arrays: list[np.ndarray] = []
+        self._size = 0  # Número de linhas expostas por to_timeserie()
+        self._appended = 0  # Total de linhas já anexadas
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        mode = 'growable' if self.capacity is None else f'ring({self.capacity})'
+        return f'TSAppendBuffer({mode}, rows={self._size}, columns={self._columns})'
+
+    def __allocate(self, df: pd.DataFrame, rows: int) -> None:
+        # Define o esquema do buffer a partir da primeira carga
+        self._columns = list(df.columns)
+        timestamp = df[df.columns[0]]
+        if not pd.api.types.is_datetime64_any_dtype(timestamp.dtype):
+            raise Exception('A primeira coluna deve ser o timestamp')
+        self._timestamp_dtype = timestamp.dtype
+        dtypes = [np.dtype(np.int64)] + [df[col].dtype for col in df.columns[1:]]
+        for col, dtype in zip(df.columns[1:], dtypes[1:]):
+            if not isinstance(dtype, np.dtype) or dtype.kind not in 'iufb':
+                raise Exception(f'A coluna {col} deve ser numérica')
+        if self.capacity is None:
+            size = max(self._initial_size, rows)
+        else:
+            size = 2 * self.capacity
+        self._arrays = [np.empty(size, dtype=dtype) for dtype in dtypes]
+
+    def __grow(self, rows: int) -> None:
+        # Crescimento geométrico: dobra a capacidade até caberem `rows` linhas
+        size = len(self._arrays[0])
+        while size < rows:
+            size *= 2
+        logger.debug(f'TSAppendBuffer: capacidade {len(self._arrays[0])} -> {size}')
+        arrays = []
+        for array in self._arrays:
+            grown = np.empty(size, dtype=array.dtype)
+            grown[: self._size] = array[: self._size]
+            arrays.append(grown)
+        # As séries já expostas continuam referenciando os arrays anteriores
+        self._arrays = arrays
+
+    def __batch_arrays(self, df: pd.DataFrame) -> list[np.ndarray]:
+        if list(df.columns) != self._columns:
+            raise Exception(
+                f'As colunas {list(df.columns)} diferem das colunas do buffer '
+                + f'{self._columns}'
+            )
+        timestamp = df[df.columns[0]]
+        if timestamp.dtype != self._timestamp_dtype:
+            raise Exception(
+                f'O timestamp {timestamp.dtype} difere do timestamp do buffer '
+                + f'{self._timestamp_dtype}'
+            )
+        batch = [timestamp.array.asi8]  # type: ignore
+        for col, array in zip(df.columns[1:], self._arrays[1:]):
+            values = df[col].to_numpy()
+            if not np.can_cast(values.dtype, array.dtype, casting='same_kind'):
+                raise Exception(
+                    f'A coluna {col} ({values.dtype}) não pode ser convertida para '
+                    + f'{array.dtype}'
+                )
+            batch.append(values)
+        return batch
+
+    def append(self, data: pd.DataFrame | TimeSerie) -> None:
+        # Anexa as linhas de `data` (DataFrame ou TimeSerie wide com as mesmas colunas)
+        df = data.df if isinstance(data, TimeSerie) else data
+        if isinstance(data, TimeSerie) and data.format != 'wide':
+            raise Exception('A série temporal deve estar no formato wide')
+        rows = len(df)
+        if len(self._arrays) == 0:
+            self.__allocate(df, rows)
+        batch = self.__batch_arrays(df)
+        if rows == 0:
+            return
+        if self.capacity is None:
+            if self._size + rows > len(self._arrays[0]):
+                self.__grow(self._size + rows)
+            for array, values in zip(self._arrays, batch):
+                np.copyto(
+                    array[self._size : self._size + rows], values, casting='same_kind'
+                )
+            self._size += rows
+            self._appended += rows
+        else:
+            self.__append_ring(batch, rows)
+
+    def __append_ring(self, batch: list[np.ndarray], rows: int) -> None:
+        # Grava as linhas nas posições i e i + capacity (mod 2 * capacity). Apenas as
+        # últimas `capacity` linhas do lote podem sobreviver.
+        capacity = self.capacity
+        if rows > capacity:
+            batch = [values[rows - capacity :] for values in batch]
+            self._appended += rows - capacity
+            rows = capacity
+        slot = self._appended % capacity
+        first = min(rows, capacity - slot)  # Linhas antes de dar a volta no buffer
+        for array, values in zip(self._arrays, batch):
+            for offset in [0, capacity]:
+                start = slot + offset
+                np.copyto(
+                    array[start : start + first], values[:first], casting='same_kind'
+                )
+                if first < rows:
+                    np.copyto(
+                        array[offset : offset + rows - first],
+                        values[first:],
+                        casting='same_kind',
+                    )
+        self._size = min(self._size + rows, capacity)
+        self._appended += rows
+
+    def __rows(self) -> slice:
+        # Linhas expostas: em modo circular, as `_size` linhas mais recentes são contíguas
+        # a partir da posição (total anexado - _size) mod capacity
+        if self.capacity is None:
+            return slice(0, self._size)
+        start = (self._appended - self._size) % self.capacity
+        return slice(start, start + self._size)
+
+    def to_timeserie(self, copy: bool = False) -> TimeSerie:
+        # Expõe o conteúdo atual como TimeSerie wide, sem cópia (a menos que copy=True)
+        if self._size == 0:
+            return TimeSerie.empty()
+        rows = self.__rows()
+        arrays = [array[rows].copy() if copy else array[rows] for array in self._arrays]
+        dtype = self._timestamp_dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            timestamp = pd.arrays.DatetimeArray(
+                arrays[0].view(f'M8[{dtype.unit}]'), dtype=dtype, copy=False
+            )
+        else:
+            timestamp = arrays[0].view(dtype)
+        data = {self._columns[0]: timestamp}
+        data.update(zip(self._columns[1:], arrays[1:]))
+        return TimeSerie(
+            pd.DataFrame(data, copy=False),
+            format='wide',
+            features_qty=len(self._columns),
+        )
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 
 # from __future__ import annotations usado apenas nas versões anteriores a 3.7
+import copy
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
+from sklearn.base import TransformerMixin  # type: ignore
 
 from t8s.log_config import LogConfig
+from t8s.normalize import TSNormalizer
 from t8s.ts import TimeSerie  # , ITimeSerie, ITimeSeriesProcessor, IProvenancable
 
 logger = LogConfig().get_logger()
@@ -110,6 +113,13 @@ class TSBuilder:
 
 
 class ReadParquetFile(ReadStrategy):
+    def __init__(self, backend: str = 'pandas') -> None:
+        # backend='pandas' materializa o DataFrame na leitura. backend='arrow' mantém o
+        # pa.Table lido como fonte da verdade da TimeSerie e o DataFrame só é criado
+        # quando a propriedade `df` for acessada pela primeira vez.
+        assert backend in ['pandas', 'arrow'], "backend must be 'pandas' or 'arrow'"
+        self.backend = backend
+
     def do_read(
         self, file_path: Path, select_features: list[str] | None = None
     ) -> Optional['TimeSerie']:
@@ -148,6 +158,11 @@ class ReadParquetFile(ReadStrategy):
         # # logger.debug(metadata.row_group(0).column(0).statistics)
         # Leia o arquivo Parquet
         parquet_file = pq.ParquetFile(file_path)
+        # Origem da série, usada para invalidar os resultados de transformações em cache
+        # quando o arquivo for modificado
+        source = (str(file_path.resolve()), file_path.stat().st_mtime_ns)
+        # Scaler gravado por WriteParquetFile quando a série foi normalizada
+        scaler = self.read_scaler(metadata.metadata, select_features)
 
         # logger.debug('\ntype(parquet_file): ' + str(type(parquet_file)) + '\n' + str(parquet_file))
         # logger.debug('\n-------------------------------')
@@ -155,6 +170,15 @@ class ReadParquetFile(ReadStrategy):
         # ATENÇÃO: o método read_parquet() do Pandas não gera o Dataframe com os tipos corretos.
         # Em vez de criar float32 para o physical_type FLOAT do Parquet, ele cria float64.
         # df = pd.read_parquet(data)
+        if self.backend == 'arrow':
+            table = parquet_file.read(columns=select_features)
+            if select_features:
+                features_qty = len(select_features)
+            ts = TimeSerie(table, format=format, features_qty=features_qty)
+            ts.source = source
+            ts.scaler = scaler
+            return ts
+
         df = pd.DataFrame()
         if select_features:
             df = parquet_file.read(columns=select_features).to_pandas()
@@ -167,9 +191,44 @@ class ReadParquetFile(ReadStrategy):
         # logger.debug('\ndf:\n' + str(df))
         # Cria o objeto
         ts = TimeSerie(df, format=format, features_qty=features_qty)
+        ts.source = source
+        ts.scaler = scaler
         # logger.debug('\nts:\n' + str(ts))
         return ts
 
+    def read_row_groups(
+        self, file_path: Path, select_features: list[str] | None = None
+    ) -> Iterator[TimeSerie]:
+        # Lê o arquivo um row group por vez, retornando uma TimeSerie por row group. Usado
+        # no processamento out-of-core (ex.: TSNormalizer.normalize_parquet), em que a
+        # memória ocupada fica limitada ao tamanho de um row group.
+        assert isinstance(file_path, Path), "path must be a Path object"
+        assert (str(file_path)).endswith('.parquet'), "path must be a Path object"
+        parquet_file = pq.ParquetFile(file_path)
+        metadata = parquet_file.metadata.metadata
+        format = metadata[b'format'].decode()
+        features_qty = int(metadata[b'features'].decode())
+        if select_features:
+            features_qty = len(select_features)
+        source = (str(file_path.resolve()), file_path.stat().st_mtime_ns)
+        scaler = self.read_scaler(metadata, select_features)
+        for idx in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(idx, columns=select_features)
+            data = table if self.backend == 'arrow' else table.to_pandas()
+            ts = TimeSerie(data, format=format, features_qty=features_qty)
+            ts.source = source
+            # Cada série recebe a sua cópia do scaler, como em TimeSerie.copy()
+            ts.scaler = copy.deepcopy(scaler)
+            yield ts
+
+    @staticmethod
+    def read_scaler(
+        metadata: dict[bytes, bytes] | None, select_features: list[str] | None = None
+    ) -> TransformerMixin | dict[str, TransformerMixin] | None:
+        # Restaura o scaler gravado nos metadados do arquivo (None se não houver),
+        # restrito às colunas lidas
+        return TSNormalizer.scaler_from_metadata(metadata, select_features)
+
 
 class ReadCsvFile(ReadStrategy):
     def do_read(self, data: list) -> Optional['TimeSerie']:
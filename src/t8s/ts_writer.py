@@ -12,6 +12,7 @@ import pyarrow as pa
 import pyarrow.parquet as pq
 
 from t8s.log_config import LogConfig
+from t8s.normalize import TSNormalizer
 from t8s.ts import TimeSerie
 
 logger = LogConfig().get_logger()
@@ -91,15 +92,71 @@ class WriteParquetFile(Strategy):
         logger.info('Using WriteParquetFile strategy')
         # Grava os dados em formato Parquet com metadados do objeto TimeSerie
         # to_parquet(path, df, self.format, self.features)
-        table = pa.Table.from_pandas(ts.df)
+        # Séries com backend Arrow são gravadas sem materializar o DataFrame
+        table = ts.to_arrow()
         # table = table.replace_schema_metadata({'format': self.format, 'features': self.features})
-        table = table.replace_schema_metadata(
-            {b'format': str(ts.format).encode(), b'features': str(ts.features).encode()}
-        )
+        metadata = {
+            b'format': str(ts.format).encode(),
+            b'features': str(ts.features).encode(),
+        }
+        # Séries normalizadas levam o scaler ajustado, para que possam ser denormalizadas
+        # após a leitura
+        metadata.update(TSNormalizer.scaler_metadata(ts.scaler))
+        table = table.replace_schema_metadata(metadata)
         result = pq.write_table(table, path)
         return result
 
 
+class WriteParquetRowGroups:
+    """
+    Gravação incremental de uma série temporal em Parquet, um row group por chamada de
+    write(). O arquivo gerado tem os mesmos metadados (format, features e scaler) do
+    gerado por WriteParquetFile e pode ser lido por ReadParquetFile. Os metadados são
+    os da série recebida no primeiro write(). Uso:
+
+    with WriteParquetRowGroups(path) as writer:
+        for ts in ...:
+            writer.write(ts)
+    """
+
+    def __init__(self, path: Path, metadata: dict[bytes, bytes] | None = None) -> None:
+        self.path = path
+        # Metadados adicionais gravados no schema do arquivo
+        self.metadata = dict(metadata or {})
+        self._writer: pq.ParquetWriter | None = None
+        self._schema: pa.Schema | None = None
+
+    def write(self, ts: TimeSerie) -> None:
+        table = ts.to_arrow()
+        if self._writer is None:
+            # Como em WriteParquetFile, os metadados do Pandas não são gravados
+            metadata = dict(self.metadata)
+            metadata.update(
+                {
+                    b'format': str(ts.format).encode(),
+                    b'features': str(ts.features).encode(),
+                }
+            )
+            metadata.update(TSNormalizer.scaler_metadata(ts.scaler))
+            self._schema = table.schema.with_metadata(metadata)
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            # Colunas dictionary podem ter índices de larguras diferentes em cada lote
+            table = table.cast(self._schema)
+        self._writer.write_table(table.replace_schema_metadata(self._schema.metadata))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> 'WriteParquetRowGroups':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 class WriteCsvFile(Strategy):
     # O método do_write é VOID, pois o resultado é gravado em disco. Caso ocorra
     # algum problema uma `Exception` é lançada.
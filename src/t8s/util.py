@@ -5,9 +5,9 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 from pandas import Series
-from scipy.stats import zscore
 
 from t8s.log_config import LogConfig
+from t8s.outliers import TSOutliers
 from t8s.ts import TimeSerie
 from t8s.ts_builder import ReadParquetFile, TSBuilder  # , ReadCsvFile
 from t8s.ts_writer import TSWriter, WriteParquetFile
@@ -138,25 +138,15 @@ class Util:
         return (ret_all_s_e_nan_block, last_idx)
 
     @staticmethod
-    def detect_outliers(df: pd.DataFrame, col: str, method: str) -> list:
-        # Compute the z-score for the given column in the DataFrame and return a list of booleans indicating the outliers
-        values = df[col]
-
-        if method == 'zscore':
-            z_scores = zscore(values)
-            limit = 2.0
-            return [abs(z_score) > limit for z_score in z_scores]
-
-        elif method == 'iqr':
-            q25 = np.percentile(values, 25)
-            q75 = np.percentile(values, 75)
-            iqr = q75 - q25
-            lower_bound = q25 - 1.5 * iqr
-            upper_bound = q75 + 1.5 * iqr
-            return [value < lower_bound or value > upper_bound for value in values]
-
-        else:
-            raise ValueError(f'Unknown method: {method}')
+    def detect_outliers(
+        df: pd.DataFrame, col: str, method: str, threshold: float | None = None
+    ) -> list:
+        # Retorna uma lista de booleanos indicando os outliers da coluna `col`, pelo
+        # método 'zscore' (limiar padrão 2.0), 'iqr' (1.5) ou 'mad' (3.5). A máscara é
+        # calculada de forma vetorizada por TSOutliers (ver TimeSerie.detect_outliers,
+        # que trata todas as colunas de uma vez).
+        mask = TSOutliers.detect_wide(df, [method], threshold, columns=[col])
+        return mask[col].tolist()
 
     @staticmethod
     def get_limits(df: pd.DataFrame, factor: int) -> pd.DataFrame:
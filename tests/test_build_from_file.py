@@ -24,5 +24,27 @@ def test_build_from_file():
     assert type(ts.df['temperatura'][0]) == np.float32
     assert type(ts.df['velocidade'][0]) == np.int32
 
+
+def test_build_from_file_arrow_backend():
+    path = Path('data/parquet/ts_01.parquet')
+    ts_pandas: TimeSerie = TSBuilder(ReadParquetFile()).build_from_file(path)
+    ts: TimeSerie = TSBuilder(ReadParquetFile(backend='arrow')).build_from_file(path)
+    assert ts.is_arrow_backed()
+    assert ts.is_multivariate() and not ts.is_univariate()
+    assert ts.get_numeric_column_names() == ts_pandas.get_numeric_column_names()
+    stats = ts.get_statistics()
+    for col in ts.get_numeric_column_names():
+        assert np.isclose(stats.mean(col), ts_pandas.get_statistics().mean(col))
+        assert np.isclose(stats.q3(col), ts_pandas.get_statistics().q3(col))
+    univariate_list = ts.split()
+    assert all(ts_uni.is_arrow_backed() for ts_uni in univariate_list)
+    assert univariate_list[0].df.equals(ts_pandas.split()[0].df)
+    # O DataFrame só é materializado no primeiro acesso
+    assert ts.is_arrow_backed()
+    assert ts.df.equals(ts_pandas.df)
+    assert not ts.is_arrow_backed()
+
+
 if __name__ == "__main__":
     test_build_from_file()
+    test_build_from_file_arrow_backend()
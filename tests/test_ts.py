@@ -0,0 +1,934 @@
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+import sklearn  # type: ignore
+from sklearn.base import clone  # type: ignore
+from sklearn.preprocessing import (  # type: ignore
+    MinMaxScaler,
+    QuantileTransformer,
+    RobustScaler,
+    StandardScaler,
+)
+
+from t8s import get_sample_df
+from t8s.cache import TSResultCache
+from t8s.normalize import TSNormalizer
+from t8s.outliers import TSHampelFilter, TSOutliers
+from t8s.stats import TSParquetStats, TSStats, TSStreamStats
+from t8s.ts import TimeSerie
+from t8s.ts_buffer import TSAppendBuffer
+from t8s.ts_builder import ReadParquetFile, TSBuilder
+from t8s.ts_writer import TSWriter, WriteParquetFile
+
+
+def create_sample_ts() -> TimeSerie:
+    df, last_ts = get_sample_df(4, datetime(2022, 1, 1, 0, 0, 0), 1)
+    return TimeSerie(df, format='wide', features_qty=len(df.columns))
+
+
+def build_mask_serie_reference(s: pd.Series) -> pd.Series:
+    # Implementação original, elemento a elemento, usada como oráculo nos testes.
+    mask = np.full(len(s), 1.0)
+    previus = s[0]
+    for idx, v in enumerate(mask):
+        value = s[idx]
+        if not np.isnan(value):
+            mask[idx] = np.nan
+        if idx < len(mask) - 2 and np.isnan(s[idx + 1]):
+            mask[idx] = 1.0
+        if idx > 0 and not np.isnan(value) and np.isnan(previus):
+            mask[idx] = 1.0
+        previus = value
+    return pd.Series(mask)
+
+
+def test_build_mask_serie():
+    rng = np.random.default_rng(42)
+    for size in [1, 2, 3, 5, 40, 1000]:
+        values = rng.normal(size=size)
+        values[rng.random(size) < 0.3] = np.nan
+        for s in [pd.Series(values), pd.Series(values.astype(np.float32))]:
+            expected = build_mask_serie_reference(s)
+            result = TimeSerie.build_mask_serie(s)
+            pd.testing.assert_series_equal(result, expected)
+
+
+def test_denormalize():
+    ts = create_sample_ts()
+    for scaler in [
+        MinMaxScaler(feature_range=(-1, 1)),
+        QuantileTransformer(n_quantiles=4),
+    ]:
+        ts_normalized = ts.normalize(scaler, inplace=False)
+        ts_denormalized = ts_normalized.denormalize()
+        assert ts_denormalized is not ts_normalized
+        assert ts_normalized.scaler is scaler
+        for col in ['temperatura', 'velocidade']:
+            assert np.allclose(ts_denormalized.df[col], ts.df[col], atol=1e-3)
+
+
+def test_denormalize_some_columns_inplace():
+    ts = create_sample_ts()
+    ts_normalized = ts.normalize(MinMaxScaler(), ['velocidade'], inplace=False)
+    assert ts_normalized.get_normalized_column_names() == ['velocidade']
+    result = ts_normalized.denormalize(inplace=True)
+    assert result is ts_normalized
+    assert result.scaler is None
+    assert np.allclose(result.df['velocidade'], ts.df['velocidade'])
+    assert np.allclose(result.df['temperatura'], ts.df['temperatura'])
+
+
+def test_normalize_preserves_dtype_and_index():
+    n = 200
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': np.random.rand(n).astype(np.float32) * 100,
+            'velocidade': np.arange(n, dtype=np.int32),
+        },
+        index=np.arange(n) + 1000,
+    )
+    ts = TimeSerie(df, format='wide', features_qty=3)
+    for scaler in [MinMaxScaler(), StandardScaler(), RobustScaler()]:
+        ts_normalized = ts.normalize(scaler)
+        assert ts_normalized.df['temperatura'].dtype == np.float32
+        assert ts_normalized.df['velocidade'].dtype == np.float64
+        pd.testing.assert_index_equal(ts_normalized.df.index, df.index)
+        expected = clone(scaler).fit_transform(df[['temperatura', 'velocidade']])
+        np.testing.assert_allclose(
+            ts_normalized.df[['temperatura', 'velocidade']], expected, atol=1e-5
+        )
+        ts_denormalized = ts_normalized.denormalize()
+        assert ts_denormalized.df['temperatura'].dtype == np.float32
+        np.testing.assert_allclose(
+            ts_denormalized.df['temperatura'], df['temperatura'], atol=1e-4
+        )
+
+
+def test_normalize_parquet_out_of_core():
+    n = 5000
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': (rng.normal(size=n) * 10).astype(np.float32),
+            'velocidade': rng.integers(0, 100, n).astype(np.int32),
+        }
+    )
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({b'format': b'wide', b'features': b'3'})
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp) / 'source.parquet', Path(tmp) / 'target.parquet'
+        pq.write_table(table, source, row_group_size=700)
+        for scaler in [MinMaxScaler(), StandardScaler(), RobustScaler()]:
+            TSNormalizer.normalize_parquet(source, target, scaler)
+            assert pq.ParquetFile(target).num_row_groups == 8
+            ts_normalized = TSBuilder(ReadParquetFile()).build_from_file(target)
+            expected = TimeSerie(df, format='wide', features_qty=3).normalize(
+                clone(scaler)
+            )
+            assert ts_normalized.df['temperatura'].dtype == np.float32
+            pd.testing.assert_frame_equal(
+                ts_normalized.df, expected.df, check_exact=False, atol=1e-5
+            )
+            # O scaler ajustado é lido dos metadados e permite reverter a normalização
+            assert type(ts_normalized.scaler) is type(scaler)
+            np.testing.assert_allclose(
+                ts_normalized.denormalize().df['velocidade'], df['velocidade']
+            )
+
+
+def test_stream_percentiles_skewed():
+    rng = np.random.default_rng(3)
+    values = rng.random(200_000)
+    # Um outlier muito grande concentra os demais valores no primeiro intervalo
+    values[7] = 1e12
+    values[rng.random(len(values)) < 0.01] = np.nan
+    # Valores repetidos não podem ser separados pelo refinamento
+    values[1000:60_000] = 0.5
+    percentiles = [0, 10, 25, 50, 75, 99.9, 100]
+    rows_per_pass = []
+
+    def blocks():
+        for start in range(0, len(values), 30_000):
+            yield [values[start : start + 30_000], -values[start : start + 30_000]]
+
+    def counting_blocks():
+        # Registra o tamanho dos blocos lidos em cada passada
+        rows_per_pass.append(0)
+        for columns in blocks():
+            rows_per_pass[-1] += len(columns[0])
+            yield columns
+
+    result = TSNormalizer.stream_percentiles(
+        counting_blocks, percentiles, bins=16, max_candidates=500
+    )
+    expected = np.nanpercentile(np.vstack((values, -values)), percentiles, axis=1).T
+    np.testing.assert_array_equal(result, expected)
+    # Várias passadas de refinamento, cada uma com memória limitada a um bloco
+    assert len(rows_per_pass) > 3
+
+    # Reajustar um scaler descarta o ajuste anterior
+    scaler = MinMaxScaler()
+    ts = create_sample_ts()
+    ts.normalize(scaler, ['velocidade'], inplace=False)
+    ts.df['velocidade'] = ts.df['velocidade'] / 2
+    ts.normalize(scaler, ['velocidade'], inplace=False)
+    assert scaler.data_max_[0] == ts.df['velocidade'].max()
+
+
+def test_scaler_metadata_round_trip():
+    ts = create_sample_ts()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'normalized.parquet'
+        for scaler in [MinMaxScaler(feature_range=(-1, 1)), RobustScaler()]:
+            ts_normalized = ts.normalize(scaler, ['velocidade'], inplace=False)
+            TSWriter(WriteParquetFile()).write(path, ts_normalized)
+            for backend in ['pandas', 'arrow']:
+                ts_read = TSBuilder(ReadParquetFile(backend=backend)).build_from_file(
+                    path
+                )
+                # A série lida é denormalizada sem um novo ajuste
+                assert ts_read.get_normalized_column_names() == ['velocidade']
+                pd.testing.assert_frame_equal(
+                    ts_read.denormalize().df, ts.df, check_exact=False
+                )
+    # Apenas classes do scikit-learn são restauradas
+    state = TSNormalizer.scaler_to_json(StandardScaler().fit([[1.0], [3.0]]))
+    with pytest.raises(ValueError):
+        TSNormalizer.scaler_from_json(state.replace('sklearn.', 'os.', 1))
+
+
+def test_scaler_metadata_select_features(caplog):
+    ts = create_sample_ts()
+    selected = ['timestamp', 'velocidade']
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'normalized.parquet'
+        for scaler, columns in [
+            (RobustScaler(), ['temperatura', 'velocidade']),
+            ({'temperatura': MinMaxScaler()}, ['temperatura']),
+        ]:
+            ts_normalized = ts.normalize(scaler, columns)
+            TSWriter(WriteParquetFile()).write(path, ts_normalized)
+            assert pq.read_metadata(path).metadata[b'sklearn_version'] == (
+                sklearn.__version__.encode()
+            )
+            for backend in ['pandas', 'arrow']:
+                reader = TSBuilder(ReadParquetFile(backend=backend))
+                ts_read = reader.build_from_file(path, select_features=selected)
+                if isinstance(scaler, dict):
+                    # Nenhuma das colunas lidas foi normalizada
+                    assert ts_read.scaler is None
+                    continue
+                # O scaler é restrito às colunas lidas
+                assert ts_read.get_normalized_column_names() == ['velocidade']
+                pd.testing.assert_frame_equal(
+                    ts_read.denormalize().df, ts.df[selected], check_exact=False
+                )
+
+        # Scalers não afins ajustados sobre várias colunas não são restaurados
+        ts_normalized = ts.normalize(QuantileTransformer(n_quantiles=10))
+        TSWriter(WriteParquetFile()).write(path, ts_normalized)
+        ts_read = TSBuilder(ReadParquetFile()).build_from_file(path, selected)
+        assert ts_read.scaler is None
+        assert 'não será restaurado' in caplog.text
+
+        # Uma versão diferente do scikit-learn é informada na leitura
+        table = pq.read_table(path)
+        metadata = {**table.schema.metadata, b'sklearn_version': b'0.1'}
+        pq.write_table(table.replace_schema_metadata(metadata), path)
+        ts_read = TSBuilder(ReadParquetFile()).build_from_file(path)
+        assert isinstance(ts_read.scaler, QuantileTransformer)
+        assert 'scikit-learn 0.1' in caplog.text
+
+
+def test_normalize_per_column():
+    ts = create_sample_ts()
+    columns = ['temperatura', 'velocidade']
+    # Fábrica de scalers: um MinMaxScaler por coluna, ajustados em paralelo
+    ts_normalized = ts.normalize(MinMaxScaler, inplace=False, max_workers=2)
+    assert sorted(ts_normalized.scaler) == columns
+    for col in columns:
+        expected = MinMaxScaler().fit_transform(ts.df[[col]]).ravel()
+        np.testing.assert_allclose(ts_normalized.df[col], expected, rtol=1e-6)
+    pd.testing.assert_frame_equal(
+        ts_normalized.denormalize().df, ts.df, check_exact=False
+    )
+    # Mapeamento coluna -> scaler, gravado e lido com o arquivo
+    scalers = {'temperatura': StandardScaler(), 'velocidade': RobustScaler()}
+    ts_normalized = ts.normalize(scalers, inplace=False)
+    assert ts_normalized.get_normalized_column_names() == columns
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'normalized.parquet'
+        TSWriter(WriteParquetFile()).write(path, ts_normalized)
+        ts_read = TSBuilder(ReadParquetFile()).build_from_file(path)
+    assert isinstance(ts_read.scaler['velocidade'], RobustScaler)
+    pd.testing.assert_frame_equal(ts_read.denormalize().df, ts.df, check_exact=False)
+
+
+def test_stream_stats():
+    n = 10000
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': (rng.normal(size=n) + 1e4).astype(np.float32),
+            'velocidade': rng.integers(0, 100, n).astype(np.int32),
+        }
+    )
+    df.loc[::10, 'temperatura'] = np.nan
+    expected = df.describe()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({b'format': b'wide', b'features': b'3'})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'stats.parquet'
+        pq.write_table(table, path, row_group_size=1500)
+        stats = TSStreamStats.from_parquet(path)
+    # Estatísticas parciais, calculadas por partes e combinadas fora de ordem
+    parts = [TSStreamStats().update(df.iloc[i : i + 3000]) for i in range(0, n, 3000)]
+    merged = parts[2].merge(parts[0]) + parts[3] + parts[1]
+    for result in [stats, merged]:
+        assert result.nan_count('temperatura') == 1000
+        for col in ['temperatura', 'velocidade']:
+            assert result.count(col) == expected.loc['count', col]
+            assert result.min(col) == expected.loc['min', col]
+            assert result.max(col) == expected.loc['max', col]
+            assert np.isclose(result.mean(col), expected.loc['mean', col])
+            assert np.isclose(result.std(col), expected.loc['std', col], rtol=1e-5)
+    assert np.isnan(TSStats(merged).q1('velocidade'))
+
+
+def test_lazy_stats():
+    ts = create_sample_ts()
+    expected = ts.df.describe()
+    stats = ts.get_statistics()
+    assert stats.mean('velocidade') == expected.loc['mean', 'velocidade']
+    # Apenas a estatística pedida é calculada; o describe() completo não é feito
+    assert list(stats._cache) == [('mean', 'velocidade')]
+    assert stats._summary_en_us is None
+    # Os três quartis saem da mesma partição
+    assert stats.q1('temperatura') == expected.loc['25%', 'temperatura']
+    assert ('75%', 'temperatura') in stats._cache
+    assert stats.median('temperatura') == expected.loc['50%', 'temperatura']
+    assert stats.q3('temperatura') == expected.loc['75%', 'temperatura']
+    assert stats.amplitude('velocidade') == (
+        expected.loc['max', 'velocidade'] - expected.loc['min', 'velocidade']
+    )
+    assert stats.count('timestamp') == len(ts.df)
+    pd.testing.assert_frame_equal(stats.summary_en_us, expected)
+
+
+def test_parquet_footer_stats():
+    ts = create_sample_ts()
+    df = ts.df
+    df_nan = df.assign(temperatura=[np.nan] + list(df['temperatura'][1:]))
+    with tempfile.TemporaryDirectory() as tmp:
+        TSWriter(WriteParquetFile()).write(Path(tmp) / 'a.parquet', ts)
+        # Arquivo sem estatísticas no rodapé: lido apenas para as suas colunas
+        table = pa.Table.from_pandas(df_nan, preserve_index=False)
+        pq.write_table(table, Path(tmp) / 'b.parquet', write_statistics=['timestamp'])
+        footer = TSParquetStats(Path(tmp))
+        assert footer.columns == ['timestamp', 'temperatura', 'velocidade']
+        assert len(footer.inventory()) == 6
+        stats = TSStats.from_parquet(Path(tmp))
+        expected = pd.concat([df, df_nan], ignore_index=True).describe()
+        for col in ['temperatura', 'velocidade']:
+            assert stats.count(col) == expected.loc['count', col]
+            assert stats.min(col) == expected.loc['min', col]
+            assert stats.max(col) == expected.loc['max', col]
+            # Média, desvio padrão e quartis são calculados a partir dos dados
+            assert np.isclose(stats.mean(col), expected.loc['mean', col])
+            assert np.isclose(stats.std(col), expected.loc['std', col])
+            assert np.isclose(stats.q3(col), expected.loc['75%', col])
+        assert stats.nan_count('temperatura') == 1
+        assert footer.max('timestamp') == df['timestamp'].max()
+
+
+def test_grouped_stats():
+    n = 3 * 24 * 60
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='min'),
+            'temperatura': rng.normal(size=n).astype(np.float32),
+            'velocidade': rng.integers(0, 100, n).astype(np.int32),
+        }
+    )
+    df.loc[::7, 'temperatura'] = np.nan
+    ts = TimeSerie(df, format='wide', features_qty=3)
+    long = df.melt(id_vars=['timestamp'], var_name='ds', value_name='value')
+    expected = (
+        long.groupby(['ds', pd.Grouper(key='timestamp', freq='1D')])['value']
+        .describe()
+        .reset_index()
+    )
+    grouped = ts.get_grouped_statistics('1D')
+    assert len(grouped) == 6
+    assert list(grouped['ds'].astype(str)) == list(expected['ds'])
+    assert (grouped['timestamp'] == expected['timestamp']).all()
+    for stat in ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']:
+        np.testing.assert_allclose(grouped[stat], expected[stat], rtol=1e-5)
+    assert grouped['nan_count'].sum() == df['temperatura'].isna().sum()
+    # Formato long: o mesmo resultado, por `ds`
+    ts.to_long()
+    pd.testing.assert_frame_equal(ts.get_grouped_statistics('1D'), grouped)
+    by_ds = ts.get_grouped_statistics(stats=['count', 'mean'])
+    assert list(by_ds.columns) == ['ds', 'count', 'mean']
+    assert list(by_ds['count']) == [n - df['temperatura'].isna().sum(), n]
+
+
+def test_detect_outliers():
+    n = 2000
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='min'),
+            'temperatura': rng.standard_t(3, size=n).astype(np.float32),
+            'velocidade': rng.integers(0, 100, n).astype(np.int32),
+        }
+    )
+    df.loc[::9, 'temperatura'] = np.nan
+    ts = TimeSerie(df, format='wide', features_qty=3)
+    mask = ts.detect_outliers(['zscore', 'iqr', 'mad'], threshold={'zscore': 2.5})
+    assert mask.shape == (n, 6) and (mask.dtypes == bool).all()
+    values = df['temperatura'].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    x = values[valid]
+    q1, q3 = np.percentile(x, [25, 75])
+    median = np.median(x)
+    mad = np.median(np.abs(x - median))
+    expected = {
+        'zscore': np.abs(x - x.mean()) > 2.5 * x.std(),
+        'iqr': (x < q1 - 1.5 * (q3 - q1)) | (x > q3 + 1.5 * (q3 - q1)),
+        'mad': 0.6745 * np.abs(x - median) > 3.5 * mad,
+    }
+    for method, outliers in expected.items():
+        column = mask[f'temperatura_{method}'].to_numpy()
+        assert outliers.any()
+        np.testing.assert_array_equal(column[valid], outliers)
+        # NaN nunca são outliers
+        assert not column[~valid].any()
+    # Formato long: as estatísticas são calculadas por `ds`
+    ts.to_long()
+    long_mask = ts.detect_outliers('iqr')
+    assert list(long_mask.columns) == ['value']
+    is_temperatura = (ts.df['ds'] == 'temperatura').to_numpy()
+    np.testing.assert_array_equal(
+        long_mask['value'].to_numpy()[is_temperatura],
+        mask['temperatura_iqr'].to_numpy(),
+    )
+    # Linhas com `ds` nulo não pertencem a nenhum grupo e não são marcadas
+    df_null = ts.df.copy()
+    null_rows = np.arange(0, len(df_null), 7)
+    df_null.loc[df_null.index[null_rows], ['ds', 'value']] = [np.nan, 1e6]
+    null_mask = TSOutliers.detect_long(df_null, ['zscore', 'iqr'])
+    assert not null_mask.iloc[null_rows].any().any()
+    pd.testing.assert_frame_equal(
+        null_mask.drop(index=df_null.index[null_rows]),
+        TSOutliers.detect_long(
+            df_null.drop(index=df_null.index[null_rows]), ['zscore', 'iqr']
+        ),
+    )
+    with pytest.raises(ValueError):
+        ts.detect_outliers('grubbs')
+
+
+def test_hampel_streaming():
+    n, window = 3000, 15
+    rng = np.random.default_rng(9)
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            # Sinal com deriva: o limiar acompanha o nível local da série
+            'temperatura': np.cumsum(rng.normal(size=n)),
+            'velocidade': rng.integers(40, 60, n).astype(np.int64),
+        }
+    )
+    spikes = rng.choice(np.arange(window, n), 30, replace=False)
+    df.loc[spikes, 'temperatura'] += 40.0
+    df.loc[100:103, 'temperatura'] = np.nan
+    ts = TimeSerie(df, format='wide', features_qty=3)
+    mask = ts.hampel(window)
+    assert mask['temperatura'].to_numpy()[spikes].all()
+    assert not mask['temperatura'].to_numpy()[100:104].any()
+    # Referência: mediana e MAD com pd.rolling
+    rolling = df['temperatura'].rolling(window)
+    median = rolling.median()
+    mad = rolling.apply(lambda v: np.nanmedian(np.abs(v - np.nanmedian(v))), raw=True)
+    expected = (df['temperatura'] - median).abs() > 3.0 * 1.4826 * mad
+    np.testing.assert_array_equal(mask['temperatura'].to_numpy(), expected.to_numpy())
+    replaced = ts.hampel(window, mode='replace')
+    assert replaced.df.dtypes.equals(df.dtypes)
+    np.testing.assert_array_equal(
+        replaced.df['temperatura'].to_numpy()[spikes], median.to_numpy()[spikes]
+    )
+    # Em blocos de tamanhos arbitrários o resultado é idêntico ao da série inteira
+    for format in ['wide', 'long']:
+        if format == 'long':
+            ts.to_long()
+            mask = ts.hampel(window)
+            replaced = ts.hampel(window, mode='replace')
+        flag, replace = TSHampelFilter(window), TSHampelFilter(window, mode='replace')
+        masks, chunks = [], []
+        for start in range(0, len(ts.df), 997):
+            chunk = TimeSerie(
+                ts.df.iloc[start : start + 997], format=format, features_qty=3
+            )
+            masks.append(flag.process(chunk))
+            chunks.append(replace.process(chunk).df)
+        pd.testing.assert_frame_equal(pd.concat(masks), mask)
+        pd.testing.assert_frame_equal(pd.concat(chunks), replaced.df)
+    # Linhas com `ds` nulo não entram no histórico de nenhum `ds` e não são filtradas
+    df_null = ts.df.copy()
+    null_index = df_null.index[10::50]
+    df_null.loc[null_index, ['ds', 'value']] = [np.nan, 1e6]
+    df_valid = df_null.drop(index=null_index)
+    mask = TSHampelFilter(window).process(df_null, format='long')
+    assert not mask.loc[null_index].any().any()
+    pd.testing.assert_frame_equal(
+        mask.drop(index=null_index),
+        TSHampelFilter(window).process(df_valid, format='long'),
+    )
+    replaced = TSHampelFilter(window, mode='replace').process(df_null, format='long')
+    assert (replaced.loc[null_index, 'value'] == 1e6).all()
+    with pytest.raises(ValueError):
+        TSHampelFilter(window, mode='clip')
+    with pytest.raises(Exception, match='colunas numéricas'):
+        TSHampelFilter(window).process(df[['timestamp']].assign(ds='a'))
+
+
+def test_copy_on_write():
+    # Importar o t8s não altera a configuração do Pandas da aplicação
+    assert not pd.options.mode.copy_on_write
+    ts = create_sample_ts()
+    # Sem Copy-on-Write as séries derivadas recebem cópias das colunas
+    for ts_derived in [
+        ts.copy(),
+        ts.normalize(MinMaxScaler(), ['velocidade'], inplace=False),
+        ts.split()[0],
+    ]:
+        assert not np.shares_memory(
+            ts.df['timestamp'].values, ts_derived.df['timestamp'].values
+        )
+        ts_derived.df.loc[0, 'temperatura'] = 99.0
+        assert ts.df.loc[0, 'temperatura'] == 25.0
+    with pd.option_context('mode.copy_on_write', True):
+        ts = create_sample_ts()
+        ts_copy = ts.copy()
+        # A cópia compartilha os buffers das colunas com a série original ...
+        assert np.shares_memory(
+            ts.df['timestamp'].values, ts_copy.df['timestamp'].values
+        )
+        # ... e uma coluna só é copiada quando for modificada
+        ts_copy.df.loc[0, 'temperatura'] = 99.0
+        assert ts.df.loc[0, 'temperatura'] == 25.0
+        ts_normalized = ts.normalize(MinMaxScaler(), ['velocidade'], inplace=False)
+        assert np.shares_memory(
+            ts.df['temperatura'].values, ts_normalized.df['temperatura'].values
+        )
+        assert ts.df.loc[0, 'velocidade'] == 3000.0
+
+
+def test_to_long_and_to_wide():
+    ts = create_sample_ts()
+    df_wide = ts.df
+    expected_long = pd.melt(
+        df_wide, id_vars=['timestamp'], var_name='ds', value_name='value'
+    ).sort_values(by=['timestamp', 'ds'])
+    expected_wide = expected_long.pivot(index='timestamp', columns='ds', values='value')
+    # No formato long `ds` é categórico
+    expected_long['ds'] = expected_long['ds'].astype('category')
+    ts.to_long()
+    pd.testing.assert_frame_equal(ts.df, expected_long)
+    ts.to_wide()
+    pd.testing.assert_frame_equal(ts.df, expected_wide)
+    # Série long fora de ordem usa o pivot
+    ts_unordered = TimeSerie(expected_long.iloc[::-1], format='long', features_qty=3)
+    ts_unordered.to_wide()
+    pd.testing.assert_frame_equal(ts_unordered.df, expected_wide)
+
+
+def test_long_format_parquet_round_trip():
+    n = 100
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': np.random.rand(n).astype(np.float32),
+            'pressao': np.arange(n, dtype=np.int16),
+        }
+    )
+    ts = TimeSerie(df, format='wide', features_qty=3)
+    ts.to_long()
+    # float32 e int16 cabem em float32
+    assert ts.df['value'].dtype == np.float32
+    assert list(ts.df['ds'].cat.categories) == ['pressao', 'temperatura']
+    # Timestamps fora de ordem usam o melt, com o mesmo dtype para `value`
+    df_unordered = df.iloc[::-1].assign(alarme=np.arange(n) % 2 == 0)
+    ts_unordered = TimeSerie(df_unordered, format='wide', features_qty=4)
+    ts_unordered.to_long()
+    assert ts_unordered.df['value'].dtype == np.float32
+    alarme = ts_unordered.df.loc[ts_unordered.df['ds'] == 'alarme', 'value']
+    assert alarme.tolist() == [0.0, 1.0] * (n // 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'long.parquet'
+        TSWriter(WriteParquetFile()).write(path, ts)
+        assert pa.types.is_dictionary(pq.read_schema(path).field('ds').type)
+        for backend in ['pandas', 'arrow']:
+            ts_read = TSBuilder(ReadParquetFile(backend=backend)).build_from_file(path)
+            assert ts_read.is_multivariate()
+            pd.testing.assert_frame_equal(
+                ts_read.df[['timestamp', 'ds', 'value']],
+                ts.df.reset_index(drop=True),
+            )
+
+
+def test_split():
+    ts = create_sample_ts()
+    with pd.option_context('mode.copy_on_write', True):
+        univariate_list = ts.split()
+    assert [list(ts_uni.df.columns) for ts_uni in univariate_list] == [
+        ['timestamp', 'temperatura'],
+        ['timestamp', 'velocidade'],
+    ]
+    for ts_uni in univariate_list:
+        assert ts_uni.is_univariate()
+        # Com Copy-on-Write o timestamp e a feature não são copiados
+        for col in ts_uni.df.columns:
+            assert np.shares_memory(ts_uni.df[col].values, ts.df[col].values)
+
+    ts_long = ts.copy()
+    ts_long.to_long()
+    # Embaralha as linhas para garantir que o agrupamento por `ds` preserva a ordem
+    ts_long.df = ts_long.df.iloc[[0, 2, 1, 4, 3, 6, 5, 7]]
+    univariate_long_list = ts_long.split()
+    assert len(univariate_long_list) == 2
+    for ts_uni, ts_uni_long in zip(univariate_list, univariate_long_list):
+        pd.testing.assert_frame_equal(ts_uni.df, ts_uni_long.df)
+
+
+def test_join():
+    ts = create_sample_ts()
+    univariate_list = ts.split()
+    pd.testing.assert_frame_equal(TimeSerie.join(univariate_list).df, ts.df)
+    # A segunda série não tem o primeiro timestamp
+    univariate_list[1].df = univariate_list[1].df.iloc[1:]
+    assert len(TimeSerie.join(univariate_list).df) == 3
+    ts_outer = TimeSerie.join(univariate_list, how='outer')
+    assert len(ts_outer.df) == 4
+    assert np.isnan(ts_outer.df['velocidade'][0])
+    assert ts_outer.df['temperatura'].dtype == np.float32
+    ts_left = TimeSerie.join(univariate_list[::-1], how='left')
+    assert list(ts_left.df.columns) == ['timestamp', 'velocidade', 'temperatura']
+    assert len(ts_left.df) == 3
+
+
+def test_join_asof():
+    ts = create_sample_ts()
+    reference, other = ts.split()
+    # Amostras do segundo sensor deslocadas em +10 e -20 minutos
+    shift = pd.to_timedelta([10, -20, 10, -20], unit='min')
+    other.df = pd.DataFrame(
+        {
+            'timestamp': other.df['timestamp'] + shift,
+            'velocidade': other.df['velocidade'],
+        }
+    )
+    for direction in ['backward', 'forward', 'nearest']:
+        for tolerance in [None, '15min']:
+            result = TimeSerie.join(
+                [reference, other], how='asof', direction=direction, tolerance=tolerance
+            )
+            expected = pd.merge_asof(
+                reference.df,
+                other.df,
+                on='timestamp',
+                direction=direction,
+                tolerance=None if tolerance is None else pd.Timedelta(tolerance),
+            )
+            pd.testing.assert_frame_equal(result.df, expected)
+    with pytest.raises(ValueError):
+        TimeSerie.join([reference, other], how='asof', tolerance='-5min')
+    # Colunas homônimas usam o pd.merge_asof encadeado, mesmo com a primeira série fora
+    # de ordem
+    other.df = other.df.rename(columns={'velocidade': 'temperatura'})
+    reference.df = reference.df.iloc[::-1]
+    result = TimeSerie.join([reference, other], how='asof', tolerance='15min')
+    expected = pd.merge_asof(
+        reference.df.sort_values(by='timestamp', ignore_index=True),
+        other.df.sort_values(by='timestamp'),
+        on='timestamp',
+        tolerance=pd.Timedelta('15min'),
+    )
+    assert list(result.df.columns) == ['timestamp', 'temperatura_x', 'temperatura_y']
+    pd.testing.assert_frame_equal(result.df, expected)
+
+
+def test_between_and_at():
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2022-01-01', periods=100, freq='H'),
+            'temperatura': np.arange(100, dtype=np.float32),
+        }
+    )
+    ts = TimeSerie(df, format='wide', features_qty=len(df.columns))
+    start, end = pd.Timestamp(2022, 1, 1, 10), pd.Timestamp(2022, 1, 1, 20)
+    for inclusive in ['both', 'neither', 'left', 'right']:
+        window = ts.between(start, end, inclusive=inclusive)
+        expected = df[df['timestamp'].between(start, end, inclusive=inclusive)]
+        pd.testing.assert_frame_equal(window.df, expected)
+    # Com Copy-on-Write a fatia compartilha os buffers da série original
+    with pd.option_context('mode.copy_on_write', True):
+        window = ts.between(start, end)
+    assert np.shares_memory(
+        window.df[df.columns[1]].to_numpy(), df[df.columns[1]].to_numpy()
+    )
+    assert len(ts.at(start).df) == 1
+    assert ts.between(datetime(2030, 1, 1), datetime(2030, 1, 2)).df.empty
+    with pytest.raises(KeyError):
+        ts.at(datetime(2030, 1, 1))
+    # Série fora de ordem: usa a máscara booleana
+    shuffled = df.sample(frac=1, random_state=0)
+    ts = TimeSerie(shuffled, format='wide', features_qty=len(df.columns))
+    expected = shuffled[shuffled['timestamp'].between(start, end)]
+    pd.testing.assert_frame_equal(ts.between(start, end).df, expected)
+    # Uma escrita inplace na coluna de timestamp é percebida na consulta seguinte
+    ts = TimeSerie(df.copy(), format='wide', features_qty=len(df.columns))
+    assert len(ts.between(start, end).df) == 11
+    ts.df.loc[50:59, 'timestamp'] = pd.Timestamp(2022, 1, 1, 15)
+    expected = ts.df[ts.df['timestamp'].between(start, end)]
+    assert len(expected) == 21
+    pd.testing.assert_frame_equal(ts.between(start, end).df, expected)
+
+
+def test_resample():
+    rng = np.random.default_rng(0)
+    rows = 2000
+    values = rng.normal(size=rows).astype(np.float32)
+    values[rng.random(rows) < 0.1] = np.nan
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2022-01-01', periods=rows, freq='s'),
+            'temperatura': values,
+            'velocidade': rng.integers(0, 100, rows),
+        }
+    )
+    aggs = ['mean', 'min', 'max', 'first', 'last', 'sum', 'count', 'std']
+    # Linhas fora de ordem não alteram o resultado
+    for data in [df, df.sample(frac=1, random_state=0)]:
+        ts = TimeSerie(data, format='wide', features_qty=len(df.columns))
+        result = ts.resample('1min', aggs).df
+        expected = data.set_index('timestamp').resample('1min').agg(aggs)
+        expected.columns = [f'{col}_{agg}' for col, agg in expected.columns]
+        expected = expected.reset_index()
+        pd.testing.assert_frame_equal(
+            result, expected, check_dtype=False, check_freq=False, rtol=1e-5
+        )
+        assert result['temperatura_mean'].dtype == np.float32
+
+    # No formato long a reamostragem é feita por `ds`
+    ts = TimeSerie(df, format='wide', features_qty=len(df.columns))
+    expected_ts = ts.resample('1min', ['mean', 'count'])
+    expected_ts.to_long()
+    ts.to_long()
+    result = ts.resample('1min', ['mean', 'count']).df
+    np.testing.assert_array_equal(result['ds'], expected_ts.df['ds'])
+    np.testing.assert_allclose(result['value'], expected_ts.df['value'], rtol=1e-6)
+
+    # Linhas com `ds` nulo são descartadas
+    df_null = pd.DataFrame(
+        {
+            'timestamp': pd.Timestamp(2022, 1, 1)
+            + pd.to_timedelta([0, 5, 10, 10], unit='min'),
+            'ds': ['a', 'b', 'a', None],
+            'value': [1.0, 2.0, 3.0, 99.0],
+        }
+    )
+    ts_null = TimeSerie(df_null, format='long', features_qty=3)
+    result = ts_null.resample('5min', ['mean']).df
+    assert list(result['ds']) == ['a', 'b'] * 3
+    np.testing.assert_array_equal(
+        result['value'], [1.0, np.nan, np.nan, 2.0, 3.0, np.nan]
+    )
+
+
+def test_rolling():
+    rng = np.random.default_rng(0)
+    rows = 2000
+    # Amostragem irregular, com lacunas, e valores NaN
+    seconds = np.sort(rng.choice(3 * rows, rows, replace=False))
+    values = rng.normal(size=rows).astype(np.float32)
+    values[rng.random(rows) < 0.1] = np.nan
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.Timestamp(2022, 1, 1) + pd.to_timedelta(seconds, unit='s'),
+            'temperatura': values,
+            'velocidade': rng.integers(0, 100, rows).astype(np.int32),
+        }
+    )
+    ts = TimeSerie(df, format='wide', features_qty=len(df.columns))
+    stats = ['mean', 'std', 'min', 'max', 'median', 'sum', 'count']
+    for min_periods in [1, 5]:
+        result = ts.rolling('1min', stats, [0.9], min_periods=min_periods).df
+        for col in ['temperatura', 'velocidade']:
+            serie = df.set_index('timestamp')[col].astype(float)
+            rolling = serie.rolling('1min', min_periods=min_periods)
+            for stat in stats:
+                expected = getattr(rolling, stat)()
+                np.testing.assert_allclose(
+                    result[f'{col}_{stat}'], expected, rtol=1e-5, atol=1e-6
+                )
+            expected = rolling.quantile(0.9)
+            np.testing.assert_allclose(result[f'{col}_q0.9'], expected, rtol=1e-5)
+    assert result['temperatura_mean'].dtype == np.float32
+
+    # No formato long as janelas são calculadas por `ds`
+    ts.to_long()
+    result = ts.rolling('1min', ['max']).df
+    expected = ts.df.set_index('timestamp').groupby('ds')['value'].rolling('1min').max()
+    for ds in ['temperatura', 'velocidade']:
+        values = result[result['ds'] == ds]['value']
+        np.testing.assert_allclose(values, expected.loc[ds])
+
+
+def test_append_buffer():
+    n = 500
+    full = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': np.arange(n, dtype=np.float32),
+            'contador': np.arange(n, dtype=np.int32),
+        }
+    )
+    growable = TSAppendBuffer(initial_size=8)
+    ring = TSAppendBuffer(capacity=50)
+    for start in range(0, n, 37):
+        batch = full.iloc[start : start + 37]
+        growable.append(batch)
+        ring.append(batch)
+        end = min(start + 37, n)
+        pd.testing.assert_frame_equal(
+            growable.to_timeserie().df, full.iloc[:end].reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(
+            ring.to_timeserie().df,
+            full.iloc[max(0, end - 50) : end].reset_index(drop=True),
+        )
+    # Os dtypes originais são preservados
+    ts = growable.to_timeserie()
+    assert ts.df['temperatura'].dtype == np.float32
+    assert ts.df['contador'].dtype == np.int32
+    assert len(ring) == 50
+    # Valores float não podem ser gravados numa coluna int32
+    with pytest.raises(Exception, match='contador'):
+        growable.append(full.astype({'contador': np.float64}))
+
+
+def test_provenance():
+    n = 600
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': np.random.rand(n).astype(np.float32),
+        }
+    )
+    ts = TimeSerie(df, format='wide', features_qty=2)
+    # Sem cache os hashes só são calculados se solicitados
+    resampled = ts.apply_transformation('resample', freq='1min', aggs=['mean'])
+    assert resampled.get_provenances()[0]['input_hash'] is None
+    assert resampled.get_provenances()[0]['output_hash'] is None
+    ts.hash_provenance = True
+    resampled = ts.apply_transformation('resample', freq='1min', aggs=['mean'])
+    assert resampled.hash_provenance
+    assert resampled.get_provenances()[0]['input_hash'] == ts.content_hash()
+    ts.hash_provenance = False
+    ts.result_cache = TSResultCache()
+    resampled = ts.apply_transformation('resample', freq='1min', aggs=['mean'])
+    rolled = resampled.apply_transformation('rolling', window='5min', stats=['max'])
+    provenances = rolled.get_provenances()
+    assert [p['transformation'] for p in provenances] == ['resample', 'rolling']
+    assert provenances[0]['parameters'] == {'aggs': ['mean'], 'freq': '1min'}
+    assert provenances[0]['rows'] == 10
+    assert provenances[0]['input_hash'] == ts.content_hash()
+    assert provenances[0]['output_hash'] == provenances[1]['input_hash']
+    assert rolled.get_last_transformation('rolling')['duration'] >= 0
+    assert rolled.get_last_transformation('resample') == {}
+    assert rolled.get_provenance_by_transformation('resample') == provenances[0]
+    # A série original não é afetada
+    assert ts.get_provenances() == []
+
+    # O mesmo passo (parâmetros em outra ordem) sobre o mesmo conteúdo é reaproveitado
+    again = ts.apply_transformation('resample', aggs=['mean'], freq='1min')
+    assert ts.result_cache.hits == 1
+    pd.testing.assert_frame_equal(again.df, resampled.df)
+    assert again.get_provenances() == resampled.get_provenances()
+    ts.apply_transformation('resample', freq='2min', aggs=['mean'])
+    assert ts.result_cache.hits == 1
+
+    # O hash acompanha as escritas inplace no DataFrame
+    input_hash = ts.content_hash()
+    ts.df.loc[0:59, 'temperatura'] = 100
+    assert ts.content_hash() != input_hash
+    assert ts.copy().content_hash() == ts.content_hash()
+
+
+def test_result_cache():
+    n = 3000
+    df = pd.DataFrame(
+        {
+            'timestamp': pd.date_range('2023-01-01', periods=n, freq='s'),
+            'temperatura': np.random.rand(n).astype(np.float32),
+        }
+    )
+    # O cache é opcional e ativado por série
+    ts = TimeSerie(df.copy(), format='wide', features_qty=2)
+    assert ts.result_cache is None
+    cache = TSResultCache()
+    ts.result_cache = cache
+    resampled = ts.apply_transformation('resample', freq='1min', aggs=['mean'])
+    assert resampled.result_cache is cache and cache.misses == 1
+    # Uma escrita inplace muda o conteúdo e, portanto, o passo
+    ts.df['temperatura'] = np.float32(100)
+    resampled = ts.apply_transformation('resample', freq='1min', aggs=['mean'])
+    assert cache.hits == 0 and (resampled.df['temperatura'] == 100).all()
+    pd.testing.assert_frame_equal(
+        resampled.df, ts.resample(freq='1min', aggs=['mean']).df
+    )
+    # Transformações inplace e scalers informados pelo cliente não usam o cache
+    for _ in range(2):
+        scaler = MinMaxScaler()
+        normalized = ts.apply_transformation('normalize', scaler=scaler)
+        assert hasattr(scaler, 'data_min_') and normalized.scaler is scaler
+    for _ in range(2):
+        ts_inplace = ts.copy()
+        ts_inplace.apply_transformation('add_nan_mask', inplace=True)
+        assert 'temperatura_nan' in ts_inplace.df.columns
+    assert cache.hits == 0 and len(cache) == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / 'source.parquet'
+        TSWriter(WriteParquetFile()).write(
+            source, TimeSerie(df, format='wide', features_qty=2)
+        )
+        # Cache pequeno: todo resultado é gravado em disco ao sair da memória
+        cache = TSResultCache(max_bytes=1024, spill_dir=Path(tmp) / 'cache')
+        ts = TSBuilder(ReadParquetFile()).build_from_file(source)
+        ts.result_cache = cache
+        rolled = ts.apply_transformation('rolling', window='1min')
+        assert len(cache) == 0 and cache.spills == 1
+        again = ts.apply_transformation('rolling', window='1min')
+        assert cache.hits == 1
+        pd.testing.assert_frame_equal(again.df, rolled.df)
+        assert again.get_provenances() == rolled.get_provenances()
+
+        # Modificar o arquivo de origem invalida os resultados derivados dele
+        mtime = source.stat().st_mtime_ns + 10**9
+        os.utime(source, ns=(mtime, mtime))
+        ts.apply_transformation('rolling', window='1min')
+        assert cache.hits == 1 and cache.misses == 2